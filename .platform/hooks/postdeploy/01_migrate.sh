@@ -4,11 +4,14 @@ set -euo pipefail
 # Activate the virtual environment
 source /var/app/venv/*/bin/activate
 
-echo "=== EB postdeploy: collecting static files ==="
-python /var/app/current/manage.py collectstatic --noinput --clear
+echo "=== EB postdeploy: collecting static files (incremental) ==="
+python /var/app/current/manage.py deploy_static --noinput
 
-echo "=== EB postdeploy: running migrations ==="
-python /var/app/current/manage.py migrate --noinput
+echo "=== EB postdeploy: checking pending migrations for blocking operations ==="
+python /var/app/current/manage.py check_migrations
+
+echo "=== EB postdeploy: running migrations (lock/statement timeouts, fail fast) ==="
+python /var/app/current/manage.py migrate_safe
 
 echo "=== EB postdeploy: checking Django configuration ==="
 python /var/app/current/manage.py check
@@ -0,0 +1,151 @@
+"""
+Cache helpers shared across apps.
+
+``cached_swr`` serves values with a soft TTL (fresh) and a hard TTL (stale but
+usable). After the soft TTL one worker refreshes the value under a cache lock
+while everyone else keeps serving the stale copy, so expiry never stampedes
+the database. Misses are coalesced: identical in-flight requests share one
+computation in-process and wait on the cache lock across workers.
+``generation`` stamps let writes invalidate whole key families without
+``cache.keys()``, which only some backends support.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+LOCK_SUFFIX = ':lock'
+WAIT_INTERVAL = 0.05
+
+
+def _refresh(key, compute, soft_ttl, hard_ttl):
+    try:
+        value = compute()
+        cache.set(key, {'value': value, 'fresh_until': time.time() + soft_ttl}, timeout=hard_ttl)
+        return value
+    finally:
+        cache.delete(key + LOCK_SUFFIX)
+
+
+def _refresh_in_background(key, compute, soft_ttl, hard_ttl):
+    def run():
+        try:
+            _refresh(key, compute, soft_ttl, hard_ttl)
+        except Exception:
+            logger.exception("Background refresh failed for cache key %s", key)
+        finally:
+            # Connections are per thread; don't leak this one
+            connections.close_all()
+
+    threading.Thread(target=run, name=f'swr-refresh-{key}', daemon=True).start()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def coalesce(key, compute):
+    """
+    Run ``compute()`` once per key among concurrent callers in this process;
+    the other callers block and share its result (or exception).
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+
+    if not leader:
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    try:
+        call.value = compute()
+        return call.value
+    except BaseException as error:
+        call.error = error
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.event.set()
+
+
+def cached_swr(key, compute, soft_ttl, hard_ttl, lock_timeout=30, background=True):
+    """
+    Return the cached value for ``key``, computing it with ``compute()`` when needed.
+
+    - Fresh (younger than ``soft_ttl``): served from cache.
+    - Stale (older than ``soft_ttl``, younger than ``hard_ttl``): served from
+      cache; the worker that wins the lock recomputes, in a background thread
+      when ``background`` is true, inline otherwise.
+    - Missing: the lock winner computes; other workers wait up to
+      ``lock_timeout`` seconds for its result before computing themselves.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        if time.time() < entry['fresh_until']:
+            return entry['value']
+        if cache.add(key + LOCK_SUFFIX, 1, timeout=lock_timeout):
+            if not background:
+                return _refresh(key, compute, soft_ttl, hard_ttl)
+            _refresh_in_background(key, compute, soft_ttl, hard_ttl)
+        return entry['value']
+
+    # Identical concurrent requests in this process share one computation
+    return coalesce(key, lambda: _compute_missing(key, compute, soft_ttl, hard_ttl, lock_timeout))
+
+
+def _compute_missing(key, compute, soft_ttl, hard_ttl, lock_timeout):
+    if cache.add(key + LOCK_SUFFIX, 1, timeout=lock_timeout):
+        return _refresh(key, compute, soft_ttl, hard_ttl)
+
+    # Single flight: another worker is computing this key
+    deadline = time.time() + lock_timeout
+    while time.time() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+    return compute()
+
+
+def generation(name):
+    """Current generation number for a family of cache keys."""
+    key = f'{name}_generation'
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, 1, timeout=None)
+        value = cache.get(key, 1)
+    return value
+
+
+def bump_generation(name):
+    """Invalidate every key built with the current generation of ``name``."""
+    key = f'{name}_generation'
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def query_cache_key(prefix, request):
+    """Stable cache key for a request's query parameters (same in every worker)."""
+    params = sorted((name, value) for name, values in request.query_params.lists() for value in values)
+    digest = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+    return f'{prefix}_{generation(prefix)}_{digest}'
@@ -0,0 +1,157 @@
+"""
+CDN edge caching: cache tags on responses and targeted purges.
+
+Cacheable API responses carry a ``Cache-Control`` policy and a
+``Cache-Tag`` header (``pet-<id>``, ``breed-<id>``, ``pet-list``...).
+Writes call ``purge_dispatcher.purge(*tags)``. Tags are queued after the
+transaction commits, collected for ``CDN_PURGE_DEBOUNCE`` seconds and sent
+to the configured backend in batches, so a bulk edit costs a few purge
+calls rather than one per row.
+
+Backends (``CDN_PURGE_BACKEND``): ``CloudflarePurgeBackend`` (purge by tag),
+``NullPurgeBackend`` (default when no CDN is configured) and
+``RecordingPurgeBackend`` (keeps purged batches in memory, for tests).
+"""
+import atexit
+import json
+import logging
+import threading
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PET_LIST_TAG = 'pet-list'
+BREED_LIST_TAG = 'breed-list'
+
+# Cache-Control policies. Edges keep responses for s-maxage (purged on
+# change); browsers revalidate sooner. Interest/view counts are not purged,
+# so they lag by up to s-maxage. Views are recorded through the uncached
+# POST /api/pets/{id}/view/ beacon, since edge hits never reach Django.
+CATALOG_POLICY = {'public': True, 'max_age': 60, 's_maxage': 600, 'stale_while_revalidate': 60}
+DETAIL_POLICY = {'public': True, 'max_age': 60, 's_maxage': 300, 'stale_while_revalidate': 60}
+REFERENCE_POLICY = {'public': True, 'max_age': 300, 's_maxage': 86400, 'stale_while_revalidate': 300}
+
+
+def pet_tag(pk):
+    return f'pet-{pk}'
+
+
+def breed_tag(pk):
+    return f'breed-{pk}'
+
+
+def tag_response(response, tags, policy):
+    """Mark ``response`` cacheable at the edge under ``policy`` and ``tags``."""
+    header = getattr(settings, 'CDN_CACHE_TAG_HEADER', 'Cache-Tag')
+    existing = [tag for tag in response.get(header, '').split(',') if tag]
+    response.headers[header] = ','.join(dict.fromkeys(existing + [str(tag) for tag in tags]))
+    patch_cache_control(response, **policy)
+    return response
+
+
+class NullPurgeBackend:
+    max_tags = 1000
+
+    def purge_tags(self, tags):
+        pass
+
+
+class RecordingPurgeBackend:
+    """Records purged batches in ``RecordingPurgeBackend.batches`` instead of calling a CDN."""
+    max_tags = 30
+    batches = []
+
+    def purge_tags(self, tags):
+        self.batches.append(list(tags))
+
+    @classmethod
+    def purged(cls):
+        return {tag for batch in cls.batches for tag in batch}
+
+    @classmethod
+    def reset(cls):
+        cls.batches.clear()
+
+
+class CloudflarePurgeBackend:
+    """Purge by cache tag through the Cloudflare API (at most 30 tags per call)."""
+    max_tags = 30
+    endpoint = 'https://api.cloudflare.com/client/v4/zones/{zone}/purge_cache'
+    timeout = 10
+
+    def purge_tags(self, tags):
+        request = urllib.request.Request(
+            self.endpoint.format(zone=settings.CLOUDFLARE_ZONE_ID),
+            data=json.dumps({'tags': list(tags)}).encode(),
+            headers={
+                'Authorization': f'Bearer {settings.CLOUDFLARE_API_TOKEN}',
+                'Content-Type': 'application/json',
+            },
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            result = json.loads(response.read())
+        if not result.get('success'):
+            raise RuntimeError(f"Cloudflare purge failed: {result.get('errors')}")
+
+
+class PurgeDispatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(settings.CDN_PURGE_BACKEND)()
+        return self._backend
+
+    def purge(self, *tags):
+        """Purge ``tags`` once the current transaction commits (debounced)."""
+        transaction.on_commit(lambda: self._enqueue(tags))
+
+    def _enqueue(self, tags):
+        delay = getattr(settings, 'CDN_PURGE_DEBOUNCE', 2.0)
+        with self._lock:
+            self._pending.update(tags)
+            if not delay:
+                schedule = False
+            elif self._timer is None:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                schedule = True
+            else:
+                return
+        if schedule:
+            self._timer.start()
+        else:
+            self.flush()
+
+    def flush(self):
+        """Send every pending tag to the backend now."""
+        with self._lock:
+            tags = sorted(self._pending)
+            self._pending.clear()
+            self._timer = None
+        if not tags:
+            return
+        backend = self.backend
+        for start in range(0, len(tags), backend.max_tags):
+            batch = tags[start:start + backend.max_tags]
+            try:
+                backend.purge_tags(batch)
+            except Exception:
+                # Stale edge copies expire on their own; never fail the write
+                logger.exception("CDN purge failed for %d tags", len(batch))
+
+
+purge_dispatcher = PurgeDispatcher()
+# Don't drop purges still waiting on the debounce timer at shutdown
+atexit.register(purge_dispatcher.flush)
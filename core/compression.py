@@ -0,0 +1,72 @@
+"""
+Response compression helpers for API responses.
+
+Brotli is used when the optional ``brotli`` package is installed; gzip is
+always available. Cached entries keep the rendered JSON together with its
+compressed variants, so cache hits are served without re-rendering or
+re-compressing.
+"""
+import gzip
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+# Server preference when the client accepts several encodings
+PREFERRED_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+def min_compress_size():
+    return getattr(settings, 'API_COMPRESSION_MIN_SIZE', 1024)
+
+
+def accepted_encodings(request):
+    """Return the content codings the client accepts (q > 0)."""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if coding and params not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.lower())
+    return accepted
+
+
+def choose_encoding(request, available=PREFERRED_ENCODINGS):
+    """Pick the preferred encoding that both sides support, or None."""
+    accepted = accepted_encodings(request)
+    for encoding in available:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=5)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def build_cache_entry(content, content_type='application/json'):
+    """Render-once cache entry: identity bytes plus every compressed variant."""
+    entry = {'content_type': content_type, 'identity': content}
+    if len(content) >= min_compress_size():
+        for encoding in PREFERRED_ENCODINGS:
+            entry[encoding] = compress(content, encoding)
+    return entry
+
+
+def response_from_cache_entry(request, entry):
+    """Build a response from a cache entry, using a stored compressed variant if accepted."""
+    encodings = tuple(encoding for encoding in PREFERRED_ENCODINGS if encoding in entry)
+    encoding = choose_encoding(request, encodings)
+    response = HttpResponse(entry[encoding or 'identity'], content_type=entry['content_type'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if encodings:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.compression import PREFERRED_ENCODINGS
+
+
+class Command(BaseCommand):
+    help = "Report response bytes and CPU time per request for API endpoints, per Accept-Encoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/api/pets/', '/api/pets/filters_info/', '/api/breeds/'])
+        parser.add_argument('--requests', type=int, default=50, help="Requests per path and encoding.")
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=options['host'])
+        encodings = ('identity',) + PREFERRED_ENCODINGS
+        count = options['requests']
+
+        self.stdout.write(f"{'path':<32} {'encoding':<9} {'status':>6} {'bytes':>9} {'cpu ms/req':>11} {'wall ms/req':>12}")
+        for path in options['paths']:
+            for encoding in encodings:
+                # Warm the response cache so the steady state is measured
+                response = client.get(path, HTTP_ACCEPT_ENCODING=encoding, secure=True)
+
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                for _ in range(count):
+                    response = client.get(path, HTTP_ACCEPT_ENCODING=encoding, secure=True)
+                cpu = (time.process_time() - cpu_start) * 1000 / count
+                wall = (time.perf_counter() - wall_start) * 1000 / count
+
+                size = len(response.content) if not response.streaming else 0
+                served = response.get('Content-Encoding', 'identity')
+                self.stdout.write(
+                    f"{path:<32} {served:<9} {response.status_code:>6} {size:>9} {cpu:>11.2f} {wall:>12.2f}"
+                )
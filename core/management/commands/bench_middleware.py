@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+FAST_LANE = 'core.middleware.FastLaneMiddleware'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request CPU time through the middleware chain and view with and without the "
+        "fast lane, for anonymous GETs. Without it every middleware runs, as before the fast lane."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/', '/api/pets/'])
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per path and stack.")
+        parser.add_argument('--host', default='localhost')
+
+    def load_handler(self, middleware):
+        with override_settings(MIDDLEWARE=middleware):
+            handler = BaseHandler()
+            handler.load_middleware()
+        return handler
+
+    def measure(self, handler, factory, path, count):
+        # Warm up (response caches, lazy imports)
+        response = handler.get_response(factory.get(path, secure=True))
+        start = time.process_time()
+        for _ in range(count):
+            response = handler.get_response(factory.get(path, secure=True))
+        return response.status_code, (time.process_time() - start) * 1000 / count
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        # Anonymous browsers usually carry a CSRF cookie from an earlier page
+        factory = RequestFactory(HTTP_HOST=options['host'], HTTP_COOKIE=f'{settings.CSRF_COOKIE_NAME}=x')
+        handlers = {
+            'full': self.load_handler([path for path in settings.MIDDLEWARE if path != FAST_LANE]),
+            'lean': self.load_handler(settings.MIDDLEWARE),
+        }
+
+        self.stdout.write(f"{'path':<24} {'stack':<6} {'status':>6} {'cpu ms/req':>11}")
+        for path in options['paths']:
+            results = {name: self.measure(handler, factory, path, count) for name, handler in handlers.items()}
+            for name, (status, cpu) in results.items():
+                self.stdout.write(f"{path:<24} {name:<6} {status:>6} {cpu:>11.3f}")
+            saved = results['full'][1] - results['lean'][1]
+            self.stdout.write(f"{path:<24} {'saved':<6} {'':>6} {saved:>11.3f}")
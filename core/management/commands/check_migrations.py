@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from core.migration_ops import ERROR, unsafe_operations
+
+
+class Command(BaseCommand):
+    help = "Report migration operations that would lock live tables or break the running release. Run before deploy."
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_label', nargs='*', help="Only check these apps.")
+        parser.add_argument('--all', action='store_true', help="Check applied migrations too, not just pending ones.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--warnings-only', action='store_true', help="Report errors without failing.")
+
+    def handle(self, *args, **options):
+        executor = MigrationExecutor(connections[options['database']])
+        loader = executor.loader
+        if options['all']:
+            migrations = [loader.graph.nodes[key] for key in loader.graph.nodes]
+        else:
+            migrations = [migration for migration, _ in executor.migration_plan(loader.graph.leaf_nodes())]
+
+        # Apps being installed from scratch have no live tables to lock
+        installed_apps = {app_label for app_label, _ in loader.applied_migrations}
+        errors = 0
+        for migration in sorted(migrations, key=lambda migration: (migration.app_label, migration.name)):
+            if options['app_label'] and migration.app_label not in options['app_label']:
+                continue
+            if not options['all'] and migration.app_label not in installed_apps:
+                continue
+            for level, operation, reason in unsafe_operations(migration):
+                errors += level == ERROR
+                style = self.style.ERROR if level == ERROR else self.style.WARNING
+                self.stdout.write(style(
+                    f"{level.upper()} {migration.app_label}.{migration.name}: {operation.describe()}: {reason}"
+                ))
+
+        if errors and not options['warnings_only']:
+            raise CommandError(f"{errors} unsafe migration operation(s); see core/migration_ops.py for safe alternatives.")
+        self.stdout.write(self.style.SUCCESS("No blocking migration operations found" if not errors else "Done"))
@@ -0,0 +1,52 @@
+import hashlib
+import time
+
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+
+
+def content_digest(storage, name):
+    digest = hashlib.md5(usedforsecurity=False)
+    with storage.open(name) as handle:
+        for chunk in handle.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Command(CollectStaticCommand):
+    help = (
+        "collectstatic for deploys: never clears STATIC_ROOT, skips files whose content is unchanged "
+        "(whatever their mtime), reuses existing compressed variants and reports timing."
+    )
+
+    def delete_file(self, path, prefixed_path, source_storage):
+        # Fresh checkouts and virtualenvs give every source a new mtime; compare content instead
+        if not self.symlink and self.storage.exists(prefixed_path):
+            if (
+                self.storage.size(prefixed_path) == source_storage.size(path)
+                and content_digest(self.storage, prefixed_path) == content_digest(source_storage, path)
+            ):
+                if prefixed_path not in self.unmodified_files:
+                    self.unmodified_files.append(prefixed_path)
+                self.log(f"Skipping '{path}' (content unchanged)")
+                return False
+        return super().delete_file(path, prefixed_path, source_storage)
+
+    def collect(self):
+        if self.clear:
+            self.stderr.write("--clear discards the reusable output; ignoring it.")
+            self.clear = False
+        started = time.perf_counter()
+        collected = super().collect()
+        elapsed = time.perf_counter() - started
+
+        stats = getattr(self.storage, 'compression_stats', None) or {}
+        self.stdout.write(
+            f"Static files: {len(collected['modified'])} copied, {len(collected['unmodified'])} unchanged, "
+            f"{len(collected['post_processed'])} post-processed in {elapsed:.1f}s"
+        )
+        if stats:
+            self.stdout.write(
+                f"Compression: {stats['compressed']} compressed, {stats['reused']} reused "
+                f"in {stats['seconds']:.1f}s"
+            )
+        return collected
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.recorder import MigrationRecorder
+
+from core.migration_ops import is_postgres, session_timeouts
+
+# SQLSTATEs for lock_timeout and statement_timeout cancellations
+TIMEOUT_CODES = {'55P03', '57014'}
+
+# Transactions running longer than this are reported as likely blockers
+BLOCKER_AGE = '5 seconds'
+
+
+def sqlstate(error):
+    """SQLSTATE of the driver error behind a Django DatabaseError (psycopg 3 or 2)."""
+    cause = error.__cause__
+    return getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run migrate with Postgres lock and statement timeouts. A migration that cannot get its "
+        "locks quickly is retried, then aborted with a report instead of queueing live traffic behind it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--lock-timeout', default='3s', help="Max wait for a table lock per statement.")
+        parser.add_argument('--statement-timeout', default='60s', help="Max run time per statement (concurrent index builds are exempt).")
+        parser.add_argument('--retries', type=int, default=3, help="Attempts after a lock or statement timeout.")
+        parser.add_argument('--retry-delay', type=float, default=10.0, help="Seconds between attempts.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not is_postgres(connection):
+            call_command('migrate', database=options['database'], interactive=False, verbosity=options['verbosity'])
+            return
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with session_timeouts(connection, options['lock_timeout'], options['statement_timeout']):
+                    call_command('migrate', database=options['database'], interactive=False, verbosity=options['verbosity'])
+                return
+            except DatabaseError as error:
+                if sqlstate(error) not in TIMEOUT_CODES:
+                    raise
+                connection.close()
+                if attempt > options['retries']:
+                    self.report(connection, error)
+                    raise CommandError("Migrations aborted after repeated timeouts; live traffic was not blocked.")
+                self.stderr.write(self.style.WARNING(
+                    f"Attempt {attempt} timed out ({error}); retrying in {options['retry_delay']}s"
+                ))
+                time.sleep(options['retry_delay'])
+
+    def report(self, connection, error):
+        """Print what failed, what held the locks, and indexes left INVALID."""
+        self.stderr.write(self.style.ERROR(f"Migration failed: {error}"))
+        last = MigrationRecorder(connection).migration_qs.order_by('-applied').first()
+        if last:
+            self.stderr.write(f"Last applied migration: {last.app}.{last.name} at {last.applied:%Y-%m-%d %H:%M:%S}")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pid, state, now() - xact_start AS age, left(query, 120) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+                "AND xact_start < now() - %s::interval ORDER BY xact_start",
+                [BLOCKER_AGE],
+            )
+            rows = cursor.fetchall()
+            cursor.execute(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE NOT i.indisvalid"
+            )
+            invalid = [name for (name,) in cursor.fetchall()]
+
+        self.stderr.write(f"Transactions open longer than {BLOCKER_AGE}:")
+        for pid, state, age, query in rows:
+            self.stderr.write(f"  pid {pid} ({state}, {age}): {query}")
+        if not rows:
+            self.stderr.write("  none")
+        if invalid:
+            self.stderr.write(f"INVALID indexes (rebuilt on the next run): {', '.join(invalid)}")
@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: import the WSGI app, then serve one request
+CHILD_SCRIPT = """
+import io, json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+from pethub.wsgi import application
+imported = time.perf_counter()
+
+from wsgiref.util import setup_testing_defaults
+environ = {{'PATH_INFO': {path!r}, 'HTTP_HOST': 'localhost', 'wsgi.url_scheme': 'https', 'HTTPS': 'on'}}
+setup_testing_defaults(environ)
+environ['wsgi.errors'] = io.StringIO()
+status = []
+body = b''.join(application(environ, lambda s, h, e=None: status.append(s)))
+responded = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'first_response_ms': (responded - imported) * 1000,
+    'status': status[0] if status else None,
+    'modules': len(sys.modules),
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Profile cold start: import-time breakdown and time to first response of the WSGI app."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help="Path requested for time-to-first-response.")
+        parser.add_argument('--runs', type=int, default=3, help="Cold starts to average.")
+        parser.add_argument('--top', type=int, default=15, help="Rows in each breakdown.")
+
+    def handle(self, *args, **options):
+        script = CHILD_SCRIPT.format(settings_module=settings.SETTINGS_MODULE, path=options['path'])
+        runs = []
+        packages = defaultdict(float)
+        modules = {}
+        for _ in range(options['runs']):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', script],
+                capture_output=True, text=True, cwd=settings.BASE_DIR,
+            )
+            wall_ms = (time.perf_counter() - started) * 1000
+            if result.returncode != 0:
+                self.stderr.write(result.stderr[-2000:])
+                return
+
+            timings = json.loads(result.stdout.strip().splitlines()[-1])
+            timings['process_ms'] = wall_ms
+            runs.append(timings)
+            for name, self_us, cumulative_us in self.parse_importtime(result.stderr):
+                packages[name.split('.')[0]] += self_us / 1000
+                modules[name] = max(modules.get(name, 0), cumulative_us / 1000)
+
+        count = len(runs)
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Cold start ({count} runs, {runs[-1]['modules']} modules)"))
+        for key, label in (
+            ('process_ms', 'process total'),
+            ('import_ms', 'import pethub.wsgi'),
+            ('first_response_ms', f"first response {options['path']} ({runs[-1]['status']})"),
+        ):
+            self.stdout.write(f"  {label:<40} {sum(run[key] for run in runs) / count:>9.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Self import time by top-level package"))
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {name:<40} {ms / count:>9.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Slowest modules (cumulative)"))
+        for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {name:<60} {ms:>9.1f} ms")
+
+    @staticmethod
+    def parse_importtime(stderr):
+        """Yield (module, self_us, cumulative_us) from -X importtime output."""
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            yield name.strip(), int(self_us), int(cumulative_us)
@@ -0,0 +1,104 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as session_middleware
+from django.utils.cache import patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+
+from core.compression import choose_encoding, compress, min_compress_size
+
+
+class ApiCompressionMiddleware:
+    """
+    Compress API responses above API_COMPRESSION_MIN_SIZE with brotli or gzip.
+    Responses that already carry a Content-Encoding (e.g. precompressed cache
+    entries) are passed through untouched.
+    """
+    path_prefix = '/api/'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(self.path_prefix):
+            return response
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < min_compress_size():
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # Strong ETags are per-representation
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+
+def is_fast_lane(request):
+    """
+    Anonymous read-only requests to the public API: safe method, no session
+    cookie, path matching FAST_LANE_URLS_REGEX. They need no session, user or
+    messages; everything else gets the full stack. CSRF and frame options stay
+    on Django's own middleware: API views are already CSRF exempt and the
+    X-Frame-Options header costs nothing.
+    """
+    pattern = getattr(settings, 'FAST_LANE_URLS_REGEX', None)
+    return (
+        pattern
+        and request.method in SAFE_METHODS
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and re.match(pattern, request.path_info) is not None
+    )
+
+
+class FastLaneMiddleware:
+    """
+    Flags fast-lane requests (see ``is_fast_lane``) so the admin-oriented
+    middleware below it pass them straight through. Must come before them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.fast_lane = is_fast_lane(request)
+        if request.fast_lane:
+            # What AuthenticationMiddleware would have found without a session
+            request.user = AnonymousUser()
+        return self.get_response(request)
+
+
+class FastLaneSkipMixin:
+    """Skip this middleware for requests flagged by FastLaneMiddleware."""
+
+    def __call__(self, request):
+        if getattr(request, 'fast_lane', False):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(FastLaneSkipMixin, session_middleware.SessionMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(FastLaneSkipMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(FastLaneSkipMixin, messages_middleware.MessageMiddleware):
+    pass
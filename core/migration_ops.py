@@ -0,0 +1,242 @@
+"""
+Migration building blocks for deploying schema changes without blocking traffic.
+
+- ``SafeAddIndex`` / ``SafeRemoveIndex``: ``CREATE/DROP INDEX CONCURRENTLY`` on
+  Postgres (migration must set ``atomic = False``), plain index DDL elsewhere.
+  A failed concurrent build leaves an INVALID index behind; ``SafeAddIndex``
+  drops it and builds again, and skips indexes that already exist, so a rerun
+  after a timeout picks up where the last run stopped.
+- ``SafeDropFieldIndex``: ``AlterField`` to ``db_index=False`` that drops the
+  field's own index concurrently on Postgres.
+- ``SafeAddConstraint``: the same for unique constraints Postgres stores as
+  unique indexes (partial, expression or covering ``UniqueConstraint``).
+- ``run_in_batches``: backfill helper for ``RunPython`` in ``atomic = False``
+  migrations; each batch commits on its own so no lock is held for the whole
+  table.
+- ``session_timeouts``: ``lock_timeout`` / ``statement_timeout`` for the
+  migrating session (used by ``migrate_safe``).
+
+``unsafe_operations`` lists what ``check_migrations`` reports before a deploy.
+"""
+from contextlib import contextmanager
+
+from django.contrib.postgres.operations import AddIndexConcurrently, NotInTransactionMixin, RemoveIndexConcurrently
+from django.db import migrations, models, transaction
+from django.db.models import NOT_PROVIDED
+
+
+def is_postgres(connection):
+    return connection.vendor == 'postgresql'
+
+
+@contextmanager
+def session_timeouts(connection, lock_timeout=None, statement_timeout=None):
+    """Set Postgres session timeouts for the duration of the block (no-op elsewhere)."""
+    if not is_postgres(connection):
+        yield
+        return
+
+    settings = {'lock_timeout': lock_timeout, 'statement_timeout': statement_timeout}
+    settings = {name: value for name, value in settings.items() if value is not None}
+    with connection.cursor() as cursor:
+        previous = {}
+        for name, value in settings.items():
+            cursor.execute(f'SHOW {name}')
+            previous[name] = cursor.fetchone()[0]
+            cursor.execute('SELECT set_config(%s, %s, false)', [name, str(value)])
+    try:
+        yield
+    finally:
+        if connection.connection is not None:
+            with connection.cursor() as cursor:
+                for name, value in previous.items():
+                    cursor.execute('SELECT set_config(%s, %s, false)', [name, value])
+
+
+def index_validity(schema_editor, name):
+    """True/False for a valid/INVALID index called ``name``, None if there is none."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = %s",
+            [name],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class SafeAddIndex(AddIndexConcurrently):
+    """AddIndex that builds concurrently on Postgres without a statement timeout."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if not is_postgres(connection):
+            return super(AddIndexConcurrently, self).database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        valid = index_validity(schema_editor, self.index.name)
+        if valid:
+            # Built by an earlier, interrupted run of this migration
+            return
+        if valid is False:
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.index.name)}')
+        # Concurrent builds don't block writes; let them take as long as they need
+        with session_timeouts(connection, statement_timeout=0):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgres(schema_editor.connection):
+            return super(AddIndexConcurrently, self).database_backwards(app_label, schema_editor, from_state, to_state)
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class SafeRemoveIndex(RemoveIndexConcurrently):
+    """RemoveIndex that drops concurrently on Postgres."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgres(schema_editor.connection):
+            return super(RemoveIndexConcurrently, self).database_forwards(app_label, schema_editor, from_state, to_state)
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if not is_postgres(connection):
+            return super(RemoveIndexConcurrently, self).database_backwards(app_label, schema_editor, from_state, to_state)
+        with session_timeouts(connection, statement_timeout=0):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class SafeDropFieldIndex(NotInTransactionMixin, migrations.AlterField):
+    """
+    AlterField that only turns a field's ``db_index`` (or a foreign key's
+    implicit index) off, dropping the index concurrently on Postgres.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if not is_postgres(connection):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        meta_index_names = {index.name for index in model._meta.indexes}
+        for name in schema_editor._constraint_names(
+            model, [field.column], index=True, type_=models.Index.suffix, exclude=meta_index_names,
+        ):
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}')
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if not is_postgres(connection):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        with session_timeouts(connection, statement_timeout=0):
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field], concurrently=True))
+
+
+class SafeAddConstraint(NotInTransactionMixin, migrations.AddConstraint):
+    """
+    AddConstraint for an index-backed UniqueConstraint, built with
+    ``CREATE UNIQUE INDEX CONCURRENTLY`` on Postgres.
+    """
+
+    def __init__(self, model_name, constraint):
+        if not isinstance(constraint, models.UniqueConstraint) or not (
+            constraint.condition or constraint.expressions or constraint.include
+        ):
+            raise ValueError("SafeAddConstraint only supports partial, expression or covering UniqueConstraints.")
+        super().__init__(model_name, constraint)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if not is_postgres(connection):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(connection.alias, model):
+            return
+        valid = index_validity(schema_editor, self.constraint.name)
+        if valid:
+            return
+        if valid is False:
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.constraint.name)}')
+        sql = str(self.constraint.create_sql(model, schema_editor))
+        with session_timeouts(connection, statement_timeout=0):
+            schema_editor.execute(sql.replace('CREATE UNIQUE INDEX', 'CREATE UNIQUE INDEX CONCURRENTLY', 1))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgres(schema_editor.connection):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.constraint.name)}')
+
+
+def run_in_batches(queryset, apply, batch_size=1000):
+    """
+    Call ``apply(batch_queryset)`` for consecutive primary-key ranges of
+    ``queryset``, committing after each batch. Use from ``RunPython`` in an
+    ``atomic = False`` migration. Returns the number of rows visited.
+    """
+    total = 0
+    last_pk = None
+    queryset = queryset.order_by('pk')
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        ids = list(page.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic(using=queryset.db):
+            apply(queryset.model._base_manager.db_manager(queryset.db).filter(pk__in=ids))
+        total += len(ids)
+        last_pk = ids[-1]
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+def unsafe_operations(migration):
+    """
+    Yield ``(level, operation, reason)`` for operations in ``migration`` that
+    can block traffic or break the running release on a live table. Operations
+    on tables created earlier in the same migration are skipped.
+    """
+    created = set()
+    for operation in migration.operations:
+        if isinstance(operation, migrations.CreateModel):
+            created.add(operation.name_lower)
+            continue
+        if getattr(operation, 'model_name_lower', None) in created:
+            continue
+
+        if isinstance(operation, (AddIndexConcurrently, RemoveIndexConcurrently, SafeAddConstraint, SafeDropFieldIndex)):
+            if migration.atomic:
+                yield ERROR, operation, "concurrent index operations need atomic = False on the migration"
+        elif isinstance(operation, migrations.AddIndex):
+            yield ERROR, operation, "CREATE INDEX blocks writes for the whole build; use SafeAddIndex"
+        elif isinstance(operation, migrations.RemoveIndex):
+            yield WARNING, operation, "DROP INDEX waits for an exclusive lock; use SafeRemoveIndex"
+        elif isinstance(operation, migrations.AddConstraint):
+            yield ERROR, operation, "builds an index or scans every row under lock"
+        elif isinstance(operation, (migrations.AlterUniqueTogether, migrations.AlterIndexTogether)):
+            yield ERROR, operation, "builds an index under lock; use Meta.indexes/constraints and SafeAddIndex"
+        elif isinstance(operation, migrations.AlterField):
+            yield WARNING, operation, "may rewrite the table or check every row under an exclusive lock"
+        elif isinstance(operation, (migrations.RemoveField, migrations.DeleteModel)):
+            yield WARNING, operation, "the running release still reads it; drop it from code one deploy earlier"
+        elif isinstance(operation, (migrations.RenameField, migrations.RenameModel)):
+            yield ERROR, operation, "breaks the running release; add the new name, backfill, then drop the old"
+        elif isinstance(operation, migrations.AddField):
+            field = operation.field
+            if not field.null and not field.has_default() and field.db_default is NOT_PROVIDED:
+                yield ERROR, operation, "NOT NULL column without a default fails on existing rows"
+        elif isinstance(operation, migrations.RunPython):
+            if migration.atomic:
+                yield WARNING, operation, "one long transaction; use run_in_batches in an atomic = False migration"
+        elif isinstance(operation, migrations.RunSQL):
+            if 'concurrently' not in str(operation.sql).lower():
+                yield WARNING, operation, "raw SQL; review its locking by hand"
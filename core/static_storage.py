@@ -0,0 +1,97 @@
+"""
+Incremental variant of WhiteNoise's compressed manifest storage.
+
+Hashed files are named after their content, so a hashed file whose .br/.gz
+variants already exist in STATIC_ROOT never needs compressing again. Other
+files reuse their variants while the variant's mtime still matches the
+source (WhiteNoise copies the source mtime onto each variant). Files that
+don't compress well get no variants, so they are recorded with their mtime
+in ``SKIPPED_MANIFEST`` and skipped again while unchanged. Only what is
+left is compressed, across a pool of processes so brotli uses every core.
+Pair with the ``deploy_static`` command and a STATIC_ROOT that survives
+releases.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from whitenoise.compress import Compressor
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+VARIANT_SUFFIXES = ('.br', '.gz')
+
+# Files in STATIC_ROOT that compression left without variants: {path: mtime}
+SKIPPED_MANIFEST = 'staticfiles.uncompressed.json'
+
+
+def compress_file(full_path, extensions):
+    """Compress one file in a worker process; returns the variant paths written."""
+    return Compressor(extensions=extensions, quiet=True).compress(full_path)
+
+
+class IncrementalCompressedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    compression_stats = None
+
+    def load_skipped(self):
+        try:
+            with open(self.path(SKIPPED_MANIFEST)) as manifest:
+                return json.load(manifest)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_skipped(self, skipped):
+        full_path = self.path(SKIPPED_MANIFEST)
+        with open(full_path + '.tmp', 'w') as manifest:
+            json.dump(skipped, manifest, sort_keys=True)
+        os.replace(full_path + '.tmp', full_path)
+
+    def has_current_variants(self, path, hashed, skipped):
+        full_path = self.path(path)
+        source_mtime = os.stat(full_path).st_mtime
+        variants = [full_path + suffix for suffix in VARIANT_SUFFIXES if os.path.exists(full_path + suffix)]
+        if not variants:
+            # Not worth compressing last time, and unchanged since
+            return path in skipped and (hashed or skipped[path] == source_mtime)
+        if hashed:
+            return True
+        return all(os.stat(variant).st_mtime == source_mtime for variant in variants)
+
+    def compress_files(self, paths):
+        extensions = getattr(settings, 'WHITENOISE_SKIP_COMPRESS_EXTENSIONS', None)
+        compressor = self.create_compressor(extensions=extensions, quiet=True)
+        hashed_names = set(self.hashed_files.values())
+        skipped = self.load_skipped()
+
+        pending, reused, still_skipped = [], 0, {}
+        for path in paths:
+            if not compressor.should_compress(path):
+                continue
+            if self.has_current_variants(path, path in hashed_names, skipped):
+                reused += 1
+                if path in skipped:
+                    still_skipped[path] = skipped[path]
+            else:
+                pending.append(path)
+
+        started = time.perf_counter()
+        if pending:
+            workers = min(getattr(settings, 'STATIC_COMPRESS_WORKERS', None) or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(compress_file, self.path(path), extensions): path for path in pending}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    prefix_len = len(self.path(path)) - len(path)
+                    compressed_paths = future.result()
+                    if not compressed_paths:
+                        still_skipped[path] = os.stat(self.path(path)).st_mtime
+                    for compressed_path in compressed_paths:
+                        yield path, compressed_path[prefix_len:]
+        self.save_skipped(still_skipped)
+
+        self.compression_stats = {
+            'compressed': len(pending),
+            'reused': reused,
+            'seconds': time.perf_counter() - started,
+        }
@@ -0,0 +1,285 @@
+import gzip
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.cache import bump_generation, cached_swr, query_cache_key
+from core.compression import PREFERRED_ENCODINGS, accepted_encodings, build_cache_entry, choose_encoding, response_from_cache_entry
+from core.middleware import ApiCompressionMiddleware
+from core.static_storage import IncrementalCompressedManifestStaticFilesStorage
+from core.throttling import TAKE_TOKEN_SCRIPT, EndpointRateThrottle, TokenBucketThrottle, parse_rate, take_token_script
+
+BODY = b'{"results": [' + b','.join(b'{"name": "Rex"}' for _ in range(200)) + b']}'
+
+
+class TestThrottle(TokenBucketThrottle):
+    scope = 'test'
+    rate = '3/s'
+
+    def get_rate(self, scope):
+        return self.rate
+
+
+class SlowReadCache:
+    """The default cache with slow reads, which widens any read-modify-write race."""
+
+    def get(self, *args, **kwargs):
+        value = cache.get(*args, **kwargs)
+        time.sleep(0.001)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(cache, name)
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def request(self, ip='10.0.0.1'):
+        return Request(APIRequestFactory().get('/api/pets/', REMOTE_ADDR=ip))
+
+    def allowed(self, count, request=None, throttle_class=TestThrottle):
+        request = request or self.request()
+        return [throttle_class().allow_request(request, None) for _ in range(count)]
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('60/min'), (60, 1.0))
+        self.assertEqual(parse_rate('10/s'), (10, 10.0))
+
+    def test_burst_up_to_capacity(self):
+        self.assertEqual(self.allowed(4), [True, True, True, False])
+        throttle = TestThrottle()
+        self.assertFalse(throttle.allow_request(self.request(), None))
+        self.assertAlmostEqual(throttle.wait(), 1 / 3, delta=0.05)
+
+    def test_refills_over_time(self):
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            self.assertEqual(self.allowed(4), [True, True, True, False])
+        with mock.patch('core.throttling.time.time', return_value=1000.4):
+            self.assertEqual(self.allowed(2), [True, False])
+        with mock.patch('core.throttling.time.time', return_value=1060.0):
+            self.assertEqual(self.allowed(4), [True, True, True, False])
+
+    def test_clients_have_separate_buckets(self):
+        self.assertEqual(self.allowed(4, self.request('10.0.0.1')), [True, True, True, False])
+        self.assertEqual(self.allowed(1, self.request('10.0.0.2')), [True])
+
+    def test_concurrent_requests_never_share_a_token(self):
+        class SlowRefill(TestThrottle):
+            rate = '20/d'
+
+        request = self.request()
+        with mock.patch.object(TokenBucketThrottle, 'cache', SlowReadCache()), \
+                ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: SlowRefill().allow_request(request, None), range(100)))
+        self.assertEqual(results.count(True), 20)
+
+    def test_endpoint_scope(self):
+        throttle = EndpointRateThrottle()
+        self.assertEqual(throttle.get_scope(SimpleNamespace(basename='pet', action='list')), 'pet-list')
+        self.assertEqual(throttle.get_scope(SimpleNamespace()), 'endpoint')
+        with mock.patch.dict('rest_framework.settings.api_settings.DEFAULT_THROTTLE_RATES',
+                             {'endpoint': '5/s', 'pet-list': '2/s'}):
+            self.assertEqual(throttle.get_rate('pet-list'), '2/s')
+            self.assertEqual(throttle.get_rate('breed-list'), '5/s')
+
+
+
+    def test_redis_script_is_registered_once_per_client(self):
+        client = mock.Mock()
+        self.assertIs(take_token_script(client), take_token_script(client))
+        client.register_script.assert_called_once_with(TAKE_TOKEN_SCRIPT)
+
+    def test_client_ip_behind_cloudflare_and_nginx(self):
+        # Cloudflare appends the client, nginx appends the Cloudflare edge
+        request = Request(APIRequestFactory().get(
+            '/api/pets/', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7, 172.70.1.1', REMOTE_ADDR='10.0.0.9',
+        ))
+        self.assertEqual(TestThrottle().get_ident(request), '203.0.113.7')
+
+
+@override_settings(API_COMPRESSION_MIN_SIZE=1024)
+class CompressionTests(SimpleTestCase):
+    def request(self, path='/api/pets/', accept='gzip, deflate'):
+        return RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings(self.request(accept='gzip;q=0.8, br;q=0, deflate')), {'gzip', 'deflate'})
+        self.assertEqual(choose_encoding(self.request(accept='*')), PREFERRED_ENCODINGS[0])
+        self.assertEqual(choose_encoding(self.request(accept='gzip, br;q=0')), 'gzip')
+        self.assertIsNone(choose_encoding(self.request(accept='identity')))
+
+    def test_cache_entries_hold_every_variant(self):
+        entry = build_cache_entry(BODY)
+        self.assertEqual(gzip.decompress(entry['gzip']), BODY)
+        self.assertEqual(build_cache_entry(b'{}'), {'content_type': 'application/json', 'identity': b'{}'})
+
+    def test_cached_responses_use_the_stored_variant(self):
+        entry = build_cache_entry(BODY)
+        response = response_from_cache_entry(self.request(accept='gzip'), entry)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response.content, entry['gzip'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = response_from_cache_entry(self.request(accept=''), entry)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, BODY)
+
+    def middleware(self, request, content=BODY, **headers):
+        def get_response(request):
+            response = HttpResponse(content, content_type='application/json')
+            for name, value in headers.items():
+                response[name] = value
+            return response
+        return ApiCompressionMiddleware(get_response)(request)
+
+    def test_middleware_compresses_large_api_responses(self):
+        response = self.middleware(self.request(), ETag='"abc"')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_middleware_leaves_other_responses_alone(self):
+        self.assertFalse(self.middleware(self.request(path='/admin/')).has_header('Content-Encoding'))
+        self.assertFalse(self.middleware(self.request(), content=b'{}').has_header('Content-Encoding'))
+        self.assertFalse(self.middleware(self.request(accept='')).has_header('Content-Encoding'))
+        response = self.middleware(self.request(), **{'Content-Encoding': 'br'})
+        self.assertEqual(response.content, BODY)
+
+
+class CachedSwrTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.compute = mock.Mock(side_effect=['first', 'second'])
+
+    def get(self, **kwargs):
+        return cached_swr('swr-test', self.compute, soft_ttl=10, hard_ttl=100, background=False, **kwargs)
+
+    def test_fresh_values_are_served_from_cache(self):
+        self.assertEqual(self.get(), 'first')
+        self.assertEqual(self.get(), 'first')
+        self.assertEqual(self.compute.call_count, 1)
+
+    def test_stale_values_are_refreshed(self):
+        with mock.patch('core.cache.time.time', return_value=1000.0):
+            self.assertEqual(self.get(), 'first')
+        with mock.patch('core.cache.time.time', return_value=1011.0):
+            self.assertEqual(self.get(), 'second')
+            self.assertEqual(self.get(), 'second')
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_generations_change_query_keys(self):
+        request = Request(APIRequestFactory().get('/api/pets/', {'b': '2', 'a': '1'}))
+        same = Request(APIRequestFactory().get('/api/pets/', {'a': '1', 'b': '2'}))
+        key = query_cache_key('pets_list', request)
+        self.assertEqual(query_cache_key('pets_list', same), key)
+        bump_generation('pets_list')
+        self.assertNotEqual(query_cache_key('pets_list', request), key)
+
+    def test_stale_values_are_served_while_another_worker_refreshes(self):
+        with mock.patch('core.cache.time.time', return_value=1000.0):
+            self.get()
+        cache.add('swr-test:lock', 1)
+        with mock.patch('core.cache.time.time', return_value=1011.0):
+            self.assertEqual(self.get(), 'first')
+        self.assertEqual(self.compute.call_count, 1)
+
+
+# Compress in threads; the storage only needs an executor
+@mock.patch('core.static_storage.ProcessPoolExecutor', ThreadPoolExecutor)
+class IncrementalStaticCompressionTests(SimpleTestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.storage = IncrementalCompressedManifestStaticFilesStorage(location=root.name)
+        self.write('app.css', b'body { color: black; }\n' * 200)
+        self.write('tiny.js', b'x')
+
+    def write(self, name, content):
+        with open(self.storage.path(name), 'wb') as f:
+            f.write(content)
+
+    def compress(self):
+        written = [variant for _, variant in self.storage.compress_files(['app.css', 'tiny.js'])]
+        return written, self.storage.compression_stats
+
+    def test_unchanged_files_are_not_compressed_again(self):
+        written, stats = self.compress()
+        self.assertIn('app.css.gz', written)
+        self.assertFalse(os.path.exists(self.storage.path('tiny.js.gz')))
+        self.assertEqual((stats['compressed'], stats['reused']), (2, 0))
+
+        # Files that weren't worth compressing are remembered too
+        written, stats = self.compress()
+        self.assertEqual(written, [])
+        self.assertEqual((stats['compressed'], stats['reused']), (0, 2))
+
+    def test_changed_files_are_compressed_again(self):
+        self.compress()
+        for name in ('app.css', 'tiny.js'):
+            stat = os.stat(self.storage.path(name))
+            os.utime(self.storage.path(name), (stat.st_atime, stat.st_mtime + 10))
+        _, stats = self.compress()
+        self.assertEqual((stats['compressed'], stats['reused']), (2, 0))
+
+
+# Admin pages link static files; no manifest is built for tests
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STORAGES={**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}},
+)
+class FastLaneTests(TestCase):
+    def assert_full_stack(self, request):
+        self.assertFalse(request.fast_lane)
+        self.assertTrue(hasattr(request, 'session'))
+        self.assertTrue(hasattr(request, '_messages'))
+
+    def test_anonymous_api_reads_skip_sessions_auth_and_messages(self):
+        for path in ('/api/breeds/', '/'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                request = response.wsgi_request
+                self.assertTrue(request.fast_lane)
+                self.assertFalse(hasattr(request, 'session'))
+                self.assertFalse(hasattr(request, '_messages'))
+                self.assertFalse(request.user.is_authenticated)
+                # Django's own frame options middleware still runs
+                self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+    def test_admin_keeps_the_full_stack(self):
+        response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assert_full_stack(response.wsgi_request)
+        self.assertIn('csrftoken', response.cookies)
+
+        get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret')
+        response = self.client.post('/admin/login/?next=/admin/', {'username': 'admin', 'password': 'secret'})
+        self.assertRedirects(response, '/admin/')
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assert_full_stack(response.wsgi_request)
+        self.assertEqual(response.wsgi_request.user.username, 'admin')
+
+    def test_api_requests_with_a_session_or_writes_get_the_full_stack(self):
+        self.client.force_login(get_user_model().objects.create_user(username='visitor'))
+        response = self.client.get('/api/breeds/')
+        self.assert_full_stack(response.wsgi_request)
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+        self.client.logout()
+        response = self.client.post('/api/breeds/')
+        self.assert_full_stack(response.wsgi_request)
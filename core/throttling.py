@@ -0,0 +1,155 @@
+"""
+Token-bucket throttles backed by the shared cache.
+
+Each client (user id, or IP for anonymous traffic) gets a bucket that holds up
+to ``capacity`` tokens and refills continuously, so short bursts are allowed
+while the sustained rate stays capped. Rates use DRF's ``"<num>/<period>"``
+format in ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``.
+
+Taking a token is atomic: on Redis (django-redis) the read-refill-write runs
+as one Lua script, registered once per connection, so concurrent requests
+from a client can't spend the same token. Other backends are serialised per
+process, which is exact for the in-memory cache used without ``REDIS_URL``.
+"""
+import math
+import threading
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    from django_redis import get_redis_connection
+    from django_redis.cache import RedisCache
+except ImportError:  # Only installed where REDIS_URL is set
+    RedisCache = None
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# KEYS[1] bucket hash; ARGV capacity, refill per second, expiry seconds.
+# Returns {allowed, tokens left}; floats as strings, Redis truncates numbers.
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill)
+if tokens < 1 then
+    return {0, tostring(tokens)}
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {1, tostring(tokens - 1)}
+"""
+
+_local_lock = threading.Lock()
+
+# Registered script per Redis client, so its SHA is computed once per process
+_scripts = {}
+
+
+def take_token_script(client):
+    script = _scripts.get(id(client))
+    if script is None:
+        # The script keeps a reference to its client, so the id stays unique
+        script = _scripts[id(client)] = client.register_script(TAKE_TOKEN_SCRIPT)
+    return script
+
+
+def parse_rate(rate):
+    """'60/min' -> (capacity 60, refill 1.0 token/s)."""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    cache_alias = DEFAULT_CACHE_ALIAS
+    scope = None
+    cache_format = 'throttle_bucket_%(scope)s_%(ident)s'
+
+    def __init__(self):
+        self.wait_time = None
+
+    @property
+    def cache(self):
+        # The backend itself, not the ``django.core.cache.cache`` proxy, so the
+        # Redis check below sees its real type
+        return caches[self.cache_alias]
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_rate(self, scope):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+
+    def get_ident(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user-{user.pk}'
+        return super().get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = self.get_rate(scope) if scope else None
+        if rate is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        key = self.cache_format % {'scope': scope, 'ident': self.get_ident(request)}
+        allowed, tokens = self.take_token(key, capacity, refill)
+        if not allowed:
+            self.wait_time = (1 - tokens) / refill
+        return allowed
+
+    def take_token(self, key, capacity, refill):
+        """Atomically take one token from the bucket at ``key``; returns (allowed, tokens left)."""
+        # A full bucket needs capacity/refill seconds to rebuild; expire after that
+        timeout = math.ceil(capacity / refill) + 1
+        if RedisCache is not None and isinstance(self.cache, RedisCache):
+            key = self.cache.make_and_validate_key(key)
+            client = get_redis_connection(self.cache_alias, write=True)
+            allowed, tokens = take_token_script(client)(
+                keys=[key], args=[capacity, refill, timeout],
+            )
+            return bool(allowed), float(tokens)
+
+        with _local_lock:
+            now = time.time()
+            tokens, updated_at = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - updated_at) * refill)
+            if tokens < 1:
+                return False, tokens
+            self.cache.set(key, (tokens - 1, now), timeout=timeout)
+            return True, tokens - 1
+
+    def wait(self):
+        return self.wait_time
+
+
+class ClientRateThrottle(TokenBucketThrottle):
+    """Overall budget per client across every API endpoint."""
+    scope = 'client'
+
+
+class EndpointRateThrottle(TokenBucketThrottle):
+    """
+    Per-client budget for each endpoint (``<basename>-<action>``, e.g.
+    ``pet-list``), falling back to the ``endpoint`` rate.
+    """
+    default_scope = 'endpoint'
+
+    def get_scope(self, view):
+        basename = getattr(view, 'basename', None)
+        action = getattr(view, 'action', None)
+        if basename and action:
+            return f'{basename}-{action}'
+        return self.default_scope
+
+    def get_rate(self, scope):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        return rates.get(scope, rates.get(self.default_scope))
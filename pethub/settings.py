@@ -48,21 +48,32 @@ INSTALLED_APPS = [
     'django_filters',
     'corsheaders',
     'core',
+    'users',
     'pets',
 ]
 
 MIDDLEWARE = [
+    # First, so CORS preflights are answered before any other middleware runs
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.ApiCompressionMiddleware',
+    'core.middleware.FastLaneMiddleware',
+    # core.middleware subclasses of Django's session, auth and messages
+    # middleware: skipped on the fast lane
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.AuthenticationMiddleware',
+    'core.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Anonymous GET/HEAD/OPTIONS requests (no session cookie) to these paths skip
+# sessions, auth and messages; empty disables the fast lane. Covers the public
+# API and the health check at /, which load balancers poll every few seconds.
+FAST_LANE_URLS_REGEX = os.getenv('FAST_LANE_URLS_REGEX', r'^/(api/|$)')
+
 ROOT_URLCONF = 'pethub.urls'
 
 TEMPLATES = [
@@ -99,6 +110,24 @@ else:
         }
     }
 
+# Cache - shared Redis when configured (throttle buckets, response caches,
+# cache locks); per-process memory otherwise
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -126,10 +155,37 @@ USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+# Point STATIC_ROOT outside the release directory in production so
+# deploy_static can reuse hashed and compressed files from earlier releases
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+# Processes compressing static files (default: one per CPU)
+STATIC_COMPRESS_WORKERS = int(os.getenv('STATIC_COMPRESS_WORKERS', '0')) or None
 
-# Use WhiteNoise for static file serving
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Storage backends are referenced by dotted path and only imported on first
+# use, so boto3/botocore load only in workers that actually touch R2 media.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Use WhiteNoise for static file serving (hashed + compressed, incrementally)
+    'staticfiles': {
+        'BACKEND': 'core.static_storage.IncrementalCompressedManifestStaticFilesStorage',
+    },
+}
+
+# Serve pet list pages from the PetCard projection (pets.cards); enable after rebuild_pet_cards
+PET_CARDS_ENABLED = os.getenv('PET_CARDS_ENABLED', 'False').lower() == 'true'
+
+# CDN edge caching: responses carry cache tags, writes purge them (core.cdn)
+CLOUDFLARE_ZONE_ID = os.getenv('CLOUDFLARE_ZONE_ID', '')
+CLOUDFLARE_API_TOKEN = os.getenv('CLOUDFLARE_API_TOKEN', '')
+CDN_PURGE_BACKEND = os.getenv(
+    'CDN_PURGE_BACKEND',
+    'core.cdn.CloudflarePurgeBackend' if CLOUDFLARE_API_TOKEN else 'core.cdn.NullPurgeBackend',
+)
+CDN_CACHE_TAG_HEADER = os.getenv('CDN_CACHE_TAG_HEADER', 'Cache-Tag')
+# Seconds to collect purge tags before sending them in one batch
+CDN_PURGE_DEBOUNCE = float(os.getenv('CDN_PURGE_DEBOUNCE', '2'))
 
 # Media files (uploads) - Environment aware
 USE_R2_STORAGE = os.getenv('USE_R2_STORAGE', 'False').lower() == 'true'
@@ -153,10 +209,10 @@ if USE_R2_STORAGE:
     AWS_QUERYSTRING_AUTH = False
     AWS_DEFAULT_ACL = None
     
-    # Use R2 for media files
-    DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
-    # Keep WhiteNoise for static files
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    # Use R2 for media files (WhiteNoise keeps serving static files)
+    STORAGES['default'] = {
+        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+    }
     STATIC_URL = '/static/'   # WhiteNoise will serve from STATIC_ROOT
 
 else:
@@ -164,7 +220,6 @@ else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
     STATIC_URL = '/static/'
-    STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 # CORS settings - Environment aware
 CORS_ALLOWED_ORIGINS = [
@@ -194,6 +249,9 @@ CORS_ALLOWED_HEADERS = [
     'x-requested-with',
 ]
 
+# API response compression (gzip, plus brotli when the package is installed)
+API_COMPRESSION_MIN_SIZE = int(os.getenv('API_COMPRESSION_MIN_SIZE', '1024'))  # bytes
+
 # Default primary key field type - Use UUIDField for consistency
 # DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'  # Commented out to prevent UUID->BigInt migration issues
 
@@ -214,4 +272,20 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
+    # Token buckets per client (IP or user), stored in the shared cache
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.ClientRateThrottle',
+        'core.throttling.EndpointRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'client': os.getenv('THROTTLE_RATE_CLIENT', '600/min'),
+        'endpoint': os.getenv('THROTTLE_RATE_ENDPOINT', '120/min'),
+        'pet-list': os.getenv('THROTTLE_RATE_PET_LIST', '60/min'),
+        'pet-suggest': os.getenv('THROTTLE_RATE_PET_SUGGEST', '600/min'),  # per keystroke, no DB
+    },
+    # Proxies in front of gunicorn when reading client IPs from X-Forwarded-For:
+    # Cloudflare appends the client address and EB's nginx appends Cloudflare's,
+    # so the client is second from the right. Set to 1 when serving without
+    # Cloudflare, or every client shares the bucket of a Cloudflare edge IP.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '2')),
 }
@@ -0,0 +1,27 @@
+"""
+Process warm-up for preloaded WSGI masters.
+
+Imports code and builds in-memory structures, then closes every database
+connection it opened, so forked workers do not share sockets with the master.
+"""
+import logging
+
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+
+from pets.suggestions import suggestion_index
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    # Loading the URLconf imports every view, serializer and admin module
+    get_resolver().reverse_dict
+    # Workers inherit the suggestion index and replay later changes
+    try:
+        suggestion_index.load()
+    except DatabaseError:
+        # Workers build it on first use instead
+        logger.exception("Could not build the suggestion index at warm-up")
+    # Never hand an open connection to forked workers
+    connections.close_all()
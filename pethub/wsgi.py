@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pethub.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf, views and serializers up front. With gunicorn --preload
+# this runs once in the master and workers fork already warm.
+if os.getenv('WSGI_WARMUP', 'True') == 'True':
+    from pethub.warmup import warm_up
+    warm_up()
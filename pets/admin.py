@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Pet, PetParent, Breed
+from .models import Pet, PetParent, Breed, Location, ArchivedPet, SavedSearch
+from .models.pets import MAX_PHOTOS_PER_PET, MAX_VIDEOS_PER_PET
 
 
 @admin.register(Breed)
@@ -10,24 +11,32 @@ class BreedAdmin(admin.ModelAdmin):
     ordering = ['name']
 
 
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ['name', 'county', 'latitude', 'longitude']
+    list_filter = ['county']
+    search_fields = ['name', 'county']
+    ordering = ['name']
+
+
 class PetPhotoInline(admin.TabularInline):
     model = Pet.photos.rel.related_model
     extra = 1
-    max_num = 5
+    max_num = MAX_PHOTOS_PER_PET
     fields = ['image', 'order', 'is_main']
 
 
 class PetVideoInline(admin.TabularInline):
     model = Pet.videos.rel.related_model
     extra = 1
-    max_num = 2
+    max_num = MAX_VIDEOS_PER_PET
     fields = ['video', 'title']
 
 
 @admin.register(Pet)
 class PetAdmin(admin.ModelAdmin):
     list_display = ['name', 'breed', 'gender', 'size', 'age_months', 'price', 'status', 'featured']
-    list_filter = ['breed', 'gender', 'size', 'status', 'featured', 'champions_bloodline']
+    list_filter = ['breeder', 'breed', 'gender', 'size', 'status', 'featured', 'champions_bloodline']
     search_fields = ['name', 'breed__name', 'size', 'color']
     
     fieldsets = (
@@ -38,7 +47,7 @@ class PetAdmin(admin.ModelAdmin):
             'fields': ('champions_bloodline', 'father', 'mother')
         }),
         ('Status & Pricing', {
-            'fields': ('price', 'featured', 'status')
+            'fields': ('breeder', 'price', 'featured', 'status')
         }),
         ('Health & Documentation', {
             'fields': ('rabies_vaccinated', 'rabies_vaccination_date', 'dhpp_vaccinated', 'dhpp_vaccination_date', 
@@ -71,3 +80,24 @@ class PetParentAdmin(admin.ModelAdmin):
             'fields': ('registration_number',)
         }),
     )
+
+
+@admin.register(ArchivedPet)
+class ArchivedPetAdmin(admin.ModelAdmin):
+    list_display = ['name', 'breed_name', 'status', 'price', 'deleted_at', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['name', 'breed_name']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'user', 'breed', 'gender', 'size', 'location', 'is_active', 'created_at']
+    list_filter = ['is_active', 'gender', 'size']
+    search_fields = ['name', 'user__username', 'user__email', 'location']
+    raw_id_fields = ['user', 'breed']
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pets'
+
+    def ready(self):
+        # Register model signal handlers
+        from pets import signals  # noqa: F401
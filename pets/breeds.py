@@ -0,0 +1,76 @@
+"""
+In-process breed registry.
+
+Breeds are a small table that changes a few times a year, yet every pet
+list, detail and write used to join or look it up. The registry loads all
+breeds once per process and serves them from memory. Breed writes bump a
+shared generation after commit; each worker compares its copy against that
+stamp at most once per ``CHECK_INTERVAL`` seconds and reloads when it moved,
+so a change reaches every worker within about a second.
+
+Instances handed out are shared between threads and must not be modified.
+"""
+import threading
+import time
+import uuid
+
+from django.db import transaction
+
+from core.cache import bump_generation, generation
+from pets.models import Breed
+
+GENERATION_NAME = 'pets_breed_registry'
+
+# Seconds a worker trusts its copy before re-reading the shared stamp
+CHECK_INTERVAL = 1.0
+
+
+class BreedRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breeds = None
+        self._ordered = None
+        self._generation = None
+        self._checked_at = 0.0
+
+    def _load(self):
+        ordered = list(Breed.objects.order_by('name'))
+        self._breeds = {breed.pk: breed for breed in ordered}
+        self._ordered = ordered
+
+    def _ensure_loaded(self):
+        now = time.monotonic()
+        if self._breeds is not None and now - self._checked_at < CHECK_INTERVAL:
+            return
+        current = generation(GENERATION_NAME)
+        with self._lock:
+            if self._breeds is None or current != self._generation:
+                self._load()
+                self._generation = current
+            self._checked_at = now
+
+    def get(self, pk):
+        """The breed with primary key ``pk`` (UUID or string), or None."""
+        if not isinstance(pk, uuid.UUID):
+            try:
+                pk = uuid.UUID(str(pk))
+            except (TypeError, ValueError, AttributeError):
+                return None
+        self._ensure_loaded()
+        return self._breeds.get(pk)
+
+    def all(self):
+        """Every breed, ordered by name."""
+        self._ensure_loaded()
+        return list(self._ordered)
+
+    def invalidate(self):
+        """Reload in every worker once the current transaction commits."""
+        def bump():
+            with self._lock:
+                self._breeds = None
+                self._generation = bump_generation(GENERATION_NAME)
+        transaction.on_commit(bump)
+
+
+breed_registry = BreedRegistry()
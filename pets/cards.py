@@ -0,0 +1,118 @@
+"""
+Pet card projection for the catalog list.
+
+``PetCard`` holds one row per live pet with the list endpoint's filter and
+sort columns and the pet's list entry pre-rendered as JSON. ``refresh`` is
+called from pet, photo, breed and counter writes inside their transaction,
+so cards never disagree with committed pets. A list page is then one query
+on the card table, and its fragments are spliced into the response body
+without running the serializer.
+
+Only requests the projection can answer exactly take this path (see
+``supports``); anything else (search, radius, health filters, sparse
+fieldsets, sold pets) goes through the ORM as before. The path is switched
+on with ``PET_CARDS_ENABLED`` once ``rebuild_pet_cards`` has filled the table.
+"""
+import json
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from pets.models import Pet, PetCard
+from pets.models.pets import LIVE_STATUSES, main_photo_prefetch
+from pets.serializers import BreedSerializer, PetListSerializer
+
+# Card columns copied from the pet row
+COPIED_FIELDS = [
+    'breed_id', 'breeder_id', 'normalized_location_id', 'status', 'gender', 'size', 'age_months',
+    'price', 'featured', 'location', 'lifestyle', 'characteristics', 'created_at',
+]
+UPDATE_FIELDS = [name.removesuffix('_id') for name in COPIED_FIELDS] + [
+    'interest_count', 'view_count', 'main_photo_url', 'body',
+]
+
+# Fields left out of the stored body and added per request
+REQUEST_FIELDS = ('main_photo', 'distance')
+
+# Query parameters the card path understands; anything else takes the ORM path
+SUPPORTED_PARAMS = {
+    'page', 'ordering', 'status', 'breed', 'gender', 'size', 'age_months', 'age_months__gte',
+    'age_months__lte', 'location__icontains', 'normalized_location', 'lifestyle', 'characteristics',
+}
+SUPPORTED_ORDERINGS = {'created_at', 'age_months', 'price', 'featured', 'recommended', 'popular'}
+
+REFRESH_CHUNK = 500
+
+
+def enabled():
+    return getattr(settings, 'PET_CARDS_ENABLED', False)
+
+
+def supports(request):
+    """Whether the card table can answer this list request exactly."""
+    params = request.query_params
+    if not params.keys() <= SUPPORTED_PARAMS:
+        return False
+    if params.get('status', LIVE_STATUSES[0]) not in LIVE_STATUSES:
+        return False
+    ordering = [term.strip().lstrip('-') for term in params.get('ordering', '').split(',') if term.strip()]
+    return set(ordering) <= SUPPORTED_ORDERINGS
+
+
+class PetCardSerializer(PetListSerializer):
+    """List entry as stored on the card; reads the breed row, not the registry, so renames show up at once."""
+    breed = BreedSerializer(read_only=True)
+
+
+def build_cards(pets):
+    cards = []
+    data = PetCardSerializer(pets, many=True, context={}).data
+    for pet, entry in zip(pets, data):
+        main_photo_url = entry.get('main_photo') or ''
+        for name in REQUEST_FIELDS:
+            entry.pop(name, None)
+        cards.append(PetCard(
+            id=pet.pk,
+            **{name: getattr(pet, name) for name in COPIED_FIELDS},
+            interest_count=pet.interest_count,
+            view_count=pet.view_count,
+            main_photo_url=main_photo_url,
+            body=JSONRenderer().render(entry).decode(),
+        ))
+    return cards
+
+
+def refresh(pet_ids):
+    """Bring the cards of ``pet_ids`` in line with the pets; call inside the writing transaction."""
+    pet_ids = list(pet_ids)
+    for start in range(0, len(pet_ids), REFRESH_CHUNK):
+        chunk = pet_ids[start:start + REFRESH_CHUNK]
+        pets = list(
+            Pet.all_objects.filter(pk__in=chunk, deleted_at=None, status__in=LIVE_STATUSES)
+            .select_related('breed', 'counter').prefetch_related(main_photo_prefetch())
+        )
+        live = {pet.pk for pet in pets}
+        PetCard.objects.filter(pk__in=[pk for pk in chunk if pk not in live]).delete()
+        if pets:
+            PetCard.objects.bulk_create(
+                build_cards(pets), update_conflicts=True, unique_fields=['id'], update_fields=UPDATE_FIELDS,
+            )
+
+
+def refresh_breed(breed_id):
+    """Re-render every card of a breed (its name and size are embedded)."""
+    refresh(PetCard.objects.filter(breed_id=breed_id).values_list('pk', flat=True))
+
+
+def render_page(envelope, rows, request):
+    """
+    JSON body for a paginated list: ``envelope`` (count, next, previous)
+    plus the ``(main_photo_url, body)`` rows spliced in as ``results``.
+    """
+    fragments = []
+    for main_photo_url, body in rows:
+        main_photo = request.build_absolute_uri(main_photo_url) if main_photo_url else None
+        extra = json.dumps({'main_photo': main_photo, 'distance': None}, separators=(',', ':'), ensure_ascii=False)
+        fragments.append(f'{body[:-1]},{extra[1:]}')
+    head = JSONRenderer().render(envelope)
+    return head[:-1] + b',"results":[' + ','.join(fragments).encode() + b']}'
@@ -0,0 +1,88 @@
+"""
+Write-buffered interest and view counters.
+
+A hit never touches ``pets_pet``: ``record`` drops repeat visitors with a
+cache ``add`` and appends one row to PetCounterEvent. ``flush`` (run
+periodically by the flush_pet_counters command) folds a batch of events into
+per-pet deltas and applies them to PetCounter with one UPDATE per chunk of
+pets, so pet rows, ``Pet.updated_at`` and the list caches are left alone.
+The affected pet cards (pets.cards) are re-rendered in the same transaction.
+"""
+import hashlib
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
+from pets import cards
+from pets.models import Pet, PetCounter, PetCounterEvent
+
+INTEREST = PetCounterEvent.Kind.INTEREST
+VIEW = PetCounterEvent.Kind.VIEW
+
+# A visitor counts once per pet and kind within this window
+UNIQUE_WINDOW = 24 * 60 * 60
+
+# Pets per UPDATE statement
+UPDATE_CHUNK = 500
+
+
+def visitor_key(request):
+    """Stable identity for deduplicating hits: user id, else client IP and user agent."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user-{user.pk}'
+    ident = f"{BaseThrottle().get_ident(request)}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.md5(ident.encode(), usedforsecurity=False).hexdigest()
+
+
+def record(pet_id, kind, visitor):
+    """Count a hit unless this visitor was already counted; returns whether it was."""
+    if not cache.add(f'pet_counter_seen_{kind}_{pet_id}_{visitor}', 1, timeout=UNIQUE_WINDOW):
+        return False
+    PetCounterEvent.objects.create(pet_id=pet_id, kind=kind)
+    return True
+
+
+def _delta(pet_ids, deltas, kind):
+    return Case(
+        *[When(pet_id=pk, then=Value(deltas[pk][kind])) for pk in pet_ids if deltas[pk][kind]],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def flush(batch_size=5000):
+    """Fold up to ``batch_size`` pending events into PetCounter; returns the number consumed."""
+    with transaction.atomic():
+        # Concurrent flushes skip events another flush holds
+        events = list(
+            PetCounterEvent.objects.order_by('id').select_for_update(skip_locked=True)
+            .values_list('id', 'pet_id', 'kind')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        deltas = defaultdict(Counter)
+        for _, pet_id, kind in events:
+            deltas[pet_id][kind] += 1
+
+        # Pets hard-deleted since the hit have nothing left to count
+        pet_ids = sorted(Pet.all_objects.filter(pk__in=deltas).values_list('pk', flat=True))
+        PetCounter.objects.bulk_create([PetCounter(pet_id=pk) for pk in pet_ids], ignore_conflicts=True)
+        now = timezone.now()
+        for start in range(0, len(pet_ids), UPDATE_CHUNK):
+            chunk = pet_ids[start:start + UPDATE_CHUNK]
+            PetCounter.objects.filter(pet_id__in=chunk).update(
+                interest_count=F('interest_count') + _delta(chunk, deltas, INTEREST),
+                view_count=F('view_count') + _delta(chunk, deltas, VIEW),
+                updated_at=now,
+            )
+
+        # Cards embed the counts
+        cards.refresh(pet_ids)
+        PetCounterEvent.objects.filter(pk__in=[event_id for event_id, _, _ in events]).delete()
+    return len(events)
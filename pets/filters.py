@@ -0,0 +1,166 @@
+import math
+
+from django.db.models import F
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from pets.health import MAX_DUE_DAYS, deworming_overdue_q, fully_vaccinated_q, vaccination_due_q
+from pets.locations import bounding_box, haversine_km, match_location
+
+
+class PetOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that expands public ordering names into index-aligned sort keys.
+
+    Every ordering ends with an ``id`` tiebreaker in the same direction as the
+    last key, so Postgres can walk one of the ``(status, ..., id)`` composite
+    indexes forwards or backwards instead of sorting.
+    """
+    # Public ordering name -> sort keys (ascending form)
+    sort_keys = {
+        'recommended': ['-featured', '-created_at'],
+        'featured': ['featured', 'created_at'],
+        'price': ['price'],
+        'created_at': ['created_at'],
+        'popular': ['-counter__interest_count', '-counter__view_count'],
+    }
+    # Keys on optional relations; pets without a row sort after those with one
+    nullable_keys = {'counter__interest_count', 'counter__view_count'}
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*[self.order_expression(key) for key in ordering])
+
+    def order_expression(self, key):
+        name = key.lstrip('-')
+        if name not in self.nullable_keys:
+            return key
+        if key.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_first=True)
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        # "distance" only exists when PetNearFilter annotated the queryset
+        fields = super().remove_invalid_fields(queryset, fields, view, request)
+        if 'distance' not in queryset.query.annotations:
+            fields = [term for term in fields if term.lstrip('-') != 'distance']
+        return fields
+
+    def get_ordering(self, request, queryset, view):
+        # Radius searches rank nearest first unless an ordering is requested
+        if not request.query_params.get(self.ordering_param) and 'distance' in queryset.query.annotations:
+            return self.expand_ordering(['distance'])
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return self.expand_ordering(ordering)
+
+    def expand_ordering(self, ordering):
+        """Expand ordering terms into sort keys and append the id tiebreaker."""
+        keys = []
+        for term in ordering:
+            descending = term.startswith('-')
+            for key in self.sort_keys.get(term.lstrip('-'), [term.lstrip('-')]):
+                if descending:
+                    key = key[1:] if key.startswith('-') else f'-{key}'
+                if key.lstrip('-') not in [k.lstrip('-') for k in keys]:
+                    keys.append(key)
+
+        descending = keys[-1].startswith('-')
+        keys = [key for key in keys if key.lstrip('-') != 'id']
+        keys.append('-id' if descending else 'id')
+        return keys
+
+
+class PetCardOrderingFilter(PetOrderingFilter):
+    """PetOrderingFilter for the PetCard projection, which carries the counters itself."""
+    sort_keys = {
+        **PetOrderingFilter.sort_keys,
+        'popular': ['-interest_count', '-view_count'],
+    }
+    nullable_keys = set()
+
+
+class PetNearFilter(filters.BaseFilterBackend):
+    """
+    Filter pets within ``radius_km`` of ``near`` ("lat,lng" or a gazetteer town name).
+
+    Rows are prefiltered on the indexed Location latitude/longitude bounding box,
+    then annotated with the haversine ``distance`` (km) for exact filtering and ranking.
+    """
+    near_param = 'near'
+    radius_param = 'radius_km'
+    default_radius_km = 25.0
+    max_radius_km = 500.0
+
+    def get_origin(self, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(','))
+        except ValueError:
+            location = match_location(value)
+            return (location.latitude, location.longitude) if location else None
+        if not (math.isfinite(latitude) and math.isfinite(longitude)) or abs(latitude) > 90 or abs(longitude) > 180:
+            raise ValidationError({self.near_param: 'Expected "lat,lng" with -90 <= lat <= 90 and -180 <= lng <= 180.'})
+        return latitude, longitude
+
+    def get_radius(self, request):
+        try:
+            radius = float(request.query_params.get(self.radius_param, self.default_radius_km))
+        except ValueError:
+            radius = self.default_radius_km
+        if math.isnan(radius):
+            radius = self.default_radius_km
+        return min(max(radius, 0.0), self.max_radius_km)
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.near_param)
+        if not value:
+            return queryset
+
+        origin = self.get_origin(value)
+        if origin is None:
+            return queryset.none()
+
+        latitude, longitude = origin
+        radius = self.get_radius(request)
+        min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius)
+        return queryset.filter(
+            normalized_location__latitude__range=(min_lat, max_lat),
+            normalized_location__longitude__range=(min_lng, max_lng),
+        ).annotate(
+            distance=haversine_km(latitude, longitude, prefix='normalized_location__')
+        ).filter(distance__lte=radius)
+
+
+class PetHealthFilter(filters.BaseFilterBackend):
+    """
+    Health compliance filters:
+    ``fully_vaccinated=true|false``, ``vaccination_due_within=<days>`` (0-365),
+    ``deworming_overdue=true``. Never-vaccinated pets count as due.
+    """
+    truthy = ('true', '1', 'yes')
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        fully_vaccinated = params.get('fully_vaccinated')
+        if fully_vaccinated is not None:
+            if fully_vaccinated.lower() in self.truthy:
+                queryset = queryset.filter(fully_vaccinated_q())
+            else:
+                queryset = queryset.exclude(fully_vaccinated_q())
+
+        due_within = params.get('vaccination_due_within')
+        if due_within is not None:
+            try:
+                days = min(max(int(due_within), 0), MAX_DUE_DAYS)
+            except ValueError:
+                raise ValidationError({'vaccination_due_within': 'Expected a whole number of days.'})
+            queryset = queryset.filter(vaccination_due_q(days))
+
+        if params.get('deworming_overdue', '').lower() in self.truthy:
+            queryset = queryset.filter(deworming_overdue_q())
+
+        return queryset
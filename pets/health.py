@@ -0,0 +1,52 @@
+"""
+Vaccination and deworming compliance queries.
+
+"Due within N days" is rewritten as a range on the stored date itself
+(``last_date <= today + N - interval``), so the date indexes on Pet serve it
+directly instead of computing a next-due date per row.
+
+A pet with no recorded vaccination or deworming (flag unset or no date) is
+treated as due now, for every treatment alike.
+"""
+from datetime import timedelta
+
+from django.db.models import DateField, F, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+RABIES_INTERVAL = timedelta(days=365)
+DHPP_INTERVAL = timedelta(days=365)
+DEWORMING_INTERVAL = timedelta(days=90)
+
+# Largest "due within" horizon accepted, in days
+MAX_DUE_DAYS = 365
+
+
+def fully_vaccinated_q():
+    return Q(rabies_vaccinated=True, dhpp_vaccinated=True)
+
+
+def vaccination_due_q(days, today=None):
+    """Pets never vaccinated, or whose rabies or DHPP booster is due (or overdue) within ``days``."""
+    horizon = (today or timezone.localdate()) + timedelta(days=days)
+    return (
+        Q(rabies_vaccinated=False) | Q(rabies_vaccination_date__isnull=True)
+        | Q(rabies_vaccination_date__lte=horizon - RABIES_INTERVAL)
+        | Q(dhpp_vaccinated=False) | Q(dhpp_vaccination_date__isnull=True)
+        | Q(dhpp_vaccination_date__lte=horizon - DHPP_INTERVAL)
+    )
+
+
+def deworming_overdue_q(today=None):
+    """Pets never dewormed or last dewormed more than DEWORMING_INTERVAL ago."""
+    cutoff = (today or timezone.localdate()) - DEWORMING_INTERVAL
+    return Q(dewormed=False) | Q(deworming_date__isnull=True) | Q(deworming_date__lt=cutoff)
+
+
+def annotate_due_dates(queryset):
+    """Add rabies_due, dhpp_due and deworming_due (dates) computed in SQL."""
+    return queryset.annotate(
+        rabies_due=Cast(F('rabies_vaccination_date') + RABIES_INTERVAL, DateField()),
+        dhpp_due=Cast(F('dhpp_vaccination_date') + DHPP_INTERVAL, DateField()),
+        deworming_due=Cast(F('deworming_date') + DEWORMING_INTERVAL, DateField()),
+    )
@@ -0,0 +1,70 @@
+"""
+Location normalization and radius search helpers.
+
+Towns come from the bundled offline gazetteer (``pets/data/kenya_towns.json``).
+Radius searches prefilter on the indexed latitude/longitude bounding box and
+rank the survivors by haversine distance computed in SQL.
+"""
+import json
+import math
+from pathlib import Path
+
+from django.db.models import F
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'kenya_towns.json'
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+
+def load_gazetteer():
+    """Return the bundled list of towns as dicts (name, county, latitude, longitude)."""
+    with open(GAZETTEER_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _normalize_name(value):
+    return ' '.join(value.replace('’', "'").lower().split())
+
+
+def match_location(text, location_model=None):
+    """
+    Match free text such as "Karen, Nairobi" to a Location.
+    Each comma-separated part is tried in order; returns None when nothing matches.
+    """
+    if not text:
+        return None
+    if location_model is None:
+        from pets.models import Location
+        location_model = Location
+    for part in text.split(','):
+        name = _normalize_name(part)
+        if name:
+            match = location_model.objects.filter(name__iexact=name).first()
+            if match:
+                return match
+    return None
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing the radius."""
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    return (latitude - lat_delta, latitude + lat_delta, longitude - lng_delta, longitude + lng_delta)
+
+
+def haversine_km(latitude, longitude, prefix=''):
+    """
+    Expression for the great-circle distance in km from a point to the
+    ``latitude``/``longitude`` columns reached through ``prefix``.
+    """
+    lat_col = Radians(F(f'{prefix}latitude'))
+    lng_col = Radians(F(f'{prefix}longitude'))
+    lat = math.radians(latitude)
+    lng = math.radians(longitude)
+    a = (
+        Power(Sin((lat_col - lat) / 2), 2)
+        + math.cos(lat) * Cos(lat_col) * Power(Sin((lng_col - lng) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
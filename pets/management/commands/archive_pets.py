@@ -0,0 +1,91 @@
+import json
+from datetime import timedelta
+
+from django.core import serializers
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core import cdn
+from core.cache import bump_generation
+from pets.models import ArchivedPet, Pet, PetCard, PetStatus, Tombstone
+from pets.signals import per_row_delete_receivers_disconnected
+
+
+class Command(BaseCommand):
+    help = "Move old sold and soft-deleted pets from the pets table into ArchivedPet, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sold-days', type=int, default=180, help="Archive sold pets not updated for this many days.")
+        parser.add_argument('--deleted-days', type=int, default=30, help="Archive pets soft-deleted this many days ago.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many pets would be archived.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        candidates = Pet.all_objects.filter(
+            Q(status=PetStatus.SOLD, updated_at__lt=now - timedelta(days=options['sold_days']))
+            | Q(deleted_at__lt=now - timedelta(days=options['deleted_days']))
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"Would archive {candidates.count()} pets")
+            return
+
+        total = 0
+        while True:
+            with transaction.atomic():
+                # Lock one batch; concurrent runs skip rows another run holds
+                ids = list(
+                    candidates.order_by('pk').select_for_update(skip_locked=True)
+                    .values_list('pk', flat=True)[:options['batch_size']]
+                )
+                if not ids:
+                    break
+                pets = list(
+                    Pet.all_objects.filter(pk__in=ids).select_related('breed').prefetch_related('photos', 'videos')
+                )
+                ArchivedPet.objects.bulk_create([self.archive_row(pet) for pet in pets], ignore_conflicts=True)
+                with per_row_delete_receivers_disconnected():
+                    Pet.all_objects.filter(pk__in=ids).delete()
+                self.after_delete(pets)
+            total += len(ids)
+            self.stdout.write(f"Archived {total} pets")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} pets archived"))
+
+    @staticmethod
+    def after_delete(pets):
+        """What the per-row delete receivers do, once for the whole batch."""
+        ids = [pet.pk for pet in pets]
+        PetCard.objects.filter(pk__in=ids).delete()
+        Tombstone.objects.bulk_create([Tombstone(kind=Tombstone.Kind.PET, object_id=pk) for pk in ids])
+        # Sold and soft-deleted pets are never in the similarity or suggestion
+        # indexes, so only the list caches and edge copies need invalidating
+        breeder_ids = sorted({pet.breeder_id for pet in pets} - {None})
+        names = ['pets_list'] + [f'pets_list_b{breeder_id}' for breeder_id in breeder_ids]
+        transaction.on_commit(lambda: [bump_generation(name) for name in names])
+        cdn.purge_dispatcher.purge(cdn.PET_LIST_TAG, *(cdn.pet_tag(pk) for pk in ids))
+
+    @staticmethod
+    def archive_row(pet):
+        fields = serializers.serialize('python', [pet])[0]['fields']
+        fields['photos'] = [photo.image.name for photo in pet.photos.all()]
+        fields['videos'] = [video.video.name for video in pet.videos.all()]
+        files = fields['photos'] + fields['videos']
+        if pet.health_certificate:
+            files.append(pet.health_certificate.name)
+        return ArchivedPet(
+            id=pet.pk,
+            name=pet.name,
+            breed_name=pet.breed.name,
+            status=pet.status,
+            price=pet.price,
+            created_at=pet.created_at,
+            updated_at=pet.updated_at,
+            deleted_at=pet.deleted_at,
+            data=json.loads(json.dumps(fields, cls=DjangoJSONEncoder)),
+            files=files,
+        )
@@ -0,0 +1,169 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from pets import cards, query_plans
+from pets.locations import load_gazetteer
+from pets.models import Breed, LifestyleChoices, CharacteristicChoices, Location, Pet, PetCard, PetGender, PetSize, PetStatus
+from users.models import Breeder
+
+SEED_BREEDS = 40
+SEED_BREEDERS = 50
+# Fixed so the seeded statistics, and with them the plans, don't depend on the server's default
+SEED_STATISTICS_TARGET = 100
+SEED_TABLES = (Pet, PetCard, Breed, Location, Breeder)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every catalog query shape and fail if a shape stops using its index, scans the pets "
+        "table or exceeds its cost ceiling. Also reports indexes no shape uses, redundant indexes and, "
+        "with --usage, scan counts from pg_stat_user_indexes. Postgres only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help="Insert this many pets first (rolled back afterwards).")
+        parser.add_argument('--cost-scale', type=float, default=1.0, help="Multiply every cost ceiling.")
+        parser.add_argument('--usage', action='store_true', help="Report idx_scan counts (meaningful on a production replica).")
+        parser.add_argument('--fail-on-redundant', action='store_true')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("check_query_plans needs PostgreSQL (EXPLAIN (FORMAT JSON), pg_catalog).")
+
+        failures = []
+        if options['seed']:
+            self.vacuum()
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.seed(options['seed'])
+                failures = self.run_checks(options)
+                if options['seed']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back")
+
+        if failures:
+            raise CommandError(f"{len(failures)} query plan check(s) failed: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All query plan checks passed"))
+
+    def run_checks(self, options):
+        catalog = query_plans.index_catalog()
+        context = query_plans.shape_context()
+        failures, used = [], set()
+
+        self.stdout.write(f"{'shape':<26} {'cost':>10}  indexes")
+        for shape in query_plans.QUERY_SHAPES:
+            result = query_plans.check_shape(shape, context, catalog, options['cost_scale'])
+            used |= result.indexes
+            status = self.style.ERROR('FAIL') if result.failures else 'ok'
+            self.stdout.write(f"{shape.name:<26} {result.cost:>10.1f}  {', '.join(sorted(result.indexes)) or '-'}  {status}")
+            for failure in result.failures:
+                self.stdout.write(f"    {failure}")
+            if result.failures:
+                failures.append(shape.name)
+
+        if options['verbosity'] > 1:
+            unused = sorted(
+                name for name, (table, _, _, unique, _) in catalog.items()
+                if table == query_plans.PETS_TABLE and not unique and name not in used
+            )
+            self.stdout.write(f"\n{query_plans.PETS_TABLE} indexes no query shape used:")
+        else:
+            # Accepted, foreign key and retained indexes are expected to go unused at times
+            unused = query_plans.unused_indexes(catalog, used)
+            self.stdout.write(f"\n{query_plans.PETS_TABLE} indexes no query shape uses or accepts (-v 2 lists all unused):")
+        for name in unused:
+            table, columns, predicate, _, size = catalog[name]
+            partial = ' (partial)' if predicate else ''
+            self.stdout.write(f"  {name} ({', '.join(columns)}){partial}, {size // 1024} KiB")
+        if not unused:
+            self.stdout.write("  none")
+
+        redundant = query_plans.redundant_indexes(catalog)
+        self.stdout.write("\nRedundant indexes (columns lead another index with the same predicate):")
+        for name, covered_by in redundant:
+            self.stdout.write(self.style.WARNING(f"  {name} -> covered by {covered_by}"))
+        if not redundant:
+            self.stdout.write("  none")
+        if redundant and options['fail_on_redundant']:
+            failures.append('redundant indexes')
+
+        if options['usage']:
+            self.stdout.write(f"\n{'index':<48} {'scans':>12} {'size KiB':>10}")
+            for name, scans, size in query_plans.usage_stats():
+                self.stdout.write(f"{name:<48} {scans:>12} {size // 1024:>10}")
+        return failures
+
+    def vacuum(self):
+        """Clear dead rows left by earlier rolled-back seeds, which would inflate scan costs run after run."""
+        with connection.cursor() as cursor:
+            for model in SEED_TABLES:
+                cursor.execute(f'VACUUM ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    def seed(self, count):
+        """Insert a realistic catalog: mostly live pets, some sold and deleted, spread over breeders and towns."""
+        rng = random.Random(0)
+        now = timezone.now()
+
+        if not Location.objects.exists():
+            Location.objects.bulk_create([
+                Location(name=town['name'], county=town.get('county', ''), latitude=town['latitude'], longitude=town['longitude'])
+                for town in load_gazetteer()
+            ])
+        locations = list(Location.objects.all())
+
+        breeds = Breed.objects.bulk_create([
+            Breed(name=f"Plan check breed {i}", size_category=rng.choice(PetSize.values)) for i in range(SEED_BREEDS)
+        ])
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"plan-check-{i}") for i in range(SEED_BREEDERS)
+        ])
+        breeders = Breeder.objects.bulk_create([
+            Breeder(user=user, name=user.username, slug=user.username) for user in users
+        ])
+
+        def pet(i):
+            location = rng.choice(locations)
+            return Pet(
+                name=f"Pet {i}",
+                breed=rng.choice(breeds),
+                breeder=rng.choice(breeders) if rng.random() < 0.5 else None,
+                weight=rng.randrange(2, 60),
+                size=rng.choice(PetSize.values),
+                gender=rng.choice(PetGender.values),
+                age_months=rng.randrange(1, 120),
+                price=rng.randrange(5_000, 200_000),
+                featured=rng.random() < 0.05,
+                status=rng.choices(PetStatus.values, weights=[60, 10, 30])[0],
+                champions_bloodline=rng.random() < 0.1,
+                rabies_vaccinated=rng.random() < 0.7,
+                rabies_vaccination_date=(now - timedelta(days=rng.randrange(0, 500))).date(),
+                dhpp_vaccinated=rng.random() < 0.7,
+                dhpp_vaccination_date=(now - timedelta(days=rng.randrange(0, 500))).date(),
+                deworming_date=(now - timedelta(days=rng.randrange(0, 200))).date() if rng.random() < 0.8 else None,
+                location=location.name,
+                normalized_location=location,
+                lifestyle=rng.sample(LifestyleChoices.values, 2),
+                characteristics=rng.sample(CharacteristicChoices.values, 2),
+                deleted_at=now if rng.random() < 0.05 else None,
+            )
+
+        for start in range(0, count, 5000):
+            pets = Pet.all_objects.bulk_create([pet(i) for i in range(start, min(start + 5000, count))])
+            # bulk_create sends no signals; build the list projection the card shapes read
+            cards.refresh([pet.pk for pet in pets])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SET LOCAL default_statistics_target = {SEED_STATISTICS_TARGET}')
+            for model in SEED_TABLES:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        self.stdout.write(f"Seeded {count} pets")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from pets import counters
+
+
+class Command(BaseCommand):
+    help = "Apply pending interest/view hits to the pet counters table in batches. Run every minute or so."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Events folded per transaction.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            flushed = counters.flush(batch_size=options['batch_size'])
+            if not flushed:
+                break
+            total += flushed
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} counter events flushed"))
@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from pets.storage_gc import iter_orphans
+
+
+class Command(BaseCommand):
+    help = "Find media files no pet, photo, video or parent references, and delete them (or report with --dry-run)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report orphans without deleting.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Names checked against the DB per query.")
+        parser.add_argument('--workers', type=int, default=8, help="Parallel deletes.")
+        parser.add_argument('--min-age-hours', type=int, default=24, help="Skip files newer than this (in-flight uploads).")
+        parser.add_argument('--show', type=int, default=20, help="Orphan names listed in the report.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        older_than = timezone.now() - timedelta(hours=options['min_age_hours'])
+        orphans = iter_orphans(default_storage, batch_size=options['batch_size'], older_than=older_than)
+
+        count = size = failed = 0
+        shown = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                try:
+                    batch = list(islice(orphans, options['batch_size']))
+                except ValueError as exc:
+                    # Storage backend that can't be listed
+                    raise CommandError(str(exc))
+                if not batch:
+                    break
+                count += len(batch)
+                size += sum(stored.size for stored in batch)
+                shown += [stored.name for stored in batch[:options['show'] - len(shown)]]
+                if not options['dry_run']:
+                    names = [stored.name for stored in batch]
+                    for name, deleted in zip(names, pool.map(self.delete, names)):
+                        if not deleted:
+                            failed += 1
+                            self.stderr.write(f"Failed to delete {name}")
+
+        for name in shown:
+            self.stdout.write(f"  {name}")
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {count - failed} orphaned files ({size / 1024 / 1024:.1f} MB) "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
+
+    @staticmethod
+    def delete(name):
+        try:
+            default_storage.delete(name)
+            return True
+        except Exception:
+            return False
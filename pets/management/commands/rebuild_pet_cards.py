@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pets import cards
+from pets.models import Pet, PetCard
+from pets.models.pets import LIVE_STATUSES
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render every pet card (the list endpoint's projection) from the pets table and drop "
+        "cards of pets that are no longer live. Run once before setting PET_CARDS_ENABLED, and "
+        "after changing what PetListSerializer renders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=cards.REFRESH_CHUNK, help="Pets per transaction.")
+
+    def handle(self, *args, **options):
+        live = Pet.objects.filter(status__in=LIVE_STATUSES).order_by('pk')
+        total = 0
+        last_pk = None
+        while True:
+            page = live if last_pk is None else live.filter(pk__gt=last_pk)
+            ids = list(page.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                cards.refresh(ids)
+            total += len(ids)
+            last_pk = ids[-1]
+
+        stale, _ = PetCard.objects.exclude(pk__in=live.values('pk')).delete()
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} cards rendered, {stale} stale cards removed"))
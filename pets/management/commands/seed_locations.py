@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from pets.locations import load_gazetteer, match_location
+from pets.models import Location, Pet
+
+
+class Command(BaseCommand):
+    help = "Load the bundled Kenyan towns gazetteer and link pets to normalized locations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--relink', action='store_true',
+            help="Re-match every pet, not only those without a normalized location.",
+        )
+
+    def handle(self, *args, **options):
+        created = 0
+        for town in load_gazetteer():
+            _, was_created = Location.objects.update_or_create(
+                name=town['name'],
+                defaults={
+                    'county': town.get('county', ''),
+                    'latitude': town['latitude'],
+                    'longitude': town['longitude'],
+                },
+            )
+            created += was_created
+        self.stdout.write(f"Locations: {created} created, {Location.objects.count()} total")
+
+        pets = Pet.objects.exclude(location='')
+        if not options['relink']:
+            pets = pets.filter(normalized_location__isnull=True)
+
+        # Match each distinct location string once, then update in bulk
+        linked = 0
+        for text in pets.values_list('location', flat=True).distinct().iterator():
+            location = match_location(text)
+            if location:
+                linked += pets.filter(location=text).update(normalized_location=location)
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} pets to normalized locations"))
@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from pets.models import SearchAlert
+
+
+class Command(BaseCommand):
+    help = "Email pending saved-search alerts (one message per user per batch) and mark them sent."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            with transaction.atomic():
+                # Lock one batch; concurrent runs skip alerts another run holds
+                alerts = list(
+                    SearchAlert.objects.filter(sent_at__isnull=True).order_by('id')
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .select_related('saved_search__user', 'pet')[:options['batch_size']]
+                )
+                if not alerts:
+                    break
+                send_mass_mail(self.build_messages(alerts), fail_silently=False)
+                SearchAlert.objects.filter(pk__in=[alert.pk for alert in alerts]).update(sent_at=timezone.now())
+            total += len(alerts)
+            self.stdout.write(f"Sent {total} alerts")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} alerts sent"))
+
+    @staticmethod
+    def build_messages(alerts):
+        by_user = defaultdict(list)
+        for alert in alerts:
+            by_user[alert.saved_search.user].append(alert)
+
+        messages = []
+        for user, user_alerts in by_user.items():
+            if not user.email:
+                continue
+            lines = [f"- {alert.pet.name} ({alert.saved_search})" for alert in user_alerts]
+            body = "New pets matching your saved searches:\n\n" + "\n".join(lines)
+            messages.append(("New pets matching your saved searches", body, settings.DEFAULT_FROM_EMAIL, [user.email]))
+        return messages
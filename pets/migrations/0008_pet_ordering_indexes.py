@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:03
+
+from django.db import migrations
+
+from core.migration_ops import SafeRemoveIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index drops can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0007_remove_pet_interest_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='pet',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        SafeRemoveIndex(
+            model_name='pet',
+            name='pets_pet_status_9b2630_idx',
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def seed_locations(apps, schema_editor):
+    from pets.locations import load_gazetteer, match_location
+
+    Location = apps.get_model('pets', 'Location')
+    Pet = apps.get_model('pets', 'Pet')
+    for town in load_gazetteer():
+        Location.objects.get_or_create(
+            name=town['name'],
+            defaults={
+                'county': town.get('county', ''),
+                'latitude': town['latitude'],
+                'longitude': town['longitude'],
+            },
+        )
+
+    pets = Pet.objects.exclude(location='')
+    for text in pets.values_list('location', flat=True).distinct():
+        location = match_location(text, location_model=Location)
+        if location:
+            pets.filter(location=text).update(normalized_location=location)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0008_pet_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('county', models.CharField(blank=True, max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='pets_locati_latitud_e1348f_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='normalized_location',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Gazetteer town matched from location; set automatically on save', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pets', to='pets.location'),
+        ),
+        migrations.RunPython(seed_locations, migrations.RunPython.noop),
+    ]
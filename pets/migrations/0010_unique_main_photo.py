@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+from core.migration_ops import SafeAddConstraint
+
+
+def demote_duplicate_main_photos(apps, schema_editor):
+    # Keep the first main photo per pet so the constraint can be created
+    PetPhoto = apps.get_model('pets', 'PetPhoto')
+    seen = set()
+    duplicates = []
+    mains = PetPhoto.objects.filter(is_main=True).order_by('pet_id', 'order', 'created_at')
+    for pk, pet_id in mains.values_list('pk', 'pet_id'):
+        if pet_id in seen:
+            duplicates.append(pk)
+        seen.add(pet_id)
+    PetPhoto.objects.filter(pk__in=duplicates).update(is_main=False)
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0009_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_duplicate_main_photos, migrations.RunPython.noop),
+        SafeAddConstraint(
+            model_name='petphoto',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_main', True)), fields=('pet',), name='unique_main_photo_per_pet', violation_error_message='Only one main photo allowed per pet.'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:12
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from core.migration_ops import SafeAddIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0010_unique_main_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPet',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('breed_name', models.CharField(blank=True, max_length=100)),
+                ('status', models.CharField(max_length=10)),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.JSONField(default=dict)),
+                ('files', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, size=None)),
+            ],
+            options={
+                'ordering': ['-archived_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['status', '-created_at', '-id'], name='pet_live_newest_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['status', '-featured', '-created_at', '-id'], name='pet_live_featured_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['status', 'price', 'id'], name='pet_live_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedpet',
+            index=models.Index(fields=['archived_at'], name='pets_archiv_archive_139d2c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedpet',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['files'], name='archivedpet_files_idx'),
+        ),
+    ]
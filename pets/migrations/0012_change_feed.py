@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:13
+
+import uuid
+from django.db import migrations, models
+
+from core.migration_ops import SafeAddIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0011_pet_soft_delete_and_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('pet', 'Pet'), ('breed', 'Breed'), ('parent', 'Parent')], max_length=10)),
+                ('object_id', models.UUIDField()),
+            ],
+        ),
+        SafeAddIndex(
+            model_name='breed',
+            index=models.Index(fields=['updated_at', 'id'], name='pets_breed_updated_a7024f_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(fields=['updated_at', 'id'], name='pets_pet_updated_0bbb19_idx'),
+        ),
+        SafeAddIndex(
+            model_name='petparent',
+            index=models.Index(fields=['updated_at', 'id'], name='pets_petpar_updated_b78645_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['updated_at', 'id'], name='pets_tombst_updated_c91b0d_idx'),
+        ),
+    ]
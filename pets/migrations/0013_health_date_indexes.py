@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:15
+
+from django.db import migrations, models
+
+from core.migration_ops import SafeAddIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0012_change_feed'),
+    ]
+
+    operations = [
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['rabies_vaccination_date'], name='pet_live_rabies_date_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['dhpp_vaccination_date'], name='pet_live_dhpp_date_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved'])), fields=['deworming_date'], name='pet_live_deworming_date_idx'),
+        ),
+    ]
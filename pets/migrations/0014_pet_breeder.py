@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.migration_ops import SafeAddIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0013_health_date_indexes'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='breeder',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pets', to='users.breeder'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['available', 'reserved']), ('breeder__isnull', False)), fields=['breeder', 'status', '-created_at', '-id'], name='pet_breeder_live_newest_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('breeder__isnull', False)), fields=['breeder', 'breed', 'status', 'price'], name='pet_breeder_breed_price_idx'),
+        ),
+        SafeAddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('breeder__isnull', False)), fields=['breeder', 'gender', 'status', 'price'], name='pet_breeder_gender_price_idx'),
+        ),
+    ]
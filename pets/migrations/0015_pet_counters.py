@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0014_pet_breeder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PetCounterEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pet_id', models.UUIDField()),
+                ('kind', models.CharField(choices=[('interest', 'Interest'), ('view', 'View')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PetCounter',
+            fields=[
+                ('pet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counter', serialize=False, to='pets.pet')),
+                ('interest_count', models.PositiveIntegerField(default=0)),
+                ('view_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-interest_count', '-view_count'], name='petcounter_popular_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:19
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0015_pet_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('gender', models.CharField(blank=True, choices=[('male', 'Male'), ('female', 'Female'), ('unknown', 'Unknown')], max_length=10)),
+                ('size', models.CharField(blank=True, choices=[('small', 'Small'), ('medium', 'Medium'), ('large', 'Large'), ('xlarge', 'Extra Large')], max_length=10)),
+                ('min_age_months', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_age_months', models.PositiveIntegerField(blank=True, null=True)),
+                ('lifestyle', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('apartment_friendly', 'Apartment Friendly'), ('family_friendly', 'Family Friendly'), ('good_with_kids', 'Good with Kids'), ('good_with_other_pets', 'Good with Other Pets'), ('needs_yard', 'Needs Yard'), ('good_for_allergies', 'Good for Allergies'), ('experienced_owner', 'Experienced Owner')], max_length=30), blank=True, default=list, size=None)),
+                ('characteristics', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('friendly', 'Friendly'), ('active', 'Active'), ('calm', 'Calm'), ('protective', 'Protective'), ('intelligent', 'Intelligent'), ('easy_to_train', 'Easy to Train'), ('independent', 'Independent'), ('vocal', 'Vocal'), ('shy', 'Shy')], max_length=30), blank=True, default=list, size=None)),
+                ('location', models.CharField(blank=True, help_text='Matches pets whose location contains this text', max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('breed', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='pets.breed')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchAlert',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pets.pet')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='pets.savedsearch')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='searchalert_pending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('saved_search', 'pet'), name='unique_alert_per_search_pet')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 01:38
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0016_saved_searches'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PetCard',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('available', 'Available'), ('reserved', 'Reserved'), ('sold', 'Sold')], max_length=10)),
+                ('gender', models.CharField(choices=[('male', 'Male'), ('female', 'Female'), ('unknown', 'Unknown')], max_length=10)),
+                ('size', models.CharField(choices=[('small', 'Small'), ('medium', 'Medium'), ('large', 'Large'), ('xlarge', 'Extra Large')], max_length=10)),
+                ('age_months', models.PositiveIntegerField(null=True)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('featured', models.BooleanField(default=False)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('lifestyle', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=30), default=list, size=None)),
+                ('characteristics', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=30), default=list, size=None)),
+                ('interest_count', models.PositiveIntegerField(default=0)),
+                ('view_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('main_photo_url', models.CharField(blank=True, max_length=500)),
+                ('body', models.TextField()),
+                ('breed', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pets.breed')),
+                ('breeder', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='users.breeder')),
+                ('normalized_location', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pets.location')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-created_at', '-id'], name='petcard_newest_idx'), models.Index(fields=['status', '-featured', '-created_at', '-id'], name='petcard_featured_idx'), models.Index(fields=['status', 'price', 'id'], name='petcard_price_idx'), models.Index(fields=['status', 'age_months', 'id'], name='petcard_age_idx'), models.Index(fields=['status', '-interest_count', '-view_count', '-id'], name='petcard_popular_idx'), models.Index(fields=['breeder', 'status', '-created_at', '-id'], name='petcard_breeder_newest_idx'), models.Index(fields=['breed', 'status', '-created_at', '-id'], name='petcard_breed_newest_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.migration_ops import SafeDropFieldIndex, SafeRemoveIndex
+
+
+class Migration(migrations.Migration):
+    # Concurrent index drops can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('pets', '0017_pet_cards'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        # icontains filters can't use a btree on location
+        SafeRemoveIndex(
+            model_name='pet',
+            name='pets_pet_locatio_44d479_idx',
+        ),
+        # Covered by (breed, status, price)
+        SafeRemoveIndex(
+            model_name='pet',
+            name='pets_pet_breed_i_d7cafe_idx',
+        ),
+        SafeDropFieldIndex(
+            model_name='pet',
+            name='breed',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='pets', to='pets.breed'),
+        ),
+        # Covered by petcard_breed_newest_idx / petcard_breeder_newest_idx
+        SafeDropFieldIndex(
+            model_name='petcard',
+            name='breed',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pets.breed'),
+        ),
+        SafeDropFieldIndex(
+            model_name='petcard',
+            name='breeder',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='users.breeder'),
+        ),
+        # Covered by unique_alert_per_search_pet
+        SafeDropFieldIndex(
+            model_name='searchalert',
+            name='saved_search',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='pets.savedsearch'),
+        ),
+    ]
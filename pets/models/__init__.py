@@ -1,5 +1,11 @@
 from .pets import Pet, PetPhoto, PetVideo, Breed
 from .pet_parent import PetParent
+from .location import Location
+from .archive import ArchivedPet
+from .tombstone import Tombstone
+from .counters import PetCounter, PetCounterEvent
+from .cards import PetCard
+from .saved_search import SavedSearch, SearchAlert
 from .choices import PetSize, PetStatus, PetGender
 from .traits import LifestyleChoices, CharacteristicChoices
 
@@ -9,6 +15,14 @@ __all__ = [
     'PetVideo',
     'Breed',
     'PetParent',
+    'Location',
+    'ArchivedPet',
+    'Tombstone',
+    'PetCounter',
+    'PetCounterEvent',
+    'PetCard',
+    'SavedSearch',
+    'SearchAlert',
     'PetSize',
     'PetStatus', 
     'PetGender',
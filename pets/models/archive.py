@@ -0,0 +1,33 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+
+class ArchivedPet(models.Model):
+    """
+    Cold storage for sold or deleted pets moved out of the hot pets table by
+    the archive_pets command. ``data`` holds the full row plus media file names;
+    ``files`` lists every stored file the pet owned, so storage GC keeps them.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    name = models.CharField(max_length=100)
+    breed_name = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=10)
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(default=dict)
+    files = ArrayField(models.CharField(max_length=255), default=list, blank=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.status}, archived)"
+    
+    class Meta:
+        ordering = ['-archived_at']
+        indexes = [
+            models.Index(fields=['archived_at']),
+            # storage_gc.referenced_names (files && names)
+            GinIndex(fields=['files'], name='archivedpet_files_idx'),
+        ]
@@ -0,0 +1,55 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+from pets.models.choices import PetGender, PetSize, PetStatus
+
+
+class PetCard(models.Model):
+    """
+    Read model for the catalog list: one row per live pet with the columns
+    the list endpoint filters and sorts on, plus its list entry pre-rendered
+    as JSON. Maintained by ``pets.cards`` from pet, photo, breed and counter
+    writes in the same transaction; ``rebuild_pet_cards`` recreates it.
+    """
+    # Same value as the pet's primary key; no foreign key so card writes never lock pet rows
+    id = models.UUIDField(primary_key=True)
+    # Indexed by the breed and breeder list indexes below
+    breed = models.ForeignKey('pets.Breed', on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')
+    breeder = models.ForeignKey(
+        'users.Breeder', null=True, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+',
+    )
+    normalized_location = models.ForeignKey(
+        'pets.Location', null=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+',
+    )
+    status = models.CharField(max_length=10, choices=PetStatus.choices)
+    gender = models.CharField(max_length=10, choices=PetGender.choices)
+    size = models.CharField(max_length=10, choices=PetSize.choices)
+    age_months = models.PositiveIntegerField(null=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    featured = models.BooleanField(default=False)
+    location = models.CharField(max_length=100, blank=True)
+    lifestyle = ArrayField(models.CharField(max_length=30), default=list)
+    characteristics = ArrayField(models.CharField(max_length=30), default=list)
+    interest_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    # Storage URL of the main photo (made absolute per request)
+    main_photo_url = models.CharField(max_length=500, blank=True)
+    # PetListSerializer output without main_photo and distance
+    body = models.TextField()
+
+    def __str__(self):
+        return f"Card {self.id}"
+
+    class Meta:
+        indexes = [
+            # Same sort keys as the pet_live_* indexes (PetOrderingFilter)
+            models.Index(fields=['status', '-created_at', '-id'], name='petcard_newest_idx'),
+            models.Index(fields=['status', '-featured', '-created_at', '-id'], name='petcard_featured_idx'),
+            models.Index(fields=['status', 'price', 'id'], name='petcard_price_idx'),
+            models.Index(fields=['status', 'age_months', 'id'], name='petcard_age_idx'),
+            models.Index(fields=['status', '-interest_count', '-view_count', '-id'], name='petcard_popular_idx'),
+            models.Index(fields=['breeder', 'status', '-created_at', '-id'], name='petcard_breeder_newest_idx'),
+            models.Index(fields=['breed', 'status', '-created_at', '-id'], name='petcard_breed_newest_idx'),
+        ]
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class PetCounter(models.Model):
+    """
+    Interest and view totals for a pet, kept off the hot pets table so hits
+    never lock pet rows or move ``Pet.updated_at``. Written only by
+    ``pets.counters.flush``.
+    """
+    pet = models.OneToOneField('pets.Pet', on_delete=models.CASCADE, primary_key=True, related_name='counter')
+    interest_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.pet_id}: {self.interest_count} interested, {self.view_count} views"
+    
+    class Meta:
+        indexes = [
+            # "popular" ordering
+            models.Index(fields=['-interest_count', '-view_count'], name='petcounter_popular_idx'),
+        ]
+
+
+class PetCounterEvent(models.Model):
+    """
+    Append-only log of unique interest/view hits waiting to be flushed into
+    PetCounter. No foreign key, so inserts never touch the pets table.
+    """
+    
+    class Kind(models.TextChoices):
+        INTEREST = "interest", "Interest"
+        VIEW = "view", "View"
+    
+    id = models.BigAutoField(primary_key=True)
+    pet_id = models.UUIDField()
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.kind} {self.pet_id}"
+
+
+def counter_prefetch():
+    """Prefetch for rendering counts when the list query does not join PetCounter."""
+    return models.Prefetch('counter')
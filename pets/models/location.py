@@ -0,0 +1,20 @@
+from django.db import models
+from core.models import TimeStampedModel
+
+
+class Location(TimeStampedModel):
+    """Normalized town with coordinates, seeded from the bundled gazetteer."""
+    name = models.CharField(max_length=100, unique=True)
+    county = models.CharField(max_length=100, blank=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.name}, {self.county}" if self.county else self.name
+    
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            # Bounding-box prefilter for radius searches
+            models.Index(fields=['latitude', 'longitude']),
+        ]
@@ -11,3 +11,9 @@ class PetParent(TimeStampedModel):
     
     def __str__(self):
         return f"{self.name} ({self.gender})"
+    
+    class Meta:
+        indexes = [
+            # Change feed cursor
+            models.Index(fields=['updated_at', 'id']),
+        ]
@@ -1,11 +1,15 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from core.models import TimeStampedModel
 from .choices import PetSize, PetStatus, PetGender
 from .traits import LifestyleChoices, CharacteristicChoices
 from django.contrib.postgres.fields import ArrayField
 from .pet_parent import PetParent
 
+MAX_PHOTOS_PER_PET = 5
+MAX_VIDEOS_PER_PET = 2
+
 
 class Breed(TimeStampedModel):
     """Breed model for managing pet breeds through admin."""
@@ -18,12 +22,31 @@ class Breed(TimeStampedModel):
     
     def __str__(self):
         return self.name
+    
+    class Meta:
+        indexes = [
+            # Change feed cursor
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+
+# Statuses kept in the partial "live catalog" indexes
+LIVE_STATUSES = [PetStatus.AVAILABLE, PetStatus.RESERVED]
+LIVE_CONDITION = models.Q(deleted_at__isnull=True, status__in=LIVE_STATUSES)
+# Breeder-led indexes only hold pets listed by a breeder account
+BREEDER_CONDITION = models.Q(breeder__isnull=False)
+
+
+class LivePetManager(models.Manager):
+    """Default manager: hides soft-deleted pets."""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Pet(TimeStampedModel):
     # Basic Information
     name = models.CharField(max_length=100)
-    breed = models.ForeignKey('pets.Breed', on_delete=models.PROTECT, related_name='pets')
+    breed = models.ForeignKey('pets.Breed', on_delete=models.PROTECT, related_name='pets', db_index=False)  # (breed, status, price) leads with breed
     description = models.TextField(blank=True)
     color = models.CharField(max_length=50, blank=True)
     weight = models.DecimalField(max_digits=5, decimal_places=2, help_text="Weight in kgs")
@@ -57,8 +80,12 @@ class Pet(TimeStampedModel):
     health_notes = models.TextField(blank=True, help_text="Additional health information")
     
     # Breeder & Location
-    # breeder = models.ForeignKey('breeder.Breeder', on_delete=models.CASCADE, related_name='pets')
+    breeder = models.ForeignKey('users.Breeder', null=True, blank=True, on_delete=models.CASCADE, related_name='pets', db_index=False)  # composite indexes lead with breeder
     location = models.CharField(max_length=100, blank=True )
+    normalized_location = models.ForeignKey(
+        'pets.Location', null=True, blank=True, on_delete=models.SET_NULL, related_name='pets',
+        editable=False, help_text="Gazetteer town matched from location; set automatically on save"
+    )
     
     # Lifestyle & Characteristics
     lifestyle = ArrayField(
@@ -76,40 +103,103 @@ class Pet(TimeStampedModel):
     father = models.ForeignKey('pets.PetParent', null=True, blank=True, on_delete=models.SET_NULL, related_name='father_of')
     mother = models.ForeignKey('pets.PetParent', null=True, blank=True, on_delete=models.SET_NULL, related_name='mother_of')
     
+    # Soft delete; rows are moved to ArchivedPet later by archive_pets
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = LivePetManager()
+    all_objects = models.Manager()
+    
     @property
     def main_photo(self):
         """Get the main photo for this pet."""
-        main = self.photos.filter(is_main=True).first()
+        if hasattr(self, 'prefetched_main_photos'):
+            # Loaded in bulk by main_photo_prefetch()
+            main = self.prefetched_main_photos[0] if self.prefetched_main_photos else None
+        else:
+            main = self.photos.filter(is_main=True).first()
         return main.image if main else None
     
+    @property
+    def interest_count(self):
+        """Unique interested visitors, as of the last counter flush."""
+        counter = getattr(self, 'counter', None)
+        return counter.interest_count if counter else 0
+    
+    @property
+    def view_count(self):
+        """Unique detail views, as of the last counter flush."""
+        counter = getattr(self, 'counter', None)
+        return counter.view_count if counter else 0
+    
     @property
     def is_fully_vaccinated(self):
         """Check if pet has both required vaccinations."""
         return self.rabies_vaccinated and self.dhpp_vaccinated
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Breeder the row was loaded with; a move must invalidate the old breeder's caches too
+        instance._loaded_breeder_id = instance.__dict__.get('breeder_id')
+        return instance
+    
+    def soft_delete(self):
+        """Hide the pet from the catalog without touching photos, videos or files."""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at', 'updated_at'])
+    
+    def save(self, *args, **kwargs):
+        # Resolve the free-text location to a gazetteer town
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            from pets.locations import match_location
+            self.normalized_location = match_location(self.location)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'normalized_location'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.name} - {self.breed.name} ({self.gender} {self.size})"
     
     class Meta:
-        ordering = ['-created_at', 'name']
+        ordering = ['-created_at', '-id']
         indexes = [
             # Search & filtering indexes
             models.Index(fields=['status']),  
-            models.Index(fields=['breed']),  
             models.Index(fields=['gender', 'size']), 
             models.Index(fields=['price']), 
-            models.Index(fields=['location']),  
             models.Index(fields=['featured', 'status']), 
             models.Index(fields=['age_months']), 
             
             # Health & breeding indexes
             models.Index(fields=['rabies_vaccinated', 'dhpp_vaccinated']),
+            # Compliance ranges (pets.health), live catalog only
+            models.Index(fields=['rabies_vaccination_date'], condition=LIVE_CONDITION, name='pet_live_rabies_date_idx'),
+            models.Index(fields=['dhpp_vaccination_date'], condition=LIVE_CONDITION, name='pet_live_dhpp_date_idx'),
+            models.Index(fields=['deworming_date'], condition=LIVE_CONDITION, name='pet_live_deworming_date_idx'),
             models.Index(fields=['champions_bloodline']),
             
             # Composite indexes for common queries
-            models.Index(fields=['status', 'featured', '-created_at']),
+            # Ordering indexes: status first (catalog default filter), then the
+            # sort keys with an id tiebreaker, matching PetOrderingFilter.
+            # Partial: only live available/reserved pets, so sold and deleted
+            # history doesn't grow them.
+            models.Index(fields=['status', '-created_at', '-id'], condition=LIVE_CONDITION, name='pet_live_newest_idx'),
+            models.Index(fields=['status', '-featured', '-created_at', '-id'], condition=LIVE_CONDITION, name='pet_live_featured_idx'),
+            models.Index(fields=['status', 'price', 'id'], condition=LIVE_CONDITION, name='pet_live_price_idx'),
             models.Index(fields=['breed', 'status', 'price']),
             models.Index(fields=['gender', 'status', 'price']),
+            # Tenant-led copies for breeder-scoped queries, which only touch one
+            # breeder's entries. Partial, so pets without a breeder stay out.
+            models.Index(
+                fields=['breeder', 'status', '-created_at', '-id'],
+                condition=LIVE_CONDITION & BREEDER_CONDITION, name='pet_breeder_live_newest_idx',
+            ),
+            models.Index(fields=['breeder', 'breed', 'status', 'price'], condition=BREEDER_CONDITION, name='pet_breeder_breed_price_idx'),
+            models.Index(fields=['breeder', 'gender', 'status', 'price'], condition=BREEDER_CONDITION, name='pet_breeder_gender_price_idx'),
+            
+            # Change feed cursor
+            models.Index(fields=['updated_at', 'id']),
         ]
 
 
@@ -121,14 +211,29 @@ class PetPhoto(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'created_at']
+        constraints = [
+            # Only one main photo per pet, enforced by the DB (partial unique index)
+            models.UniqueConstraint(
+                fields=['pet'],
+                condition=models.Q(is_main=True),
+                name='unique_main_photo_per_pet',
+                violation_error_message="Only one main photo allowed per pet.",
+            ),
+        ]
     
     def clean(self):
-        # Limit to 5 photos per pet
-        if self.pet_id and self.pet.photos.count() >= 5 and not self.pk:
-            raise ValidationError("Maximum 5 photos allowed per pet.")
-        # Only one main photo per pet
-        if self.is_main and self.pet_id and self.pet.photos.filter(is_main=True).exclude(pk=self.pk).exists():
-            raise ValidationError("Only one main photo allowed per pet.")
+        # Limit photos per pet; main photo uniqueness is checked by the constraint
+        if self.pet_id and self._state.adding and self.pet.photos.count() >= MAX_PHOTOS_PER_PET:
+            raise ValidationError(f"Maximum {MAX_PHOTOS_PER_PET} photos allowed per pet.")
+
+
+def main_photo_prefetch():
+    """Prefetch used by list queries so Pet.main_photo needs no per-row query."""
+    return models.Prefetch(
+        'photos',
+        queryset=PetPhoto.objects.filter(is_main=True).only('id', 'pet_id', 'image'),
+        to_attr='prefetched_main_photos',
+    )
 
 
 class PetVideo(TimeStampedModel):
@@ -137,8 +242,8 @@ class PetVideo(TimeStampedModel):
     title = models.CharField(max_length=100, blank=True)
     
     def clean(self):
-        # Limit to 2 videos per pet
-        if self.pet_id and self.pet.videos.count() >= 2 and not self.pk:
-            raise ValidationError("Maximum 2 videos allowed per pet.")
+        # Limit videos per pet
+        if self.pet_id and self._state.adding and self.pet.videos.count() >= MAX_VIDEOS_PER_PET:
+            raise ValidationError(f"Maximum {MAX_VIDEOS_PER_PET} videos allowed per pet.")
 
 
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from core.models import TimeStampedModel
+from .choices import PetSize, PetGender
+from .traits import LifestyleChoices, CharacteristicChoices
+
+
+class SavedSearch(TimeStampedModel):
+    """
+    A buyer's saved pet filter. New listings matching it are queued in
+    SearchAlert. Empty criteria match anything; lifestyle and characteristics
+    match when they overlap the pet's, as on the pet list.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    breed = models.ForeignKey('pets.Breed', null=True, blank=True, on_delete=models.CASCADE, related_name='saved_searches')
+    gender = models.CharField(max_length=10, choices=PetGender.choices, blank=True)
+    size = models.CharField(max_length=10, choices=PetSize.choices, blank=True)
+    min_age_months = models.PositiveIntegerField(null=True, blank=True)
+    max_age_months = models.PositiveIntegerField(null=True, blank=True)
+    lifestyle = ArrayField(
+        models.CharField(max_length=30, choices=LifestyleChoices.choices),
+        default=list,
+        blank=True,
+    )
+    characteristics = ArrayField(
+        models.CharField(max_length=30, choices=CharacteristicChoices.choices),
+        default=list,
+        blank=True,
+    )
+    location = models.CharField(max_length=100, blank=True, help_text="Matches pets whose location contains this text")
+    is_active = models.BooleanField(default=True)
+    
+    def __str__(self):
+        return self.name or f"Saved search {self.pk}"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class SearchAlert(models.Model):
+    """Outbox of (saved search, new pet) matches waiting to be sent."""
+    id = models.BigAutoField(primary_key=True)
+    saved_search = models.ForeignKey('pets.SavedSearch', on_delete=models.CASCADE, related_name='alerts', db_index=False)  # unique_alert_per_search_pet leads with it
+    pet = models.ForeignKey('pets.Pet', on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.saved_search_id} -> {self.pet_id}"
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'pet'], name='unique_alert_per_search_pet'),
+        ]
+        indexes = [
+            # Outbox drain: pending alerts, oldest first
+            models.Index(fields=['id'], condition=models.Q(sent_at__isnull=True), name='searchalert_pending_idx'),
+        ]
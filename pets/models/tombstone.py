@@ -0,0 +1,23 @@
+from django.db import models
+from core.models import TimeStampedModel
+
+
+class Tombstone(TimeStampedModel):
+    """Record of a hard-deleted row, so the change feed can report deletes."""
+    
+    class Kind(models.TextChoices):
+        PET = "pet", "Pet"
+        BREED = "breed", "Breed"
+        PARENT = "parent", "Parent"
+    
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.UUIDField()
+    
+    def __str__(self):
+        return f"{self.kind} {self.object_id} (deleted)"
+    
+    class Meta:
+        indexes = [
+            # Change feed cursor
+            models.Index(fields=['updated_at', 'id']),
+        ]
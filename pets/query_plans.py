@@ -0,0 +1,245 @@
+"""
+Query plan checks for the catalog (Postgres only).
+
+Each ``QueryShape`` builds a queryset the way the API does (through the
+viewset's own filter backends, sliced to one page) and declares which
+indexes may serve it. ``explain`` captures ``EXPLAIN (FORMAT JSON)`` and
+``check_shape`` verifies that an accepted index is used, that the pets
+table is not sequentially scanned, and that the plan's total cost stays under
+the ceiling. ``index_catalog`` lists the indexes on the pets tables so
+unused and redundant ones can be reported. Driven by the
+check_query_plans command.
+"""
+import json
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from pets.models import Breed, Location, Pet, PetCard
+
+PETS_TABLE = Pet._meta.db_table
+
+# Default ceiling on a page query's total plan cost
+DEFAULT_MAX_COST = 1000
+
+
+@dataclass
+class QueryShape:
+    name: str
+    build: object
+    # Index names, or (table, leading column, ...) tuples; None = no index expected
+    accept: tuple = ()
+    max_cost: float = DEFAULT_MAX_COST
+    allow_seq_scan: bool = False
+    # A sequential scan of the pets table is also accepted while the planner
+    # estimates the table holds fewer rows than this
+    seq_scan_below_rows: int = 0
+
+
+@dataclass
+class PlanResult:
+    shape: QueryShape
+    cost: float
+    indexes: set
+    seq_scans: set
+    failures: list = field(default_factory=list)
+
+
+def api_list(query_string='', tenant=None):
+    """Build the page queryset PetViewSet.list would run for ``query_string``."""
+    from pets.views import PetViewSet
+
+    def build(context):
+        view = PetViewSet(action='list', format_kwarg=None, kwargs={})
+        view.request = Request(APIRequestFactory().get(f'/api/pets/?{query_string.format(**context)}'))
+        if tenant:
+            view.get_tenant = lambda: context[tenant]
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:settings.REST_FRAMEWORK['PAGE_SIZE']]
+    return build
+
+
+def card_list(query_string=''):
+    """Build the page queryset PetViewSet.render_card_page would run for ``query_string``."""
+    from django_filters.rest_framework import DjangoFilterBackend
+    from pets.filters import PetCardOrderingFilter
+    from pets.views import PetViewSet
+
+    def build(context):
+        view = PetViewSet(action='list', format_kwarg=None, kwargs={})
+        view.request = Request(APIRequestFactory().get(f'/api/pets/?{query_string.format(**context)}'))
+        queryset = PetCard.objects.filter(status='available')
+        queryset = DjangoFilterBackend().filter_queryset(view.request, queryset, view)
+        queryset = PetCardOrderingFilter().filter_queryset(view.request, queryset, view)
+        return queryset.values_list('main_photo_url', 'body')[:settings.REST_FRAMEWORK['PAGE_SIZE']]
+    return build
+
+
+def change_feed(context):
+    since = timezone.now() - timedelta(days=1)
+    return Pet.all_objects.filter(updated_at__gt=since).order_by('updated_at', 'id')[:100]
+
+
+QUERY_SHAPES = [
+    QueryShape('catalog newest', api_list(), ('pet_live_newest_idx',)),
+    QueryShape('catalog recommended', api_list('ordering=recommended'), ('pet_live_featured_idx', (PETS_TABLE, 'featured'))),
+    QueryShape('catalog price', api_list('ordering=price'), ('pet_live_price_idx', (PETS_TABLE, 'price'))),
+    QueryShape('catalog price desc', api_list('ordering=-price'), ('pet_live_price_idx', (PETS_TABLE, 'price'))),
+    QueryShape('catalog reserved', api_list('status=reserved'), ('pet_live_newest_idx', (PETS_TABLE, 'status'))),
+    QueryShape('breed', api_list('breed={breed}'), ('pet_live_newest_idx', (PETS_TABLE, 'breed_id'))),
+    QueryShape('gender and size', api_list('gender=male&size=small'), ('pet_live_newest_idx', (PETS_TABLE, 'gender'))),
+    QueryShape('fully vaccinated', api_list('fully_vaccinated=true'), ('pet_live_newest_idx', (PETS_TABLE, 'rabies_vaccinated'))),
+    QueryShape('age range', api_list('age_months__gte=6&age_months__lte=12'), ('pet_live_newest_idx', (PETS_TABLE, 'age_months'))),
+    QueryShape('vaccination due', api_list('vaccination_due_within=30'), ('pet_live_rabies_date_idx', 'pet_live_dhpp_date_idx', 'pet_live_newest_idx')),
+    QueryShape('deworming overdue', api_list('deworming_overdue=true'), ('pet_live_deworming_date_idx', 'pet_live_newest_idx')),
+    # Ranked by computed distance: every live pet inside the radius is read and
+    # sorted. On a small catalog one pass over the table filtered by the
+    # bounding box costs about as much as the location join, and which one the
+    # planner picks flips with sampling; only larger tables must use the join.
+    QueryShape('near town', api_list('near={town}&radius_km=25'), (
+        ('pets_location', 'latitude'), (PETS_TABLE, 'normalized_location_id'), 'pet_live_newest_idx',
+    ), max_cost=DEFAULT_MAX_COST * 5, seq_scan_below_rows=50_000),
+    QueryShape('breeder newest', api_list(tenant='breeder'), ('pet_breeder_live_newest_idx',)),
+    QueryShape('breeder breed by price', api_list('breed={breed}&ordering=price', tenant='breeder'), ('pet_breeder_breed_price_idx',)),
+    QueryShape('breeder gender by price', api_list('gender=female&ordering=price', tenant='breeder'), ('pet_breeder_gender_price_idx',)),
+    QueryShape('cards newest', card_list(), ('petcard_newest_idx',)),
+    QueryShape('cards price', card_list('ordering=price'), ('petcard_price_idx',)),
+    QueryShape('cards popular', card_list('ordering=popular'), ('petcard_popular_idx',)),
+    QueryShape('cards breed', card_list('breed={breed}'), ('petcard_breed_newest_idx', 'petcard_newest_idx')),
+    QueryShape('change feed', change_feed, ((PETS_TABLE, 'updated_at'),)),
+    # Substring search and popularity have no supporting index; cost ceiling only
+    QueryShape('search', api_list('search=retr'), None, max_cost=DEFAULT_MAX_COST * 50, allow_seq_scan=True),
+    QueryShape('popular', api_list('ordering=popular'), None, max_cost=DEFAULT_MAX_COST * 50, allow_seq_scan=True),
+]
+
+# Indexes kept for readers outside the API list (admin list filters)
+RETAINED_INDEXES = (
+    (PETS_TABLE, 'champions_bloodline'),
+)
+
+
+def shape_context():
+    """Values substituted into shape query strings, taken from the current data."""
+    pet = Pet.objects.exclude(breeder=None).order_by('created_at').first() or Pet.objects.first()
+    town = Location.objects.order_by('name').first()
+    return {
+        'breed': pet.breed_id if pet else Breed.objects.values_list('pk', flat=True).first(),
+        'breeder': pet.breeder if pet else None,
+        'town': town.name if town else 'Nairobi',
+    }
+
+
+def explain(queryset):
+    """The root plan node of ``EXPLAIN (FORMAT JSON)`` for ``queryset``."""
+    return json.loads(queryset.explain(format='json'))[0]['Plan']
+
+
+def walk(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from walk(child)
+
+
+def index_catalog():
+    """{index name: (table, [columns], predicate, unique, size bytes)} for the pets tables."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, t.relname,
+                   ARRAY(SELECT a.attname FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, n)
+                         JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                         ORDER BY k.n),
+                   pg_get_expr(i.indpred, i.indrelid), i.indisunique OR i.indisprimary,
+                   pg_relation_size(c.oid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace s ON s.oid = t.relnamespace
+            WHERE s.nspname = current_schema() AND t.relname LIKE 'pets\\_%'
+            """
+        )
+        return {name: (table, columns, predicate, unique, size) for name, table, columns, predicate, unique, size in cursor.fetchall()}
+
+
+def accepts(matcher, index_name, catalog):
+    if isinstance(matcher, str):
+        return matcher == index_name
+    table, *columns = matcher
+    entry = catalog.get(index_name)
+    return entry is not None and entry[0] == table and entry[1][:len(columns)] == columns
+
+
+def estimated_rows(table):
+    """The planner's row estimate for ``table`` (pg_class.reltuples, as of the last ANALYZE)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table])
+        return max(cursor.fetchone()[0], 0)
+
+
+def check_shape(shape, context, catalog, cost_scale=1.0):
+    plan = explain(shape.build(context))
+    indexes, seq_scans = set(), set()
+    for node in walk(plan):
+        if 'Index Name' in node:
+            indexes.add(node['Index Name'])
+        if node['Node Type'] == 'Seq Scan':
+            seq_scans.add(node['Relation Name'])
+
+    result = PlanResult(shape, plan['Total Cost'], indexes, seq_scans)
+    small_table_scan = (
+        PETS_TABLE in seq_scans and not shape.allow_seq_scan
+        and estimated_rows(PETS_TABLE) < shape.seq_scan_below_rows
+    )
+    if shape.accept is not None and not small_table_scan and not any(
+        accepts(matcher, name, catalog) for matcher in shape.accept for name in indexes
+    ):
+        result.failures.append(f"no accepted index used (used: {', '.join(sorted(indexes)) or 'none'})")
+    if PETS_TABLE in seq_scans and not (shape.allow_seq_scan or small_table_scan):
+        result.failures.append(f"sequential scan on {PETS_TABLE}")
+    if result.cost > shape.max_cost * cost_scale:
+        result.failures.append(f"cost {result.cost:.0f} over ceiling {shape.max_cost * cost_scale:.0f}")
+    return result
+
+
+def unused_indexes(catalog, used):
+    """
+    Pets table indexes no shape used or accepts, leaving out unique indexes,
+    foreign key indexes (joins and cascades) and ``RETAINED_INDEXES``.
+    """
+    foreign_keys = [[field.column] for field in Pet._meta.concrete_fields if field.is_relation]
+    return sorted(
+        name for name, (table, columns, _, unique, _) in catalog.items()
+        if table == PETS_TABLE and not unique and name not in used and columns not in foreign_keys
+        and not any(accepts(matcher, name, catalog) for shape in QUERY_SHAPES for matcher in shape.accept or ())
+        and not any(accepts(matcher, name, catalog) for matcher in RETAINED_INDEXES)
+    )
+
+
+def redundant_indexes(catalog):
+    """(index, covered by) pairs: non-unique indexes whose columns lead another index with the same predicate."""
+    pairs = []
+    for name, (table, columns, predicate, unique, _) in catalog.items():
+        if unique:
+            continue
+        for other, (other_table, other_columns, other_predicate, _, _) in catalog.items():
+            if other == name or other_table != table or other_predicate != predicate:
+                continue
+            if other_columns[:len(columns)] == columns and (len(other_columns) > len(columns) or other < name):
+                pairs.append((name, other))
+                break
+    return pairs
+
+
+def usage_stats():
+    """(index, scans, size bytes) from pg_stat_user_indexes for the pets tables, least used first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexrelname, idx_scan, pg_relation_size(indexrelid) FROM pg_stat_user_indexes "
+            "WHERE relname LIKE 'pets\\_%' ORDER BY idx_scan, pg_relation_size(indexrelid) DESC"
+        )
+        return cursor.fetchall()
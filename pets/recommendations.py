@@ -0,0 +1,165 @@
+"""
+In-memory similar-pets index.
+
+Each available pet's categorical traits (lifestyle, characteristics, size and
+gender) are encoded into an integer bitset, so similarity is a couple of bit
+operations instead of a query per candidate. The index is loaded once per
+process and kept current from model signals after commit. Each change bumps a
+shared version stamp in the cache and stores the changed entry under that
+version, so other workers replay the few entries they missed instead of
+reloading every pet. A worker falls back to a full reload when it is more than
+``MAX_REPLAY`` versions behind or a logged change has expired.
+"""
+import heapq
+import threading
+
+from django.core.cache import cache
+
+from pets.models import Pet, PetSize, PetGender, PetStatus, LifestyleChoices, CharacteristicChoices
+
+VERSION_CACHE_KEY = 'pets_trait_index_version'
+
+# Per-version change log: (pet id, entry or None for removal)
+CHANGE_LOG_TTL = 60 * 60
+MAX_REPLAY = 500
+
+# Bit position for every (group, value) pair, in choice declaration order
+TRAIT_BITS = {}
+for _group, _choices in (
+    ('lifestyle', LifestyleChoices),
+    ('characteristics', CharacteristicChoices),
+    ('size', PetSize),
+    ('gender', PetGender),
+):
+    for _value in _choices.values:
+        TRAIT_BITS[(_group, _value)] = len(TRAIT_BITS)
+
+# Score weights on top of the trait Jaccard similarity (0..1)
+BREED_WEIGHT = 0.5
+AGE_WEIGHT = 0.25
+AGE_SCALE_MONTHS = 12
+
+
+def encode_traits(lifestyle, characteristics, size, gender):
+    """Encode a pet's categorical traits as an integer bitset."""
+    bits = 0
+    for group, values in (
+        ('lifestyle', lifestyle or []),
+        ('characteristics', characteristics or []),
+        ('size', [size]),
+        ('gender', [gender]),
+    ):
+        for value in values:
+            position = TRAIT_BITS.get((group, value))
+            if position is not None:
+                bits |= 1 << position
+    return bits
+
+
+class SimilarityIndex:
+    """Per-process index of available pets keyed by id."""
+
+    fields = ('id', 'breed_id', 'age_months', 'lifestyle', 'characteristics', 'size', 'gender')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._version = None
+
+    @staticmethod
+    def make_entry(breed_id, age_months, lifestyle, characteristics, size, gender):
+        return (encode_traits(lifestyle, characteristics, size, gender), breed_id, age_months)
+
+    def _load(self):
+        entries = {}
+        rows = Pet.objects.filter(status=PetStatus.AVAILABLE).values_list(*self.fields)
+        for pk, breed_id, age_months, lifestyle, characteristics, size, gender in rows.iterator():
+            entries[pk] = self.make_entry(breed_id, age_months, lifestyle, characteristics, size, gender)
+        return entries
+
+    def _ensure_loaded(self):
+        """The current entries; the dict returned is never modified afterwards."""
+        version = cache.get(VERSION_CACHE_KEY, 0)
+        entries = self._entries
+        if entries is not None and version == self._version:
+            return entries
+        with self._lock:
+            if self._entries is None or version != self._version:
+                if not self._catch_up(version):
+                    self._entries = self._load()
+                    self._version = version
+            return self._entries
+
+    @staticmethod
+    def change_key(version):
+        return f'{VERSION_CACHE_KEY}_change_{version}'
+
+    def _catch_up(self, version):
+        """Replay logged changes up to ``version``; False if a full reload is needed."""
+        if self._entries is None or self._version is None:
+            return False
+        if not 0 <= version - self._version <= MAX_REPLAY:
+            return False
+        keys = [self.change_key(v) for v in range(self._version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        # Copy, so readers scoring the previous dict never see it change
+        entries = dict(self._entries)
+        for key in keys:
+            pk, entry = changes[key]
+            if entry is None:
+                entries.pop(pk, None)
+            else:
+                entries[pk] = entry
+        self._entries = entries
+        self._version = version
+        return True
+
+    def update(self, pet):
+        """Add, refresh or drop a saved pet; call once the save has committed."""
+        if pet.status == PetStatus.AVAILABLE and pet.deleted_at is None:
+            entry = self.make_entry(
+                pet.breed_id, pet.age_months, pet.lifestyle,
+                pet.characteristics, pet.size, pet.gender,
+            )
+        else:
+            entry = None
+        self._publish(pet.pk, entry)
+
+    def remove(self, pk):
+        """Drop a deleted pet; call once the delete has committed."""
+        self._publish(pk, None)
+
+    def _publish(self, pk, entry):
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            version = cache.incr(VERSION_CACHE_KEY)
+            cache.set(self.change_key(version), (pk, entry), timeout=CHANGE_LOG_TTL)
+            if not self._catch_up(version):
+                # Reload lazily on the next query
+                self._entries = None
+
+    def similar(self, pet, k=6):
+        """Return up to ``k`` (score, pet_id) pairs most similar to ``pet``."""
+        entries = self._ensure_loaded()
+        bits, breed_id, age_months = self.make_entry(
+            pet.breed_id, pet.age_months, pet.lifestyle,
+            pet.characteristics, pet.size, pet.gender,
+        )
+
+        def score(entry):
+            other_bits, other_breed_id, other_age = entry
+            union = (bits | other_bits).bit_count()
+            value = (bits & other_bits).bit_count() / union if union else 0.0
+            if breed_id == other_breed_id:
+                value += BREED_WEIGHT
+            if age_months is not None and other_age is not None:
+                value += AGE_WEIGHT / (1 + abs(age_months - other_age) / AGE_SCALE_MONTHS)
+            return value
+
+        top = heapq.nlargest(k, ((score(entry), pk) for pk, entry in entries.items() if pk != pet.pk))
+        return [(round(value, 4), pk) for value, pk in top]
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,165 @@
+"""
+Reverse index of saved searches, for matching new listings.
+
+Instead of running every saved filter against the database when a pet is
+listed, active searches are bucketed in memory by their (breed, gender, size)
+criteria, with ``None`` standing for "any". A new pet only looks at the eight
+buckets its own values (or "any") can fall into, and the remaining criteria
+are checked per candidate: age range, lifestyle and characteristics as trait
+bitmasks (overlap is one AND), and the location substring. Matches are
+written to the SearchAlert outbox in batches.
+
+The index loads lazily per process and is kept current from model signals
+after commit. As with the similar-pets index, each change bumps a shared
+version and is logged under it, so other workers replay the searches they
+missed instead of reloading them all.
+"""
+import itertools
+import threading
+
+from django.core.cache import cache
+
+from pets.models import SavedSearch, SearchAlert
+from pets.recommendations import encode_traits
+
+VERSION_CACHE_KEY = 'pets_saved_search_index_version'
+
+# Per-version change log: (search id, bucket key, criteria), key None for removal
+CHANGE_LOG_TTL = 60 * 60
+MAX_REPLAY = 500
+
+# Alerts per INSERT
+ALERT_BATCH_SIZE = 500
+
+
+def bucket_key(breed_id, gender, size):
+    return (breed_id, gender or None, size or None)
+
+
+def make_entry(search):
+    """Bucket key and the per-candidate criteria of a saved search."""
+    key = bucket_key(search.breed_id, search.gender, search.size)
+    criteria = (
+        search.min_age_months,
+        search.max_age_months,
+        encode_traits(search.lifestyle, [], None, None),
+        encode_traits([], search.characteristics, None, None),
+        search.location.strip().lower(),
+    )
+    return key, criteria
+
+
+def matches(criteria, age_months, lifestyle_bits, characteristic_bits, location):
+    min_age, max_age, lifestyle_mask, characteristic_mask, location_text = criteria
+    if min_age is not None and (age_months is None or age_months < min_age):
+        return False
+    if max_age is not None and (age_months is None or age_months > max_age):
+        return False
+    if lifestyle_mask and not lifestyle_mask & lifestyle_bits:
+        return False
+    if characteristic_mask and not characteristic_mask & characteristic_bits:
+        return False
+    return not location_text or location_text in location
+
+
+class SavedSearchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = None
+        self._keys = None
+        self._version = None
+
+    def _load(self):
+        buckets, keys = {}, {}
+        for search in SavedSearch.objects.filter(is_active=True).iterator():
+            key, criteria = make_entry(search)
+            buckets.setdefault(key, {})[search.pk] = criteria
+            keys[search.pk] = key
+        return buckets, keys
+
+    def _ensure_loaded(self):
+        """The current buckets; the dicts returned are never modified afterwards."""
+        version = cache.get(VERSION_CACHE_KEY, 0)
+        buckets = self._buckets
+        if buckets is not None and version == self._version:
+            return buckets
+        with self._lock:
+            if self._buckets is None or version != self._version:
+                if not self._catch_up(version):
+                    self._buckets, self._keys = self._load()
+                    self._version = version
+            return self._buckets
+
+    @staticmethod
+    def change_key(version):
+        return f'{VERSION_CACHE_KEY}_change_{version}'
+
+    def _catch_up(self, version):
+        """Replay logged changes up to ``version``; False if a full reload is needed."""
+        if self._buckets is None or self._version is None:
+            return False
+        if not 0 <= version - self._version <= MAX_REPLAY:
+            return False
+        versions = [self.change_key(v) for v in range(self._version + 1, version + 1)]
+        changes = cache.get_many(versions)
+        if len(changes) != len(versions):
+            return False
+        # Copy the outer dicts and every touched bucket, so readers matching
+        # against the previous buckets never see them change
+        buckets, keys = dict(self._buckets), dict(self._keys)
+        for version_key in versions:
+            pk, key, criteria = changes[version_key]
+            old_key = keys.pop(pk, None)
+            if old_key is not None:
+                bucket = {other: entry for other, entry in buckets[old_key].items() if other != pk}
+                if bucket:
+                    buckets[old_key] = bucket
+                else:
+                    del buckets[old_key]
+            if key is not None:
+                buckets[key] = {**buckets.get(key, {}), pk: criteria}
+                keys[pk] = key
+        self._buckets, self._keys = buckets, keys
+        self._version = version
+        return True
+
+    def _publish(self, pk, key=None, criteria=None):
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            version = cache.incr(VERSION_CACHE_KEY)
+            cache.set(self.change_key(version), (pk, key, criteria), timeout=CHANGE_LOG_TTL)
+            if not self._catch_up(version):
+                # Reload lazily on the next match
+                self._buckets = None
+
+    def update_search(self, search):
+        """Add, refresh or drop a saved search; call once the save has committed."""
+        self._publish(search.pk, *(make_entry(search) if search.is_active else ()))
+
+    def remove_search(self, pk):
+        """Drop a deleted search; call once the delete has committed."""
+        self._publish(pk)
+
+    def match(self, pet):
+        """Ids of active saved searches matching ``pet``."""
+        buckets = self._ensure_loaded()
+        lifestyle_bits = encode_traits(pet.lifestyle, [], None, None)
+        characteristic_bits = encode_traits([], pet.characteristics, None, None)
+        location = (pet.location or '').lower()
+
+        matched = []
+        keys = set(itertools.product((pet.breed_id, None), (pet.gender or None, None), (pet.size or None, None)))
+        for key in keys:
+            for pk, criteria in buckets.get(key, {}).items():
+                if matches(criteria, pet.age_months, lifestyle_bits, characteristic_bits, location):
+                    matched.append(pk)
+        return matched
+
+    def queue_alerts(self, pet):
+        """Write alerts for every saved search matching a newly listed pet; returns how many."""
+        alerts = [SearchAlert(saved_search_id=pk, pet_id=pet.pk) for pk in self.match(pet)]
+        SearchAlert.objects.bulk_create(alerts, batch_size=ALERT_BATCH_SIZE, ignore_conflicts=True)
+        return len(alerts)
+
+
+saved_search_index = SavedSearchIndex()
@@ -1,3 +1,4 @@
 from .pet_serializers import PetListSerializer, PetDetailSerializer, BreedSerializer
+from .saved_search_serializers import SavedSearchSerializer
 
-__all__ = ['PetListSerializer', 'PetDetailSerializer', 'BreedSerializer']
+__all__ = ['PetListSerializer', 'PetDetailSerializer', 'BreedSerializer', 'SavedSearchSerializer']
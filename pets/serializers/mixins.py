@@ -0,0 +1,77 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for ``?fields=`` / ``?expand=`` sparse fieldsets.
+
+    When the context carries ``fields``, only those fields are rendered.
+    Nested relations among them render as primary keys unless also listed in
+    ``expand``. ``prepare_queryset`` narrows the SQL to what is rendered.
+    """
+    # Field name -> callables returning extra prefetches needed by computed fields
+    field_prefetches = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is None:
+            return
+
+        expand = self.context.get('expand', set())
+        for name in list(self.fields):
+            field = self.fields[name]
+            if name not in fields:
+                self.fields.pop(name)
+            elif name not in expand and isinstance(field, serializers.BaseSerializer):
+                self.fields[name] = self.collapse_field(name, field)
+
+    @staticmethod
+    def collapse_field(name, field):
+        """Replace a nested serializer with its primary key(s)."""
+        kwargs = {'read_only': True}
+        if field.source != name:
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+    def prepare_queryset(self, queryset):
+        """Restrict columns, joins and prefetches to the selected fields."""
+        if self.context.get('fields') is None:
+            return queryset
+
+        opts = queryset.model._meta
+        only = {opts.pk.name}
+        select_related = []
+        prefetch_related = []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            prefetch_related += [prefetch() for prefetch in self.field_prefetches.get(name, [])]
+            if field.source == '*':
+                continue
+
+            source = field.source.split('.')[0]
+            try:
+                model_field = opts.get_field(source)
+            except FieldDoesNotExist:
+                # Properties and annotations
+                continue
+
+            if not model_field.is_relation:
+                only.add(source)
+            elif model_field.concrete:
+                only.add(source)
+                # Nested serializers backed by an in-process registry need no join
+                if isinstance(field, serializers.BaseSerializer) and not getattr(field, 'from_registry', False):
+                    select_related.append(source)
+            else:
+                prefetch_related.append(source)
+
+        queryset = queryset.select_related(None).prefetch_related(None).only(*only)
+        if select_related:
+            # select_related() with no arguments would follow every foreign key
+            queryset = queryset.select_related(*select_related)
+        return queryset.prefetch_related(*prefetch_related)
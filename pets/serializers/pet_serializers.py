@@ -1,13 +1,49 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from rest_framework import serializers
-from pets.models import Pet, PetPhoto, PetVideo, PetParent, Breed, LifestyleChoices, CharacteristicChoices
+from pets.breeds import breed_registry
+from pets.serializers.mixins import SparseFieldsetMixin
+from pets.models.pets import MAX_PHOTOS_PER_PET, MAX_VIDEOS_PER_PET, main_photo_prefetch
+from pets.models.counters import counter_prefetch
+from pets.models import Pet, PetPhoto, PetVideo, PetParent, Breed, Location, LifestyleChoices, CharacteristicChoices
 
 
-class BreedSerializer(serializers.ModelSerializer):
+class BreedSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Breed
         fields = ['id', 'name', 'description', 'size_category']
 
 
+class RegistryBreedSerializer(BreedSerializer):
+    """Nested breed read from the in-process registry, so pet queries need no join."""
+    from_registry = True
+
+    def get_attribute(self, instance):
+        # Falls back to the relation for a breed created in this transaction
+        return breed_registry.get(instance.breed_id) or instance.breed
+
+
+class BreedField(serializers.PrimaryKeyRelatedField):
+    """Breed primary key validated against the in-process registry."""
+
+    def __init__(self, **kwargs):
+        # The queryset only feeds choices in the browsable API
+        kwargs.setdefault('queryset', Breed.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        breed = breed_registry.get(data)
+        if breed is None:
+            self.fail('does_not_exist', pk_value=data)
+        return breed
+
+
+class LocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Location
+        fields = ['id', 'name', 'county', 'latitude', 'longitude']
+
+
 class PetParentSerializer(serializers.ModelSerializer):
     avatar = serializers.ImageField(read_only=True)
 
@@ -16,18 +52,31 @@ class PetParentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'gender', 'date_of_birth', 'registration_number', 'avatar']
 
 
-class PetListSerializer(serializers.ModelSerializer):
-    breed = BreedSerializer(read_only=True)
+class PetListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    field_prefetches = {
+        'main_photo': [main_photo_prefetch],
+        'interest_count': [counter_prefetch],
+        'view_count': [counter_prefetch],
+    }
+    
+    breed = RegistryBreedSerializer(read_only=True)
     main_photo = serializers.SerializerMethodField()
+    distance = serializers.SerializerMethodField()
     
     class Meta:
         model = Pet
         fields = [
             'id', 'name', 'breed', 'gender', 'age_months','featured',
-            'main_photo', 'lifestyle', 'characteristics', 'champions_bloodline'
+            'main_photo', 'lifestyle', 'characteristics', 'champions_bloodline',
+            'interest_count', 'view_count', 'distance'
         ]
         read_only_fields = ['id']
     
+    def get_distance(self, obj):
+        """Distance in km from the ?near= origin, if given."""
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 1) if distance is not None else None
+    
     def get_main_photo(self, obj):
         """Get the main photo URL for the pet."""
         main_photo = obj.main_photo
@@ -53,26 +102,32 @@ class PetVideoSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class PetDetailSerializer(serializers.ModelSerializer):
+class PetDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Pet detail view.
     Includes all fields and related objects for complete pet information.
     """
+    field_prefetches = {
+        'main_photo': [main_photo_prefetch],
+        'interest_count': [counter_prefetch],
+        'view_count': [counter_prefetch],
+    }
+    
     # Related objects
-    breed = BreedSerializer(read_only=True)
-    breed_id = serializers.PrimaryKeyRelatedField(
-        queryset=Breed.objects.all(), 
+    breed = RegistryBreedSerializer(read_only=True)
+    breed_id = BreedField(
         source='breed', 
         write_only=True,
         help_text="Select breed from available options"
     )
     father = PetParentSerializer(read_only=True)
     mother = PetParentSerializer(read_only=True)
+    normalized_location = LocationSerializer(read_only=True)
     
     # Computed fields
     main_photo = serializers.SerializerMethodField()
-    photos = PetPhotoSerializer(many=True, read_only=True)
-    videos = PetVideoSerializer(many=True, read_only=True)
+    photos = PetPhotoSerializer(many=True, required=False)
+    videos = PetVideoSerializer(many=True, required=False)
     
     class Meta:
         model = Pet
@@ -82,7 +137,7 @@ class PetDetailSerializer(serializers.ModelSerializer):
             'gender', 'age_months', 'champions_bloodline',
             
             # Status and Pricing
-            'price', 'featured', 'status',
+            'price', 'featured', 'status', 'breeder',
             
             # Health & Documentation
             'rabies_vaccinated', 'rabies_vaccination_date',
@@ -92,7 +147,7 @@ class PetDetailSerializer(serializers.ModelSerializer):
             'microchipped', 'microchip_number', 'health_notes',
             
             # Location
-            'location',
+            'location', 'normalized_location',
             
             # Lifestyle & Characteristics
             'lifestyle', 'characteristics',
@@ -101,12 +156,12 @@ class PetDetailSerializer(serializers.ModelSerializer):
             'father', 'mother',
             
             # Computed fields
-            'main_photo', 'photos', 'videos',
+            'main_photo', 'photos', 'videos', 'interest_count', 'view_count',
             
             # Timestamps
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'breeder', 'created_at', 'updated_at']
     
     def get_main_photo(self, obj):
         """Get the main photo URL for the pet."""
@@ -134,6 +189,42 @@ class PetDetailSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(f"'{characteristic}' is not a valid characteristic choice.")
         return value
     
+    def validate_photos(self, value):
+        """Validate the submitted photos in memory."""
+        if len(value) > MAX_PHOTOS_PER_PET:
+            raise serializers.ValidationError(f"Maximum {MAX_PHOTOS_PER_PET} photos allowed per pet.")
+        if sum(1 for photo in value if photo.get('is_main')) > 1:
+            raise serializers.ValidationError("Only one main photo allowed per pet.")
+        return value
+    
+    def validate_videos(self, value):
+        """Validate the submitted videos in memory."""
+        if len(value) > MAX_VIDEOS_PER_PET:
+            raise serializers.ValidationError(f"Maximum {MAX_VIDEOS_PER_PET} videos allowed per pet.")
+        return value
+    
+    def validate_media_limits(self, attrs):
+        """
+        Check new photos/videos against the pet's existing media.
+        Uses one aggregate query instead of per-photo count/exists checks.
+        """
+        photos = attrs.get('photos') or []
+        videos = attrs.get('videos') or []
+        if self.instance is None or not (photos or videos):
+            return
+        
+        existing = Pet.objects.filter(pk=self.instance.pk).aggregate(
+            photo_count=Count('photos', distinct=True),
+            main_count=Count('photos', filter=Q(photos__is_main=True), distinct=True),
+            video_count=Count('videos', distinct=True),
+        )
+        if existing['photo_count'] + len(photos) > MAX_PHOTOS_PER_PET:
+            raise serializers.ValidationError({'photos': f"Maximum {MAX_PHOTOS_PER_PET} photos allowed per pet."})
+        if existing['main_count'] and any(photo.get('is_main') for photo in photos):
+            raise serializers.ValidationError({'photos': "Only one main photo allowed per pet."})
+        if existing['video_count'] + len(videos) > MAX_VIDEOS_PER_PET:
+            raise serializers.ValidationError({'videos': f"Maximum {MAX_VIDEOS_PER_PET} videos allowed per pet."})
+    
     def validate(self, attrs):
         """Cross-field validation."""
         # Validate vaccination dates
@@ -159,4 +250,35 @@ class PetDetailSerializer(serializers.ModelSerializer):
                 'registration_number': 'Registration number is required when pet is KCI registered.'
             })
         
+        self.validate_media_limits(attrs)
         return attrs
+    
+    def save_media(self, pet, photos, videos):
+        """Insert nested photos and videos with one bulk insert each."""
+        try:
+            with transaction.atomic():
+                PetPhoto.objects.bulk_create([PetPhoto(pet=pet, **photo) for photo in photos])
+                PetVideo.objects.bulk_create([PetVideo(pet=pet, **video) for video in videos])
+        except IntegrityError:
+            # Lost a race with another main-photo write (unique_main_photo_per_pet)
+            raise serializers.ValidationError({'photos': "Only one main photo allowed per pet."})
+        if photos:
+            # bulk_create sends no signals; the card rendered in post_save has no main photo yet
+            from pets import cards
+            cards.refresh([pet.pk])
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        photos = validated_data.pop('photos', [])
+        videos = validated_data.pop('videos', [])
+        pet = super().create(validated_data)
+        self.save_media(pet, photos, videos)
+        return pet
+    
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        photos = validated_data.pop('photos', [])
+        videos = validated_data.pop('videos', [])
+        pet = super().update(instance, validated_data)
+        self.save_media(pet, photos, videos)
+        return pet
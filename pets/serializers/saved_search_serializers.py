@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from pets.models import SavedSearch
+from pets.serializers.pet_serializers import BreedField
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    breed = BreedField(required=False, allow_null=True)
+    
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'name', 'breed', 'gender', 'size', 'min_age_months', 'max_age_months',
+            'lifestyle', 'characteristics', 'location', 'is_active',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        min_age = attrs.get('min_age_months', getattr(self.instance, 'min_age_months', None))
+        max_age = attrs.get('max_age_months', getattr(self.instance, 'max_age_months', None))
+        if min_age is not None and max_age is not None and min_age > max_age:
+            raise serializers.ValidationError({'max_age_months': 'Must not be less than min_age_months.'})
+        return attrs
@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core import cdn
+from core.cache import bump_generation
+from pets.models import Pet, PetCard, PetPhoto, PetVideo, Breed, PetParent, Tombstone, SavedSearch, PetStatus
+from pets import cards
+from pets.breeds import breed_registry
+from pets.recommendations import similarity_index
+from pets.saved_searches import saved_search_index
+from pets.suggestions import suggestion_index
+
+
+# In-memory indexes change only after commit, so no worker reloads
+# uncommitted rows under a new version and rollbacks leave no trace.
+@receiver(post_save, sender=Pet)
+def refresh_similarity_index(sender, instance, **kwargs):
+    """Keep the in-memory similar-pets index in step with saved pets."""
+    transaction.on_commit(lambda: similarity_index.update(instance))
+
+
+@receiver(post_delete, sender=Pet)
+def drop_from_similarity_index(sender, instance, **kwargs):
+    """Remove deleted pets from the similar-pets index."""
+    pk = instance.pk
+    transaction.on_commit(lambda: similarity_index.remove(pk))
+
+
+@receiver(post_save, sender=Pet)
+def refresh_suggestion_index(sender, instance, **kwargs):
+    """Keep search suggestions in step with saved pets."""
+    transaction.on_commit(lambda: suggestion_index.update_pet(instance))
+
+
+@receiver(post_delete, sender=Pet)
+def drop_from_suggestion_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: suggestion_index.remove_pet(pk))
+
+
+@receiver(post_save, sender=Breed)
+def refresh_breed_suggestions(sender, instance, created, **kwargs):
+    if created:
+        name = instance.name
+        transaction.on_commit(lambda: suggestion_index.add_breed(name))
+    else:
+        # Renames also change pets' breed terms; reload everywhere
+        transaction.on_commit(suggestion_index.invalidate)
+
+
+@receiver(post_delete, sender=Breed)
+def drop_breed_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(suggestion_index.invalidate)
+
+
+# Index changes wait for the commit: bumping the generation earlier lets
+# another worker reload without the row and keep that copy as current.
+@receiver(post_save, sender=SavedSearch)
+def refresh_saved_search_index(sender, instance, **kwargs):
+    transaction.on_commit(lambda: saved_search_index.update_search(instance))
+
+
+@receiver(post_delete, sender=SavedSearch)
+def drop_from_saved_search_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: saved_search_index.remove_search(pk))
+
+
+@receiver(post_save, sender=Pet)
+def queue_search_alerts(sender, instance, created, **kwargs):
+    """Match newly listed pets against saved searches, once the pet is committed."""
+    if created and instance.status == PetStatus.AVAILABLE:
+        transaction.on_commit(lambda: saved_search_index.queue_alerts(instance))
+
+
+@receiver([post_save, post_delete], sender=Pet)
+@receiver([post_save, post_delete], sender=PetPhoto)
+@receiver([post_save, post_delete], sender=Breed)
+def invalidate_pet_list_cache(sender, instance, **kwargs):
+    """Pet list pages embed breed and main photo data; start a new cache generation."""
+    # Breeder caches are partitioned; only the affected breeders' lists go stale
+    if sender is Pet:
+        # A pet moved to another breeder leaves the old breeder's lists too
+        breeder_ids = {instance.breeder_id, getattr(instance, '_loaded_breeder_id', None)}
+    elif sender is PetPhoto:
+        breeder_ids = set(Pet.all_objects.filter(pk=instance.pet_id).values_list('breeder_id', flat=True))
+    else:
+        breeder_ids = set(
+            Pet.all_objects.filter(breed_id=instance.pk).exclude(breeder=None)
+            .values_list('breeder_id', flat=True).distinct()
+        )
+    names = ['pets_list'] + [f'pets_list_b{breeder_id}' for breeder_id in sorted(breeder_ids - {None})]
+    
+    # After commit, so no reader caches pre-commit rows under the new generation
+    transaction.on_commit(lambda: [bump_generation(name) for name in names])
+
+
+@receiver([post_save, post_delete], sender=Breed)
+def invalidate_breed_list_cache(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation('breeds_list'))
+
+
+@receiver([post_save, post_delete], sender=Breed)
+def invalidate_breed_registry(sender, **kwargs):
+    breed_registry.invalidate()
+
+
+@receiver(post_save, sender=Pet)
+def refresh_pet_card(sender, instance, **kwargs):
+    """Keep the list projection in the same transaction as the pet."""
+    cards.refresh([instance.pk])
+
+
+@receiver(post_delete, sender=Pet)
+def drop_pet_card(sender, instance, **kwargs):
+    PetCard.objects.filter(pk=instance.pk).delete()
+
+
+@receiver([post_save, post_delete], sender=PetPhoto)
+def refresh_pet_card_photo(sender, instance, **kwargs):
+    cards.refresh([instance.pet_id])
+
+
+@receiver(post_save, sender=Breed)
+def refresh_breed_cards(sender, instance, **kwargs):
+    cards.refresh_breed(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Pet)
+def purge_pet_edge_cache(sender, instance, **kwargs):
+    cdn.purge_dispatcher.purge(cdn.pet_tag(instance.pk), cdn.PET_LIST_TAG)
+
+
+@receiver([post_save, post_delete], sender=PetPhoto)
+@receiver([post_save, post_delete], sender=PetVideo)
+def purge_pet_media_edge_cache(sender, instance, **kwargs):
+    # List cards show the main photo
+    cdn.purge_dispatcher.purge(cdn.pet_tag(instance.pet_id), cdn.PET_LIST_TAG)
+
+
+@receiver([post_save, post_delete], sender=Breed)
+def purge_breed_edge_cache(sender, instance, **kwargs):
+    # Pet details carry the tags of their breed; lists embed breed names
+    cdn.purge_dispatcher.purge(cdn.breed_tag(instance.pk), cdn.BREED_LIST_TAG, cdn.PET_LIST_TAG)
+
+
+@receiver(post_save, sender=PetParent)
+def purge_parent_edge_cache(sender, instance, created, **kwargs):
+    """Pet details embed their parents; purge the litters of an edited parent."""
+    if created:
+        return
+    pet_ids = Pet.all_objects.filter(Q(father=instance) | Q(mother=instance)).values_list('pk', flat=True)
+    tags = [cdn.pet_tag(pk) for pk in pet_ids]
+    if tags:
+        cdn.purge_dispatcher.purge(*tags)
+
+
+@receiver(post_delete, sender=Pet)
+@receiver(post_delete, sender=Breed)
+@receiver(post_delete, sender=PetParent)
+def record_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone for the change feed when a row is hard-deleted."""
+    kind = {Pet: Tombstone.Kind.PET, Breed: Tombstone.Kind.BREED, PetParent: Tombstone.Kind.PARENT}[sender]
+    Tombstone.objects.create(kind=kind, object_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=PetPhoto)
+@receiver([post_save, post_delete], sender=PetVideo)
+def touch_pet(sender, instance, **kwargs):
+    """Media changes move the owning pet forward in the change feed."""
+    Pet.all_objects.filter(pk=instance.pet_id).update(updated_at=timezone.now())
+
+
+# Receivers that react to one deleted row at a time. Bulk jobs (archive_pets)
+# disconnect them, which also lets the ORM delete without loading each row,
+# and do the same work once per batch.
+PER_ROW_DELETE_RECEIVERS = (
+    (Pet, drop_from_similarity_index),
+    (Pet, drop_from_suggestion_index),
+    (Pet, invalidate_pet_list_cache),
+    (Pet, drop_pet_card),
+    (Pet, purge_pet_edge_cache),
+    (Pet, record_tombstone),
+    (PetPhoto, invalidate_pet_list_cache),
+    (PetPhoto, refresh_pet_card_photo),
+    (PetPhoto, purge_pet_media_edge_cache),
+    (PetPhoto, touch_pet),
+    (PetVideo, purge_pet_media_edge_cache),
+    (PetVideo, touch_pet),
+)
+
+
+@contextmanager
+def per_row_delete_receivers_disconnected():
+    """Disconnect PER_ROW_DELETE_RECEIVERS in this process for the duration of the block."""
+    for sender, handler in PER_ROW_DELETE_RECEIVERS:
+        post_delete.disconnect(handler, sender=sender)
+    try:
+        yield
+    finally:
+        for sender, handler in PER_ROW_DELETE_RECEIVERS:
+            post_delete.connect(handler, sender=sender)
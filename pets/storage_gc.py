@@ -0,0 +1,107 @@
+"""
+Media storage garbage collection.
+
+Streams file listings from the media storage (``os.scandir`` for local
+storage, paginated ``list_objects_v2`` for S3-compatible backends such as R2),
+diffs them in batches against the file names referenced by the database, and
+reports or deletes the orphans.
+"""
+import os
+from datetime import datetime, timezone as dt_timezone
+from itertools import islice
+
+from django.core.files.storage import FileSystemStorage
+
+from pets.models import ArchivedPet, Pet, PetParent, PetPhoto, PetVideo
+
+# Upload prefixes owned by the pets app
+MEDIA_PREFIXES = ('pets/gallery/', 'pets/videos/', 'pets/health_docs/', 'pet_parents/avatars/')
+
+# (queryset, file field) pairs that reference media. Soft-deleted pets still
+# own their files; archived pets keep theirs through ArchivedPet.files.
+REFERENCES = (
+    (lambda: PetPhoto.objects.all(), 'image'),
+    (lambda: PetVideo.objects.all(), 'video'),
+    (lambda: Pet.all_objects.all(), 'health_certificate'),
+    (lambda: PetParent.objects.all(), 'avatar'),
+)
+
+
+class StoredFile:
+    __slots__ = ('name', 'size', 'modified')
+
+    def __init__(self, name, size, modified):
+        self.name = name
+        self.size = size
+        self.modified = modified
+
+
+def _scan_local(root, prefix):
+    stack = [os.path.join(root, prefix)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat()
+                    yield StoredFile(
+                        os.path.relpath(entry.path, root).replace(os.sep, '/'),
+                        stat.st_size,
+                        datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+                    )
+
+
+def _scan_s3(storage, prefix):
+    location = (getattr(storage, 'location', '') or '').strip('/')
+    key_prefix = f'{location}/{prefix}' if location else prefix
+    client = storage.connection.meta.client
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=storage.bucket_name, Prefix=key_prefix):
+        for obj in page.get('Contents', []):
+            name = obj['Key'][len(location) + 1:] if location else obj['Key']
+            yield StoredFile(name, obj['Size'], obj['LastModified'])
+
+
+def iter_stored_files(storage, prefixes=MEDIA_PREFIXES):
+    """Stream every stored file under the given prefixes."""
+    for prefix in prefixes:
+        if isinstance(storage, FileSystemStorage):
+            yield from _scan_local(storage.location, prefix)
+        elif hasattr(storage, 'bucket_name'):
+            yield from _scan_s3(storage, prefix)
+        else:
+            raise ValueError(f"Listing is not supported for {type(storage).__name__}")
+
+
+def referenced_names(names):
+    """Return the subset of ``names`` referenced by any model file field."""
+    found = set()
+    for queryset, field in REFERENCES:
+        found.update(queryset().filter(**{f'{field}__in': names}).values_list(field, flat=True))
+    for files in ArchivedPet.objects.filter(files__overlap=names).values_list('files', flat=True):
+        found.update(files)
+    return found.intersection(names)
+
+
+def iter_orphans(storage, batch_size=1000, older_than=None):
+    """
+    Yield stored files no row references, checking names one batch at a time.
+    Files modified after ``older_than`` are skipped (uploads still in flight).
+    """
+    files = iter_stored_files(storage)
+    while True:
+        batch = list(islice(files, batch_size))
+        if not batch:
+            return
+        if older_than is not None:
+            batch = [stored for stored in batch if stored.modified < older_than]
+        referenced = referenced_names([stored.name for stored in batch])
+        for stored in batch:
+            if stored.name not in referenced:
+                yield stored
@@ -0,0 +1,220 @@
+"""
+In-memory autocomplete index for the catalog search box.
+
+Breed names, pet names, colors and locations of available pets are kept in a
+sorted array of lowercase keys (one key per word start, so "retr" finds
+"Golden Retriever"). A lookup is a bisect plus a short scan, with no
+database access. The index is built at process warm-up (or on first use) and
+kept current from model signals after commit. Like the similar-pets index,
+each change bumps a shared version and is logged under it, so other workers
+replay the few changes they missed into a new snapshot instead of reloading.
+"""
+import bisect
+import threading
+from collections import Counter
+from operator import itemgetter
+
+from django.core.cache import cache
+
+from pets.breeds import breed_registry
+from pets.models import Breed, Pet, PetStatus
+
+VERSION_CACHE_KEY = 'pets_suggest_index_version'
+
+# Per-version change log: ('pet', id, terms) or ('breed', name, None)
+CHANGE_LOG_TTL = 60 * 60
+MAX_REPLAY = 500
+
+# Prefix matches examined per lookup before ranking
+SCAN_LIMIT = 200
+
+
+def _normalize(value):
+    return ' '.join(value.lower().split())
+
+
+def pet_terms(name, breed_name, color, location):
+    """Suggestion terms (kind, display) contributed by one pet."""
+    terms = {('breed', breed_name), ('pet', name), ('color', color), ('location', location)}
+    return frozenset((kind, display.strip()) for kind, display in terms if display and display.strip())
+
+
+def term_keys(term):
+    """Index keys for a term: its normalized display from each word start."""
+    words = _normalize(term[1]).split(' ')
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class SuggestionState:
+    """One immutable snapshot of the index; changes build a new snapshot."""
+    __slots__ = ('keys', 'entries', 'counts', 'pet_terms')
+
+    def __init__(self, keys, entries, counts, pet_terms):
+        self.keys = keys
+        self.entries = entries
+        self.counts = counts
+        self.pet_terms = pet_terms
+
+    def copy(self):
+        return SuggestionState(list(self.keys), list(self.entries), Counter(self.counts), dict(self.pet_terms))
+
+    def add_term(self, term, weight=1):
+        if term not in self.counts:
+            for key in term_keys(term):
+                position = bisect.bisect_right(self.keys, key)
+                self.keys.insert(position, key)
+                self.entries.insert(position, term)
+        self.counts[term] += weight
+
+    def remove_term(self, term):
+        self.counts[term] -= 1
+        if self.counts[term] > 0 or term[0] == 'breed':
+            return
+        del self.counts[term]
+        for key in term_keys(term):
+            position = bisect.bisect_left(self.keys, key)
+            while position < len(self.keys) and self.keys[position] == key:
+                if self.entries[position] == term:
+                    del self.keys[position]
+                    del self.entries[position]
+                    break
+                position += 1
+
+    def set_pet(self, pk, terms):
+        old = self.pet_terms.pop(pk, frozenset())
+        for term in old - terms:
+            self.remove_term(term)
+        for term in terms - old:
+            self.add_term(term)
+        if terms:
+            self.pet_terms[pk] = terms
+
+    def apply(self, change):
+        kind, value, terms = change
+        if kind == 'pet':
+            self.set_pet(value, terms)
+        else:
+            self.add_term(('breed', value), weight=0)
+
+
+class SuggestionIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        self._version = None
+
+    def _load(self):
+        # Collect every (key, term) pair and sort once; inserting one by one is quadratic
+        pairs = []
+        counts = Counter()
+        pet_terms_by_pk = {}
+
+        def add(term, weight=1):
+            if term not in counts:
+                pairs.extend((key, term) for key in term_keys(term))
+            counts[term] += weight
+
+        for (name,) in Breed.objects.values_list('name'):
+            add(('breed', name), weight=0)
+        rows = Pet.objects.filter(status=PetStatus.AVAILABLE).values_list('id', 'name', 'breed__name', 'color', 'location')
+        for pk, name, breed_name, color, location in rows.iterator():
+            terms = pet_terms(name, breed_name, color, location)
+            pet_terms_by_pk[pk] = terms
+            for term in terms:
+                add(term)
+
+        pairs.sort(key=itemgetter(0))
+        return SuggestionState([key for key, _ in pairs], [term for _, term in pairs], counts, pet_terms_by_pk)
+
+    def _ensure_loaded(self):
+        """The current snapshot; the state returned is never modified afterwards."""
+        version = cache.get(VERSION_CACHE_KEY, 0)
+        state = self._state
+        if state is not None and version == self._version:
+            return state
+        with self._lock:
+            if self._state is None or version != self._version:
+                if not self._catch_up(version):
+                    self._state = self._load()
+                    self._version = version
+            return self._state
+
+    def load(self):
+        """Build the index now (process warm-up) instead of on the first lookup."""
+        self._ensure_loaded()
+
+    @staticmethod
+    def change_key(version):
+        return f'{VERSION_CACHE_KEY}_change_{version}'
+
+    def _catch_up(self, version):
+        """Replay logged changes up to ``version``; False if a full reload is needed."""
+        if self._state is None or self._version is None:
+            return False
+        if not 0 <= version - self._version <= MAX_REPLAY:
+            return False
+        keys = [self.change_key(v) for v in range(self._version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        # Build a new snapshot, so readers scanning the previous one never see it change
+        state = self._state.copy()
+        for key in keys:
+            state.apply(changes[key])
+        self._state = state
+        self._version = version
+        return True
+
+    def _publish(self, change):
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            version = cache.incr(VERSION_CACHE_KEY)
+            cache.set(self.change_key(version), change, timeout=CHANGE_LOG_TTL)
+            if not self._catch_up(version):
+                # Reload lazily on the next lookup
+                self._state = None
+
+    def update_pet(self, pet):
+        live = pet.status == PetStatus.AVAILABLE and pet.deleted_at is None
+        if live:
+            breed = breed_registry.get(pet.breed_id) or pet.breed
+            terms = pet_terms(pet.name, breed.name, pet.color, pet.location)
+        else:
+            terms = frozenset()
+        self._publish(('pet', pet.pk, terms))
+
+    def remove_pet(self, pk):
+        self._publish(('pet', pk, frozenset()))
+
+    def add_breed(self, name):
+        self._publish(('breed', name, None))
+
+    def invalidate(self):
+        """Force every worker to reload (e.g. a breed was renamed or deleted)."""
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            # A version with no logged change can't be replayed
+            self._version = cache.incr(VERSION_CACHE_KEY)
+            self._state = None
+
+    def suggest(self, query, limit=8):
+        """Top ``limit`` completions for ``query`` as dicts (value, type, count)."""
+        prefix = _normalize(query)
+        if not prefix:
+            return []
+        state = self._ensure_loaded()
+        keys, entries, counts = state.keys, state.entries, state.counts
+
+        matches = {}
+        position = bisect.bisect_left(keys, prefix)
+        end = min(position + SCAN_LIMIT, len(keys))
+        while position < end and keys[position].startswith(prefix):
+            term = entries[position]
+            matches[term] = counts.get(term, 0)
+            position += 1
+
+        ranked = sorted(matches.items(), key=lambda item: (-item[1], len(item[0][1]), item[0][1]))
+        return [{'value': display, 'type': kind, 'count': count} for (kind, display), count in ranked[:limit]]
+
+
+suggestion_index = SuggestionIndex()
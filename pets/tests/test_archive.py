@@ -0,0 +1,56 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from pets.models import ArchivedPet, Pet, PetCard, PetPhoto, PetStatus, Tombstone
+from pets.storage_gc import referenced_names
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class ArchivePetsTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        long_ago = timezone.now() - timedelta(days=365)
+        self.sold = [make_pet(self.breed, name=f'Sold {n}', status=PetStatus.SOLD) for n in range(5)]
+        PetPhoto.objects.create(pet=self.sold[0], image='pets/gallery/sold.jpg', is_main=True)
+        Pet.all_objects.filter(pk__in=[pet.pk for pet in self.sold]).update(updated_at=long_ago)
+        self.deleted = make_pet(self.breed, name='Deleted')
+        Pet.all_objects.filter(pk=self.deleted.pk).update(deleted_at=long_ago)
+        self.recently_sold = make_pet(self.breed, name='Recently sold', status=PetStatus.SOLD)
+        self.available = make_pet(self.breed, name='Available')
+        self.archived_ids = {pet.pk for pet in self.sold} | {self.deleted.pk}
+
+    def archive(self, **options):
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch('core.cdn.purge_dispatcher.purge') as purge, \
+                CaptureQueriesContext(connection) as queries:
+            call_command('archive_pets', stdout=StringIO(), **options)
+        return purge, [query['sql'] for query in queries]
+
+    def test_moves_old_sold_and_deleted_pets(self):
+        self.archive()
+        self.assertEqual(set(ArchivedPet.objects.values_list('pk', flat=True)), self.archived_ids)
+        self.assertEqual(set(Pet.all_objects.values_list('name', flat=True)), {'Recently sold', 'Available'})
+        self.assertFalse(PetCard.objects.filter(pk__in=self.archived_ids).exists())
+        self.assertEqual(set(Tombstone.objects.values_list('object_id', flat=True)), self.archived_ids)
+        self.assertEqual(ArchivedPet.objects.get(pk=self.sold[0].pk).data['photos'], ['pets/gallery/sold.jpg'])
+
+    def test_batches_skip_per_row_work(self):
+        purge, queries = self.archive(batch_size=2)
+        # Three batches of two pets: one tombstone insert and one purge each
+        tombstone_inserts = [sql for sql in queries if sql.startswith('INSERT INTO "pets_tombstone"')]
+        self.assertEqual(len(tombstone_inserts), 3)
+        self.assertEqual(purge.call_count, 3)
+        self.assertFalse([sql for sql in queries if sql.startswith('UPDATE "pets_pet"')])
+
+    def test_archived_media_is_still_referenced(self):
+        self.archive()
+        self.assertEqual(
+            referenced_names(['pets/gallery/sold.jpg', 'pets/gallery/orphan.jpg']), {'pets/gallery/sold.jpg'},
+        )
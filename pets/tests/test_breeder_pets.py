@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+
+from pets.models import Pet
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+from users.models import Breeder
+
+
+def make_breeder(username):
+    user = get_user_model().objects.create_user(username=username)
+    return Breeder.objects.create(user=user, name=username.title(), slug=username)
+
+
+class BreederPetTests(CatalogTestCase):
+    url = '/api/breeder/pets/'
+
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        self.alice = make_breeder('alice')
+        self.bob = make_breeder('bob')
+        self.alices_pet = make_pet(self.breed, name='Alice dog', breeder=self.alice)
+        self.bobs_pet = make_pet(self.breed, name='Bob dog', breeder=self.bob)
+        make_pet(self.breed, name='Unowned dog')
+        self.client.force_login(self.alice.user)
+
+    def test_lists_only_own_pets(self):
+        response = self.client.get(self.url)
+        self.assertEqual([pet['name'] for pet in response.json()['results']], ['Alice dog'])
+        self.assertEqual(self.client.get(f'{self.url}{self.bobs_pet.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}{self.alices_pet.pk}/').status_code, 200)
+
+    def test_edits_only_own_pets(self):
+        response = self.client.patch(f'{self.url}{self.bobs_pet.pk}/', {'name': 'Taken'}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.delete(f'{self.url}{self.bobs_pet.pk}/').status_code, 404)
+        self.bobs_pet.refresh_from_db()
+        self.assertEqual(self.bobs_pet.name, 'Bob dog')
+
+        response = self.client.patch(f'{self.url}{self.alices_pet.pk}/', {'name': 'Renamed'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.alices_pet.refresh_from_db()
+        self.assertEqual(self.alices_pet.name, 'Renamed')
+
+    def test_created_pets_belong_to_the_breeder(self):
+        response = self.client.post(
+            self.url, {'name': 'Puppy', 'breed_id': str(self.breed.pk), 'weight': '3.00'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Pet.objects.get(name='Puppy').breeder, self.alice)
+
+    def test_requires_a_breeder_account(self):
+        self.client.logout()
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+        self.client.force_login(get_user_model().objects.create_user(username='carol'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
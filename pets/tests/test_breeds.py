@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pets.breeds import BreedRegistry, breed_registry
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class BreedRegistryTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        self.pet = make_pet(self.breed)
+
+    def breed_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries if '"pets_breed"' in query['sql']]
+
+    def test_pet_reads_take_breeds_from_memory(self):
+        breed_registry.all()
+        self.assertEqual(self.breed_queries('/api/pets/'), [])
+        self.assertEqual(self.breed_queries(f'/api/pets/{self.pet.pk}/'), [])
+        self.assertEqual(self.breed_queries(f'/api/breeds/{self.breed.pk}/'), [])
+
+    def test_lookups(self):
+        self.assertEqual(breed_registry.get(str(self.breed.pk)), self.breed)
+        self.assertIsNone(breed_registry.get('not-a-uuid'))
+        self.assertIsNone(breed_registry.get(None))
+        self.assertEqual(self.client.get('/api/breeds/not-a-uuid/').status_code, 404)
+
+    @mock.patch('pets.breeds.CHECK_INTERVAL', 0)
+    def test_breed_writes_reload_every_worker_after_commit(self):
+        other_worker = BreedRegistry()
+        self.assertEqual(other_worker.get(self.breed.pk).name, 'Rottweiler')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.breed.name = 'Rottie'
+            self.breed.save()
+            # Not before the commit
+            self.assertEqual(other_worker.get(self.breed.pk).name, 'Rottweiler')
+        self.assertEqual(other_worker.get(self.breed.pk).name, 'Rottie')
+        self.assertEqual(breed_registry.get(self.breed.pk).name, 'Rottie')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            akita = make_breed('Akita')
+        self.assertEqual([breed.name for breed in other_worker.all()], ['Akita', 'Rottie'])
+        self.assertEqual(self.client.get(f'/api/breeds/{akita.pk}/').json()['name'], 'Akita')
@@ -0,0 +1,108 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from pets import cards, counters
+from pets.filters import PetCardOrderingFilter, PetOrderingFilter
+from pets.models import LifestyleChoices, PetCard, PetPhoto, PetStatus
+from pets.serializers import PetDetailSerializer
+from pets.tests.utils import GIF, CatalogTestCase, make_breed, make_pet
+
+
+class SupportsTests(SimpleTestCase):
+    def supports(self, **params):
+        return cards.supports(Request(APIRequestFactory().get('/api/pets/', params)))
+
+    def test_plain_catalog_pages(self):
+        self.assertTrue(self.supports())
+        self.assertTrue(self.supports(page=2, ordering='-price,popular', breed='x', lifestyle='needs_yard'))
+        self.assertTrue(self.supports(status=PetStatus.RESERVED))
+
+    def test_everything_else_takes_the_orm_path(self):
+        self.assertFalse(self.supports(search='rott'))
+        self.assertFalse(self.supports(near='Nairobi'))
+        self.assertFalse(self.supports(fully_vaccinated='true'))
+        self.assertFalse(self.supports(fields='id,name'))
+        self.assertFalse(self.supports(status=PetStatus.SOLD))
+        self.assertFalse(self.supports(ordering='name'))
+
+
+class CardOrderingTests(SimpleTestCase):
+    def test_popular_reads_the_card_counters(self):
+        self.assertEqual(PetCardOrderingFilter().expand_ordering(['popular']), ['-interest_count', '-view_count', '-id'])
+        self.assertEqual(PetCardOrderingFilter().expand_ordering(['-popular']), ['interest_count', 'view_count', 'id'])
+        self.assertEqual(
+            PetOrderingFilter().expand_ordering(['popular']), ['-counter__interest_count', '-counter__view_count', '-id'],
+        )
+        self.assertEqual(PetCardOrderingFilter().expand_ordering(['-price']), ['-price', '-id'])
+
+
+class CardParityTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        other_breed = make_breed(name='Boerboel')
+        self.pets = []
+        for n in range(18):
+            pet = make_pet(
+                other_breed if n % 3 else self.breed, name=f'Pup {n}', age_months=n % 5 or None,
+                price=Decimal(100 + n % 4 * 50), featured=n % 4 == 0,
+                status=PetStatus.RESERVED if n % 5 == 0 else PetStatus.AVAILABLE,
+                lifestyle=[LifestyleChoices.NEEDS_YARD] if n % 2 else [],
+            )
+            if n % 2 == 0:
+                PetPhoto.objects.create(pet=pet, image=f'pets/gallery/pup{n}.jpg', is_main=True)
+            self.pets.append(pet)
+        for n, pet in enumerate(self.pets[:6]):
+            for visitor in range(n % 3):
+                counters.record(pet.pk, counters.INTEREST, f'visitor-{visitor}')
+            counters.record(pet.pk, counters.VIEW, 'visitor-0')
+        counters.flush()
+
+    def list_json(self, params, use_cards):
+        cache.clear()
+        with override_settings(PET_CARDS_ENABLED=use_cards), \
+                mock.patch('pets.cards.render_page', wraps=cards.render_page) as render_page:
+            response = self.client.get('/api/pets/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(render_page.called, use_cards)
+        return response.json()
+
+    def test_card_pages_match_the_orm(self):
+        for params in [
+            {}, {'page': 2}, {'ordering': 'price'}, {'ordering': '-recommended'}, {'ordering': 'popular'},
+            {'ordering': '-age_months'}, {'breed': self.breed.pk}, {'lifestyle': 'needs_yard'},
+            {'age_months__gte': 3}, {'status': PetStatus.RESERVED},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.list_json(params, use_cards=True), self.list_json(params, use_cards=False))
+
+    def test_cards_follow_writes(self):
+        pet = self.pets[1]
+        pet.status = PetStatus.SOLD
+        pet.save()
+        self.assertFalse(PetCard.objects.filter(pk=pet.pk).exists())
+
+        self.breed.name = 'Rottweiler (KCI)'
+        self.breed.save()
+        card = PetCard.objects.get(pk=self.pets[0].pk)
+        self.assertIn('Rottweiler (KCI)', card.body)
+        self.assertEqual(card.interest_count, 0)
+        self.assertEqual(card.view_count, 1)
+
+    @override_settings(STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}})
+    def test_nested_photos_reach_the_card(self):
+        serializer = PetDetailSerializer(data={
+            'name': 'Nested', 'breed_id': str(self.breed.pk), 'weight': '8.50',
+            'photos': [{'image': SimpleUploadedFile('nested.gif', GIF, content_type='image/gif'), 'is_main': True}],
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        pet = serializer.save()
+        card = PetCard.objects.get(pk=pet.pk)
+        self.assertEqual(card.main_photo_url, pet.main_photo.url)
@@ -0,0 +1,100 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import override_settings
+
+from core import cdn
+from core.cdn import RecordingPurgeBackend, purge_dispatcher
+from pets.models import PetCounterEvent, PetPhoto
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+@override_settings(CDN_PURGE_BACKEND='core.cdn.RecordingPurgeBackend', CDN_PURGE_DEBOUNCE=0)
+class EdgeCacheTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        purge_dispatcher._backend = None
+        self.addCleanup(setattr, purge_dispatcher, '_backend', None)
+        self.breed = make_breed()
+        self.pet = make_pet(self.breed)
+        # Drop tags other tests left waiting on the debounce timer
+        purge_dispatcher.flush()
+        RecordingPurgeBackend.reset()
+
+    def test_anonymous_reads_carry_cache_tags(self):
+        response = self.client.get('/api/pets/')
+        self.assertEqual(response['Cache-Tag'], cdn.PET_LIST_TAG)
+        self.assertIn('s-maxage=600', response['Cache-Control'])
+
+        response = self.client.get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response['Cache-Tag'], f'{cdn.pet_tag(self.pet.pk)},{cdn.breed_tag(self.breed.pk)}')
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_logged_in_reads_are_private(self):
+        self.client.force_login(get_user_model().objects.create_user(username='visitor'))
+        response = self.client.get(f'/api/pets/{self.pet.pk}/')
+        self.assertNotIn('Cache-Tag', response)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_writes_purge_their_tags_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pet.name = 'Renamed'
+            self.pet.save()
+            self.assertEqual(RecordingPurgeBackend.batches, [])
+        self.assertEqual(RecordingPurgeBackend.purged(), {cdn.pet_tag(self.pet.pk), cdn.PET_LIST_TAG})
+
+        RecordingPurgeBackend.reset()
+        with self.captureOnCommitCallbacks(execute=True):
+            PetPhoto.objects.create(pet=self.pet, image='pets/gallery/rex.jpg', is_main=True)
+        self.assertEqual(RecordingPurgeBackend.purged(), {cdn.pet_tag(self.pet.pk), cdn.PET_LIST_TAG})
+
+        RecordingPurgeBackend.reset()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.breed.save()
+        self.assertEqual(
+            RecordingPurgeBackend.purged(), {cdn.breed_tag(self.breed.pk), cdn.BREED_LIST_TAG, cdn.PET_LIST_TAG},
+        )
+
+    def test_rolled_back_writes_purge_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    make_pet(self.breed, name='Never listed')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(RecordingPurgeBackend.batches, [])
+
+    def test_purges_are_sent_in_backend_sized_batches(self):
+        tags = [cdn.pet_tag(n) for n in range(35)]
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_dispatcher.purge(*tags)
+        self.assertEqual([len(batch) for batch in RecordingPurgeBackend.batches], [30, 5])
+        self.assertEqual(RecordingPurgeBackend.purged(), set(tags))
+
+
+class ViewBeaconTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pet = make_pet(make_breed())
+
+    def view(self, pk=None):
+        return self.client.post(f'/api/pets/{pk or self.pet.pk}/view/')
+
+    def test_counts_each_visitor_once_and_is_not_cached(self):
+        response = self.view()
+        self.assertEqual(response.json(), {'recorded': True})
+        self.assertNotIn('Cache-Tag', response)
+        self.assertEqual(self.view().json(), {'recorded': False})
+        self.assertEqual(PetCounterEvent.objects.count(), 1)
+
+    def test_detail_reads_record_nothing(self):
+        self.assertEqual(self.client.get(f'/api/pets/{self.pet.pk}/').status_code, 200)
+        self.assertFalse(PetCounterEvent.objects.exists())
+
+    def test_needs_a_live_pet(self):
+        self.assertEqual(self.view(pk=uuid.uuid4()).status_code, 404)
+        self.assertEqual(self.view(pk='not-a-uuid').status_code, 404)
+        self.pet.soft_delete()
+        self.assertEqual(self.view().status_code, 404)
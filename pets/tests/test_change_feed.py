@@ -0,0 +1,70 @@
+import base64
+import uuid
+from unittest import mock
+
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+from pets.views import ChangeFeedViewSet
+
+
+class ChangeFeedTests(CatalogTestCase):
+    url = '/api/changes/'
+
+    def setUp(self):
+        super().setUp()
+        # Rows written by the test are settled as soon as they exist
+        patcher = mock.patch.object(ChangeFeedViewSet, 'settle_seconds', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_merges_tables_oldest_first(self):
+        breed = make_breed()
+        pet = make_pet(breed)
+        results = self.get()['results']
+        self.assertEqual([(item['type'], item['id']) for item in results], [('breed', str(breed.pk)), ('pet', str(pet.pk))])
+        self.assertEqual(results[1]['data']['name'], pet.name)
+
+    def test_cursor_pages_cover_every_row_once(self):
+        breed = make_breed()
+        expected = [str(breed.pk)] + [str(make_pet(breed, name=f'Pup {n}').pk) for n in range(4)]
+
+        seen, params = [], {'limit': 2}
+        while True:
+            page = self.get(**params)
+            seen += [item['id'] for item in page['results']]
+            if not page['has_more']:
+                break
+            params['cursor'] = page['next_cursor']
+        self.assertEqual(seen, expected)
+        self.assertEqual(self.get(cursor=page['next_cursor'])['results'], [])
+
+    def test_reports_deletes(self):
+        breed = make_breed()
+        pet = make_pet(breed)
+        pet.soft_delete()
+        gone = make_breed(name='Boerboel')
+        gone_id = gone.pk
+        gone.delete()
+
+        deleted = [(item['type'], item['id']) for item in self.get()['results'] if item['deleted']]
+        self.assertEqual(deleted, [('pet', str(pet.pk)), ('breed', str(gone_id))])
+
+    def test_rejects_bad_positions(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
+        # Well-formed base64 around a bad timestamp
+        cursor = base64.urlsafe_b64encode(f'yesterday|{uuid.uuid4()}'.encode()).decode()
+        response = self.client.get(self.url, {'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json())
+
+    def test_rows_wait_for_older_open_transactions(self):
+        breed = make_breed()
+        # Another writer whose transaction began before the test's rows were saved
+        with mock.patch('pets.views.change_feed.OLDEST_OPEN_WRITE_SQL', 'SELECT transaction_timestamp()'):
+            self.assertEqual(self.get()['results'], [])
+        self.assertEqual([item['id'] for item in self.get()['results']], [str(breed.pk)])
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pets import counters
+from pets.models import Pet, PetCounter, PetCounterEvent
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+from pets.views import ChangeFeedViewSet
+
+
+class PetCounterTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        self.pet = make_pet(self.breed)
+
+    def test_interest_counts_each_visitor_once(self):
+        url = f'/api/pets/{self.pet.pk}/interest/'
+        self.assertEqual(self.client.post(url).json(), {'recorded': True})
+        self.assertEqual(self.client.post(url).json(), {'recorded': False})
+        self.assertEqual(self.client.post(url, HTTP_USER_AGENT='Other browser').json(), {'recorded': True})
+        # Buffered until the next flush
+        self.assertFalse(PetCounter.objects.exists())
+
+    def test_flush_folds_events_into_counters(self):
+        other = make_pet(self.breed, name='Other')
+        updated_at = Pet.objects.get(pk=self.pet.pk).updated_at
+        for visitor in ('a', 'b', 'c'):
+            counters.record(self.pet.pk, counters.INTEREST, visitor)
+        counters.record(self.pet.pk, counters.VIEW, 'a')
+        counters.record(other.pk, counters.VIEW, 'a')
+
+        self.assertEqual(counters.flush(batch_size=4), 4)
+        self.assertEqual(counters.flush(), 1)
+        self.assertEqual(counters.flush(), 0)
+        counts = dict(PetCounter.objects.values_list('pet_id', 'interest_count'))
+        self.assertEqual(counts, {self.pet.pk: 3, other.pk: 0})
+        self.assertEqual(PetCounter.objects.get(pet=other).view_count, 1)
+        self.assertFalse(PetCounterEvent.objects.exists())
+        # Counting never touches the pet row
+        self.assertEqual(Pet.objects.get(pk=self.pet.pk).updated_at, updated_at)
+
+    def test_popular_ordering_puts_pets_without_counters_last(self):
+        liked = make_pet(self.breed, name='Liked')
+        viewed = make_pet(self.breed, name='Liked and viewed')
+        PetCounter.objects.create(pet=liked, interest_count=5)
+        PetCounter.objects.create(pet=viewed, interest_count=5, view_count=2)
+
+        def names(ordering):
+            return [pet['name'] for pet in self.client.get('/api/pets/', {'ordering': ordering}).json()['results']]
+
+        self.assertEqual(names('popular'), ['Liked and viewed', 'Liked', 'Rex'])
+        self.assertEqual(names('-popular')[0], 'Rex')
+
+    @mock.patch.object(ChangeFeedViewSet, 'settle_seconds', 0)
+    def test_change_feed_joins_counters(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/changes/', {'since': '2000-01-01T00:00:00Z'})
+            return len(queries), response
+
+        PetCounter.objects.create(pet=self.pet, interest_count=1)
+        count_queries()  # loads the breed registry
+        single, _ = count_queries()
+        for name in ('Second', 'Third'):
+            PetCounter.objects.create(pet=make_pet(self.breed, name=name), view_count=1)
+        queries, response = count_queries()
+        self.assertEqual(queries, single)
+        pets = [item['data'] for item in response.json()['results'] if item['type'] == 'pet']
+        self.assertEqual(sorted(pet['view_count'] for pet in pets), [0, 1, 1])
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from pets.filters import PetOrderingFilter
+from pets.models import PetStatus
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class OrderingExpansionTests(SimpleTestCase):
+    def expand(self, *terms, filter_class=PetOrderingFilter):
+        return filter_class().expand_ordering(list(terms))
+
+    def test_id_tiebreaker_follows_last_key(self):
+        self.assertEqual(self.expand('-created_at'), ['-created_at', '-id'])
+        self.assertEqual(self.expand('price'), ['price', 'id'])
+
+    def test_public_names_expand_to_sort_keys(self):
+        self.assertEqual(self.expand('recommended'), ['-featured', '-created_at', '-id'])
+        self.assertEqual(self.expand('-recommended'), ['featured', 'created_at', 'id'])
+
+    def test_repeated_keys_keep_first_direction(self):
+        self.assertEqual(self.expand('price', '-price'), ['price', 'id'])
+        self.assertEqual(self.expand('id', 'price'), ['price', 'id'])
+
+
+class PetListFilterTests(CatalogTestCase):
+    url = '/api/pets/'
+
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [pet['name'] for pet in response.json()['results']]
+
+    def test_defaults_to_available_pets(self):
+        make_pet(self.breed, name='Available')
+        make_pet(self.breed, name='Sold', status=PetStatus.SOLD)
+        self.assertEqual(self.names(), ['Available'])
+        self.assertEqual(self.names(status=PetStatus.SOLD), ['Sold'])
+
+    def test_price_ordering(self):
+        for name, price in [('Mid', 200), ('Low', 100), ('High', 300)]:
+            make_pet(self.breed, name=name, price=Decimal(price))
+        self.assertEqual(self.names(ordering='price'), ['Low', 'Mid', 'High'])
+        self.assertEqual(self.names(ordering='-price'), ['High', 'Mid', 'Low'])
+
+    def test_featured_ordering(self):
+        make_pet(self.breed, name='Plain')
+        make_pet(self.breed, name='Featured', featured=True)
+        make_pet(self.breed, name='Newest')
+        self.assertEqual(self.names(ordering='recommended'), ['Featured', 'Newest', 'Plain'])
+        self.assertEqual(self.names(), ['Newest', 'Featured', 'Plain'])
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class HealthFilterTests(CatalogTestCase):
+    url = '/api/pets/'
+
+    def setUp(self):
+        super().setUp()
+        breed = make_breed()
+        today = timezone.localdate()
+        recent = today - timedelta(days=30)
+        make_pet(
+            breed, name='Vaccinated', rabies_vaccinated=True, dhpp_vaccinated=True,
+            rabies_vaccination_date=recent, dhpp_vaccination_date=recent, dewormed=True, deworming_date=today,
+        )
+        make_pet(
+            breed, name='Booster due', rabies_vaccinated=True, dhpp_vaccinated=True,
+            rabies_vaccination_date=today - timedelta(days=350), dhpp_vaccination_date=recent,
+            dewormed=True, deworming_date=today - timedelta(days=120),
+        )
+        make_pet(breed, name='Never treated')
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(pet['name'] for pet in response.json()['results'])
+
+    def test_fully_vaccinated(self):
+        self.assertEqual(self.names(fully_vaccinated='true'), ['Booster due', 'Vaccinated'])
+        self.assertEqual(self.names(fully_vaccinated='false'), ['Never treated'])
+
+    def test_never_treated_pets_are_due_for_everything(self):
+        self.assertEqual(self.names(vaccination_due_within=30), ['Booster due', 'Never treated'])
+        self.assertEqual(self.names(vaccination_due_within=0), ['Never treated'])
+        self.assertEqual(self.names(deworming_overdue='true'), ['Booster due', 'Never treated'])
+
+        report = self.client.get('/api/pets/health_report/', {'days': 30}).json()
+        self.assertEqual((report['vaccination_due'], report['deworming_overdue']), (2, 2))
+
+    def test_due_within_is_clamped_to_a_year(self):
+        self.assertEqual(self.names(vaccination_due_within=3000000), ['Booster due', 'Never treated', 'Vaccinated'])
+        self.assertEqual(self.names(vaccination_due_within=-5), ['Never treated'])
+
+    def test_due_within_must_be_a_whole_number(self):
+        for value in ['soon', '1.5', '']:
+            with self.subTest(value=value):
+                response = self.client.get(self.url, {'vaccination_due_within': value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('vaccination_due_within', response.json())
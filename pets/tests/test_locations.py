@@ -0,0 +1,46 @@
+from pets.locations import match_location
+from pets.models import Location
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class NearFilterTests(CatalogTestCase):
+    url = '/api/pets/'
+
+    def setUp(self):
+        super().setUp()
+        breed = make_breed()
+        # Towns come from the seeded gazetteer
+        self.mombasa = Location.objects.get(name='Mombasa')
+        make_pet(breed, name='City dog', location='Nairobi')
+        make_pet(breed, name='Coast dog', location='Mombasa')
+        make_pet(breed, name='Unplaced dog', location='Somewhere')
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [pet['name'] for pet in response.json()['results']]
+
+    def test_pets_are_matched_to_towns(self):
+        self.assertEqual(match_location('Karen, Nairobi').name, 'Karen')
+        self.assertEqual(match_location('  MOMBASA ').name, 'Mombasa')
+        self.assertIsNone(match_location('Somewhere'))
+
+    def test_town_origin(self):
+        results = self.client.get(self.url, {'near': 'Nairobi'}).json()['results']
+        self.assertEqual([(pet['name'], pet['distance']) for pet in results], [('City dog', 0.0)])
+        self.assertEqual(self.names(near='Atlantis'), [])
+
+    def test_coordinate_origin_and_radius(self):
+        origin = f'{self.mombasa.latitude},{self.mombasa.longitude}'
+        self.assertEqual(self.names(near=origin, radius_km=10), ['Coast dog'])
+        self.assertEqual(self.names(near=origin, radius_km='nan'), ['Coast dog'])
+        # Radius is capped at 500 km, which still reaches Nairobi
+        self.assertEqual(self.names(near='Mombasa', radius_km=10000, ordering='distance'), ['Coast dog', 'City dog'])
+
+    def test_rejects_coordinates_off_the_globe(self):
+        for near in ['1e400,0', 'nan,0', '0,inf', '91,0', '-90.5,10', '0,180.1']:
+            with self.subTest(near=near):
+                response = self.client.get(self.url, {'near': near})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('near', response.json())
+        self.assertEqual(self.names(near='90,180'), [])
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from pets.models import PetPhoto
+from pets.models.pets import MAX_PHOTOS_PER_PET, MAX_VIDEOS_PER_PET
+from pets.serializers import PetDetailSerializer
+from pets.tests.utils import GIF, CatalogTestCase, make_breed, make_pet
+
+
+def photo(is_main=False):
+    return {'image': SimpleUploadedFile('photo.gif', GIF, content_type='image/gif'), 'is_main': is_main}
+
+
+def video():
+    return {'video': SimpleUploadedFile('clip.mp4', b'\x00' * 16, content_type='video/mp4'), 'title': 'Clip'}
+
+
+@override_settings(STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}})
+class NestedMediaTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+
+    def serializer(self, instance=None, **data):
+        if instance is None:
+            data = {'name': 'Rex', 'breed_id': str(self.breed.pk), 'weight': '8.50', **data}
+        return PetDetailSerializer(instance, data=data, partial=instance is not None)
+
+    def create(self, **data):
+        serializer = self.serializer(**data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def test_media_is_inserted_in_bulk(self):
+        def count_queries(photos):
+            with CaptureQueriesContext(connection) as queries:
+                self.create(photos=photos, videos=[video()])
+            return len(queries)
+
+        self.create()  # loads the breed registry
+        one = count_queries([photo(is_main=True)])
+        self.assertEqual(count_queries([photo(is_main=True)] + [photo() for _ in range(MAX_PHOTOS_PER_PET - 1)]), one)
+
+    def test_limits_on_create(self):
+        serializer = self.serializer(photos=[photo() for _ in range(MAX_PHOTOS_PER_PET + 1)])
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('photos', serializer.errors)
+        serializer = self.serializer(photos=[photo(is_main=True), photo(is_main=True)])
+        self.assertFalse(serializer.is_valid())
+        serializer = self.serializer(videos=[video() for _ in range(MAX_VIDEOS_PER_PET + 1)])
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('videos', serializer.errors)
+
+    def test_limits_count_existing_media(self):
+        pet = self.create(photos=[photo(is_main=True)] + [photo() for _ in range(MAX_PHOTOS_PER_PET - 2)])
+        serializer = self.serializer(pet, photos=[photo()])
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        for photos in ([photo()], [photo(is_main=True)]):
+            serializer = self.serializer(pet, photos=photos)
+            self.assertFalse(serializer.is_valid())
+            self.assertIn('photos', serializer.errors)
+        self.assertEqual(pet.photos.count(), MAX_PHOTOS_PER_PET)
+
+    def test_second_main_photo_is_rejected_by_the_database(self):
+        pet = make_pet(self.breed)
+        PetPhoto.objects.create(pet=pet, image='pets/gallery/main.jpg', is_main=True)
+        # Validated before the first main photo existed (a concurrent write)
+        serializer = self.serializer(pet, photos=[photo(is_main=True)])
+        serializer.validate_media_limits = lambda attrs: None
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(ValidationError) as raised:
+            serializer.save()
+        self.assertIn('photos', raised.exception.detail)
+        self.assertEqual(pet.photos.filter(is_main=True).count(), 1)
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pets.models import CharacteristicChoices, LifestyleChoices, PetGender, PetPhoto, PetSize, PetStatus
+from pets.recommendations import similarity_index
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+TRAITS = {
+    'lifestyle': [LifestyleChoices.FAMILY_FRIENDLY, LifestyleChoices.NEEDS_YARD],
+    'characteristics': [CharacteristicChoices.ACTIVE, CharacteristicChoices.PROTECTIVE],
+    'size': PetSize.LARGE,
+    'gender': PetGender.MALE,
+}
+
+
+class SimilarPetsTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        self.other_breed = make_breed(name='Pug')
+        self.pet = make_pet(self.breed, name='Anchor', age_months=12, **TRAITS)
+
+    def similar(self, **params):
+        response = self.client.get(f'/api/pets/{self.pet.pk}/similar/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_ranks_by_traits_breed_and_age(self):
+        make_pet(self.breed, name='Twin', age_months=12, **TRAITS)
+        make_pet(self.other_breed, name='Same traits', age_months=12, **TRAITS)
+        make_pet(self.breed, name='Same breed', age_months=60, size=PetSize.SMALL, gender=PetGender.FEMALE)
+        make_pet(self.other_breed, name='Stranger', size=PetSize.SMALL, gender=PetGender.FEMALE)
+        make_pet(self.breed, name='Sold twin', age_months=12, status=PetStatus.SOLD, **TRAITS)
+
+        results = self.similar()
+        self.assertEqual([pet['name'] for pet in results], ['Twin', 'Same traits', 'Same breed', 'Stranger'])
+        self.assertEqual(results[0]['similarity'], 1.75)
+        self.assertEqual([pet['name'] for pet in self.similar(k=2)], ['Twin', 'Same traits'])
+
+    def test_index_follows_committed_writes(self):
+        self.assertEqual(self.similar(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            twin = make_pet(self.breed, name='Twin', **TRAITS)
+        self.assertEqual([pet['name'] for pet in self.similar()], ['Twin'])
+
+        twin.status = PetStatus.SOLD
+        with self.captureOnCommitCallbacks(execute=True):
+            twin.save()
+        self.assertEqual(self.similar(), [])
+
+    def test_changes_replay_into_other_workers(self):
+        entries = similarity_index._ensure_loaded()
+        with self.captureOnCommitCallbacks(execute=True):
+            twin = make_pet(self.breed, name='Twin', **TRAITS)
+        # A reader holding the old dict never sees it change
+        self.assertNotIn(twin.pk, entries)
+        self.assertIn(twin.pk, similarity_index._ensure_loaded())
+
+    def test_results_are_fetched_in_constant_queries(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.similar(k=20)
+            return len(queries)
+
+        for n in range(2):
+            pet = make_pet(self.breed, name=f'Pup {n}', **TRAITS)
+            PetPhoto.objects.create(pet=pet, image=f'pets/gallery/pup{n}.jpg', is_main=True)
+        self.similar()  # loads the index and the breed registry
+        few = count_queries()
+        for n in range(2, 8):
+            pet = make_pet(self.breed, name=f'Pup {n}', **TRAITS)
+            PetPhoto.objects.create(pet=pet, image=f'pets/gallery/pup{n}.jpg', is_main=True)
+        similarity_index._entries = None
+        self.similar()
+        self.assertEqual(count_queries(), few)
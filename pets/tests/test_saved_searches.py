@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+
+from pets.models import LifestyleChoices, CharacteristicChoices, PetGender, PetSize, PetStatus, SavedSearch, SearchAlert
+from pets.saved_searches import saved_search_index
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class SavedSearchMatchingTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user('buyer')
+        self.breed = make_breed()
+        self.other_breed = make_breed(name='Boerboel')
+
+    def save_search(self, **criteria):
+        # The index follows saved searches once they commit
+        with self.captureOnCommitCallbacks(execute=True):
+            return SavedSearch.objects.create(user=self.user, **criteria)
+
+    def matched(self, pet):
+        return set(saved_search_index.match(pet))
+
+    def test_empty_criteria_match_anything(self):
+        search = self.save_search()
+        self.assertEqual(self.matched(make_pet(self.breed)), {search.pk})
+
+    def test_bucket_criteria(self):
+        breed = self.save_search(breed=self.breed)
+        female = self.save_search(gender=PetGender.FEMALE)
+        small_female = self.save_search(breed=self.breed, gender=PetGender.FEMALE, size=PetSize.SMALL)
+
+        pet = make_pet(self.breed, gender=PetGender.FEMALE, size=PetSize.SMALL)
+        self.assertEqual(self.matched(pet), {breed.pk, female.pk, small_female.pk})
+        pet = make_pet(self.other_breed, gender=PetGender.FEMALE, size=PetSize.SMALL)
+        self.assertEqual(self.matched(pet), {female.pk})
+
+    def test_age_traits_and_location(self):
+        young = self.save_search(min_age_months=2, max_age_months=6)
+        family = self.save_search(lifestyle=[LifestyleChoices.FAMILY_FRIENDLY, LifestyleChoices.NEEDS_YARD])
+        # Wants a calm pet; this one is active
+        self.save_search(characteristics=[CharacteristicChoices.CALM])
+        nairobi = self.save_search(location='  Nairobi ')
+
+        pet = make_pet(
+            self.breed, age_months=4, lifestyle=[LifestyleChoices.NEEDS_YARD],
+            characteristics=[CharacteristicChoices.ACTIVE], location='Karen, NAIROBI',
+        )
+        self.assertEqual(self.matched(pet), {young.pk, family.pk, nairobi.pk})
+        self.assertEqual(self.matched(make_pet(self.breed)), set())
+
+    def test_edits_and_deletes_reach_the_index(self):
+        search = self.save_search(breed=self.breed)
+        pet = make_pet(self.breed)
+        self.assertEqual(self.matched(pet), {search.pk})
+
+        search.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            search.save()
+        self.assertEqual(self.matched(pet), set())
+
+        other = self.save_search()
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        self.assertEqual(self.matched(pet), set())
+
+    def test_new_available_pets_queue_alerts_after_commit(self):
+        search = self.save_search(breed=self.breed)
+        with self.captureOnCommitCallbacks() as callbacks:
+            pet = make_pet(self.breed)
+        self.assertFalse(SearchAlert.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(list(SearchAlert.objects.values_list('saved_search', 'pet')), [(search.pk, pet.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_pet(self.breed, status=PetStatus.SOLD)
+        self.assertEqual(SearchAlert.objects.count(), 1)
+
+    def test_changes_replay_into_other_workers(self):
+        search = self.save_search(breed=self.breed)
+        buckets = saved_search_index._ensure_loaded()
+        other = self.save_search(breed=self.breed)
+        # A reader holding the old buckets never sees them change
+        self.assertEqual(set(buckets[(self.breed.pk, None, None)]), {search.pk})
+
+        # Another worker one change behind replays it without querying
+        saved_search_index._buckets, saved_search_index._keys = buckets, {search.pk: (self.breed.pk, None, None)}
+        saved_search_index._version -= 1
+        pet = make_pet(self.breed)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.matched(pet), {search.pk, other.pk})
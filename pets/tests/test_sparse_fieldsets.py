@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pets.models import PetParent, PetPhoto
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class SparseFieldsetTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed()
+        self.father = PetParent.objects.create(name='Duke', gender='male')
+        self.pet = make_pet(self.breed, description='A long description', father=self.father)
+        PetPhoto.objects.create(pet=self.pet, image='pets/gallery/rex.jpg', is_main=True)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        pet_queries = [query['sql'] for query in queries if 'FROM "pets_pet"' in query['sql']]
+        return response.json(), pet_queries
+
+    def test_list_renders_and_selects_only_requested_fields(self):
+        data, queries = self.get('/api/pets/', fields='id,name,main_photo')
+        self.assertEqual(data['results'], [{
+            'id': str(self.pet.pk), 'name': 'Rex', 'main_photo': 'http://testserver/media/pets/gallery/rex.jpg',
+        }])
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertNotIn('"pets_pet"."description"', sql)
+            self.assertNotIn('"pets_pet"."lifestyle"', sql)
+
+    def test_nested_relations_collapse_unless_expanded(self):
+        url = f'/api/pets/{self.pet.pk}/'
+        data, queries = self.get(url, fields='id,father')
+        self.assertEqual(data, {'id': str(self.pet.pk), 'father': str(self.father.pk)})
+        self.assertFalse(any('"pets_petparent"' in sql for sql in queries))
+
+        data, _ = self.get(url, fields='id,father', expand='father')
+        self.assertEqual(data['father']['name'], 'Duke')
+
+    def test_breed_fields(self):
+        data, _ = self.get(f'/api/breeds/{self.breed.pk}/', fields='name')
+        self.assertEqual(data, {'name': 'Rottweiler'})
+
+    def test_full_representation_without_fields(self):
+        data, _ = self.get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(data['description'], 'A long description')
+        self.assertEqual(data['father']['name'], 'Duke')
@@ -0,0 +1,55 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import override_settings
+
+from pets.models import PetParent, PetPhoto
+from pets.storage_gc import iter_orphans
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class StorageGcTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        local_media = override_settings(
+            MEDIA_ROOT=media_root.name,
+            STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'}},
+        )
+        local_media.enable()
+        self.addCleanup(local_media.disable)
+
+        pet = make_pet(make_breed())
+        for name in ['pets/gallery/kept.jpg', 'pets/gallery/2026/orphan.jpg', 'pet_parents/avatars/duke.jpg',
+                     'pets/videos/orphan.mp4', 'other/untouched.txt']:
+            default_storage.save(name, ContentFile(b'data'))
+        PetPhoto.objects.create(pet=pet, image='pets/gallery/kept.jpg', is_main=True)
+        PetParent.objects.create(name='Duke', gender='male', avatar='pet_parents/avatars/duke.jpg')
+
+    def test_finds_unreferenced_files_under_media_prefixes(self):
+        orphans = {stored.name for stored in iter_orphans(default_storage, batch_size=2)}
+        self.assertEqual(orphans, {'pets/gallery/2026/orphan.jpg', 'pets/videos/orphan.mp4'})
+
+    def test_dry_run_keeps_files(self):
+        out = StringIO()
+        call_command('gc_media', '--dry-run', '--min-age-hours=0', stdout=out)
+        self.assertIn('Would delete 2 orphaned files', out.getvalue())
+        self.assertTrue(default_storage.exists('pets/videos/orphan.mp4'))
+
+    def test_deletes_orphans_only(self):
+        call_command('gc_media', '--min-age-hours=0', stdout=StringIO())
+        self.assertFalse(default_storage.exists('pets/gallery/2026/orphan.jpg'))
+        self.assertFalse(default_storage.exists('pets/videos/orphan.mp4'))
+        for name in ['pets/gallery/kept.jpg', 'pet_parents/avatars/duke.jpg', 'other/untouched.txt']:
+            self.assertTrue(os.path.exists(default_storage.path(name)), name)
+
+    def test_recent_uploads_are_skipped(self):
+        out = StringIO()
+        call_command('gc_media', '--min-age-hours=24', stdout=out)
+        self.assertIn('Deleted 0 orphaned files', out.getvalue())
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from pethub.warmup import warm_up
+from pets.models import PetStatus
+from pets.suggestions import suggestion_index
+from pets.tests.utils import CatalogTestCase, make_breed, make_pet
+
+
+class SuggestionTests(CatalogTestCase):
+    url = '/api/pets/suggest/'
+
+    def setUp(self):
+        super().setUp()
+        self.breed = make_breed(name='Golden Retriever')
+        make_pet(self.breed, name='Goldie', color='Golden', location='Nairobi')
+        make_pet(self.breed, name='Rex', color='Black', location='Nairobi')
+
+    def suggest(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item['type'], item['value'], item['count']) for item in response.json()]
+
+    def test_prefixes_match_word_starts(self):
+        self.assertEqual(self.suggest('retr'), [('breed', 'Golden Retriever', 2)])
+        self.assertEqual(
+            self.suggest('gold'), [('breed', 'Golden Retriever', 2), ('color', 'Golden', 1), ('pet', 'Goldie', 1)],
+        )
+        self.assertEqual(self.suggest('nai', limit=1), [('location', 'Nairobi', 2)])
+        self.assertEqual(self.suggest('   '), [])
+
+    def test_index_follows_committed_writes(self):
+        self.assertEqual(self.suggest('rex'), [('pet', 'Rex', 1)])
+        with self.captureOnCommitCallbacks(execute=True):
+            max_ = make_pet(self.breed, name='Max')
+        self.assertEqual(self.suggest('max'), [('pet', 'Max', 1)])
+
+        max_.status = PetStatus.SOLD
+        with self.captureOnCommitCallbacks(execute=True):
+            max_.save()
+        self.assertEqual(self.suggest('max'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            make_breed(name='Maltese')
+        self.assertEqual(self.suggest('mal'), [('breed', 'Maltese', 0)])
+
+    def test_changes_replay_into_new_snapshots(self):
+        state = suggestion_index._ensure_loaded()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_pet(self.breed, name='Max')
+        # A reader holding the old snapshot never sees it change
+        self.assertNotIn('max', state.keys)
+        self.assertIn('max', suggestion_index._ensure_loaded().keys)
+
+    def test_other_workers_replay_missed_changes(self):
+        suggestion_index._ensure_loaded()
+        with self.captureOnCommitCallbacks(execute=True):
+            max_ = make_pet(self.breed, name='Max')
+        # Rewind this worker as if another one had published the change
+        suggestion_index._state.set_pet(max_.pk, frozenset())
+        suggestion_index._version -= 1
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('max'), [('pet', 'Max', 1)])
+
+    def test_renames_reload_everywhere(self):
+        self.suggest('gold')
+        self.breed.name = 'Labrador'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.breed.save()
+        self.assertEqual(self.suggest('lab'), [('breed', 'Labrador', 2)])
+
+    def test_built_at_warm_up(self):
+        with mock.patch('pethub.warmup.connections'):
+            warm_up()
+        with self.assertNumQueries(0):
+            self.assertEqual(suggestion_index.suggest('rex'), [{'value': 'Rex', 'type': 'pet', 'count': 1}])
@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from pets.breeds import breed_registry
+from pets.models import Breed, Pet, PetSize
+from pets.recommendations import similarity_index
+from pets.saved_searches import saved_search_index
+from pets.suggestions import suggestion_index
+
+# Smallest valid GIF, for ImageField uploads
+GIF = (
+    b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00'
+    b',\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+)
+
+
+def make_breed(name='Rottweiler', **fields):
+    fields.setdefault('size_category', PetSize.LARGE)
+    return Breed.objects.create(name=name, **fields)
+
+
+def make_pet(breed, name='Rex', **fields):
+    fields.setdefault('weight', Decimal('10.00'))
+    return Pet.objects.create(name=name, breed=breed, **fields)
+
+
+# The test client speaks plain HTTP
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CatalogTestCase(TestCase):
+    """
+    TestCase that starts from an empty cache and unloaded in-process indexes,
+    so nothing cached by an earlier (rolled back) test leaks into this one.
+    """
+
+    def setUp(self):
+        cache.clear()
+        breed_registry._breeds = None
+        saved_search_index._buckets = None
+        similarity_index._entries = None
+        suggestion_index._state = None
@@ -1,29 +1,73 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from pets.views import PetViewSet, BreedViewSet
+from pets.views import PetViewSet, BreedViewSet, BreederPetViewSet, ChangeFeedViewSet, SavedSearchViewSet
 
 # Create a router and register our viewsets
 router = DefaultRouter()
 router.register(r'pets', PetViewSet, basename='pet')
 router.register(r'breeds', BreedViewSet, basename='breed')
+router.register(r'changes', ChangeFeedViewSet, basename='change')
+router.register(r'breeder/pets', BreederPetViewSet, basename='breeder-pet')
+router.register(r'saved-searches', SavedSearchViewSet, basename='saved-search')
 
 urlpatterns = [
     # API endpoints
     path('api/', include(router.urls)),
 ]
 
+# Anonymous GETs on pet lists, details, filters_info, suggest, similar and breeds
+# are cacheable at the CDN (Cache-Control s-maxage + Cache-Tag); writes purge
+# the affected tags through core.cdn. Authenticated responses are private.
+#
 # Available endpoints:
 # Pets:
-# GET    /api/pets/                    - List all pets (with filtering)
-# POST   /api/pets/                    - Create a new pet
+# GET    /api/pets/                    - List pets (with filtering, defaults to status=available)
+#        (served from the PetCard projection when PET_CARDS_ENABLED and the filters allow)
+#        ?ordering=recommended|popular|featured|price|-price|created_at|name|age_months
+# POST   /api/pets/                    - Create a new pet (optionally with nested media,
+#                                        multipart keys photos[0]image, photos[0]is_main, videos[0]video)
 # GET    /api/pets/{id}/               - Get pet details
 # PUT    /api/pets/{id}/               - Update pet (full)
-# PATCH  /api/pets/{id}/               - Update pet (partial)
-# DELETE /api/pets/{id}/               - Delete pet
+# PATCH  /api/pets/{id}/               - Update pet (partial; nested photos/videos are added)
+# DELETE /api/pets/{id}/               - Delete pet (soft delete; archived later by archive_pets)
 #
 # Breeds:
 # GET    /api/breeds/                  - List all breeds
 # GET    /api/breeds/{id}/             - Get breed details
 #
+# Breeder-scoped (authenticated breeder accounts; same filters and actions as /api/pets/):
+# GET    /api/breeder/pets/            - The breeder's own pets
+# POST   /api/breeder/pets/            - Create a pet owned by the breeder
+# GET    /api/breeder/pets/filters_info/ - Facets for the breeder's catalog only
+#
+# Saved searches (authenticated; alerts for newly listed matching pets, sent by send_search_alerts):
+# GET    /api/saved-searches/          - The user's saved searches
+# POST   /api/saved-searches/          - Save a search (breed, gender, size, min/max_age_months,
+#                                        lifestyle, characteristics, location)
+# PATCH  /api/saved-searches/{id}/     - Update, or pause with is_active=false
+# DELETE /api/saved-searches/{id}/     - Delete
+#
+# Change feed (incremental sync):
+# GET    /api/changes/?since=<ISO datetime> - Pets, breeds, parents and deletes changed since T
+# GET    /api/changes/?cursor=<next_cursor> - Next batch (?limit=100, max 500)
+#
 # Custom actions:
 # GET    /api/pets/filters_info/       - Get filter options for frontend
+# GET    /api/pets/suggest/?q=gol      - Search-box completions (?limit=8, max 20)
+# GET    /api/pets/health_report/?days=30   - Vaccination/deworming compliance counts
+# GET    /api/pets/health_due_csv/?days=30  - Streaming CSV of pets due or overdue
+#
+# Health filters on /api/pets/: ?fully_vaccinated=true, ?vaccination_due_within=30, ?deworming_overdue=true
+# GET    /api/pets/{id}/similar/       - Get similar available pets (?k=6, max 20)
+# POST   /api/pets/{id}/interest/      - Register interest (once per visitor per day)
+# POST   /api/pets/{id}/view/          - View beacon (once per visitor per day; detail GETs are edge-cached)
+#        interest_count/view_count are buffered and applied by flush_pet_counters
+#
+# Sparse fieldsets (list/detail of pets and breeds):
+# GET    /api/pets/?fields=id,name,main_photo          - Only these fields (and only these columns)
+# GET    /api/pets/{id}/?fields=id,name,breed&expand=breed - Nested objects only when expanded,
+#                                                       otherwise relations render as ids
+#
+# Location search:
+# GET    /api/pets/?near=Karen&radius_km=10       - Pets within 10 km of a gazetteer town
+# GET    /api/pets/?near=-1.28,36.81&ordering=distance - Pets near coordinates, nearest first
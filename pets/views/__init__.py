@@ -1,3 +1,6 @@
 from .pet_views import PetViewSet, BreedViewSet
+from .breeder_views import BreederPetViewSet
+from .change_feed import ChangeFeedViewSet
+from .saved_search_views import SavedSearchViewSet
 
-__all__ = ['PetViewSet', 'BreedViewSet']
+__all__ = ['PetViewSet', 'BreedViewSet', 'BreederPetViewSet', 'ChangeFeedViewSet', 'SavedSearchViewSet']
@@ -0,0 +1,19 @@
+from rest_framework.permissions import IsAuthenticated
+
+from pets.views.pet_views import PetViewSet
+from users.permissions import IsBreeder
+
+
+class BreederPetViewSet(PetViewSet):
+    """
+    The signed-in breeder's own pets. Same filters, orderings and actions as
+    the public catalog, but every query, cache entry and facet is scoped to
+    the breeder and served from the breeder-led indexes.
+    """
+    permission_classes = [IsAuthenticated, IsBreeder]
+
+    def get_tenant(self):
+        return self.request.user.breeder
+
+    def perform_create(self, serializer):
+        serializer.save(breeder=self.get_tenant())
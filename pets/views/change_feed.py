@@ -0,0 +1,134 @@
+import base64
+import heapq
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from pets.models import Pet, Breed, PetParent, Tombstone
+from pets.models.pets import main_photo_prefetch
+from pets.serializers import PetDetailSerializer, BreedSerializer
+from pets.serializers.pet_serializers import PetParentSerializer
+
+
+# Start of the oldest other transaction that has written something and not
+# yet committed. Only sessions of the same database role are visible, so
+# every writer must connect as the app's role.
+OLDEST_OPEN_WRITE_SQL = """
+    SELECT min(xact_start) FROM pg_stat_activity
+    WHERE backend_xid IS NOT NULL AND pid <> pg_backend_pid()
+"""
+
+
+def encode_cursor(updated_at, pk):
+    return base64.urlsafe_b64encode(f'{updated_at.isoformat()}|{pk}'.encode()).decode()
+
+
+def decode_cursor(value):
+    try:
+        updated_at, pk = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+        updated_at = parse_datetime(updated_at)
+        if updated_at is None:
+            raise ValueError(value)
+        return updated_at, uuid.UUID(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+class ChangeFeedViewSet(viewsets.ViewSet):
+    """
+    Pets, breeds and parents changed after a cursor, oldest first.
+
+    Rows from every table are merged on ``(updated_at, id)``, each table read
+    through its ``(updated_at, id)`` index. Deletes come back as tombstones
+    (``deleted: true``). Pass ``next_cursor`` back as ``?cursor=`` until
+    ``has_more`` is false; ``?since=<ISO datetime>`` starts from a timestamp.
+    """
+    default_limit = 100
+    max_limit = 500
+    # Rows are held back until every transaction that could still commit an
+    # older ``updated_at`` has finished: on PostgreSQL, until the oldest open
+    # write transaction started; elsewhere only the settle window applies, so
+    # a transaction committing more than ``settle_seconds`` after its save is
+    # skipped. The window also covers clock skew between app servers and the
+    # gap between taking ``updated_at`` and the row's first write.
+    settle_seconds = 30
+
+    def get_sources(self):
+        """(kind, queryset, serializer class or None for tombstones)."""
+        return [
+            ('pet', Pet.all_objects.select_related('father', 'mother', 'normalized_location', 'counter')
+                .prefetch_related('photos', 'videos', main_photo_prefetch()), PetDetailSerializer),
+            ('breed', Breed.objects.all(), BreedSerializer),
+            ('parent', PetParent.objects.all(), PetParentSerializer),
+            ('tombstone', Tombstone.objects.all(), None),
+        ]
+
+    def get_upper_bound(self):
+        upper = timezone.now() - timedelta(seconds=self.settle_seconds)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(OLDEST_OPEN_WRITE_SQL)
+                oldest_open_write = cursor.fetchone()[0]
+            if oldest_open_write is not None:
+                upper = min(upper, oldest_open_write)
+        return upper
+
+    def get_position(self, request):
+        if 'cursor' in request.query_params:
+            return decode_cursor(request.query_params['cursor'])
+        if 'since' in request.query_params:
+            since = parse_datetime(request.query_params['since'])
+            if since is None:
+                raise ValidationError({'since': 'Expected an ISO 8601 datetime.'})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            return since, None
+        return None, None
+
+    def get_limit(self, request):
+        try:
+            return min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            return self.default_limit
+
+    def list(self, request):
+        updated_at, pk = self.get_position(request)
+        limit = self.get_limit(request)
+        upper = self.get_upper_bound()
+
+        batches = []
+        for kind, queryset, serializer_class in self.get_sources():
+            queryset = queryset.filter(updated_at__lte=upper)
+            if updated_at is not None and pk is not None:
+                queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk))
+            elif updated_at is not None:
+                queryset = queryset.filter(updated_at__gt=updated_at)
+            rows = list(queryset.order_by('updated_at', 'pk')[:limit + 1])
+            batches.append([(row.updated_at, row.pk, kind, row, serializer_class) for row in rows])
+
+        merged = list(heapq.merge(*batches, key=lambda item: (item[0], item[1])))
+        page = merged[:limit]
+        context = {'request': request}
+        results = []
+        for row_updated_at, row_pk, kind, row, serializer_class in page:
+            if serializer_class is None:
+                results.append({'type': row.kind, 'id': row.object_id, 'updated_at': row_updated_at, 'deleted': True, 'data': None})
+            elif kind == 'pet' and row.deleted_at is not None:
+                results.append({'type': kind, 'id': row_pk, 'updated_at': row_updated_at, 'deleted': True, 'data': None})
+            else:
+                data = serializer_class(row, context=context).data
+                results.append({'type': kind, 'id': row_pk, 'updated_at': row_updated_at, 'deleted': False, 'data': data})
+
+        next_cursor = encode_cursor(page[-1][0], page[-1][1]) if page else request.query_params.get('cursor')
+        return Response({
+            'results': results,
+            'next_cursor': next_cursor,
+            'has_more': len(merged) > limit,
+        })
@@ -0,0 +1,66 @@
+from django.utils.cache import patch_cache_control
+
+from core.cdn import tag_response
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin that reads ``?fields=`` / ``?expand=`` on GET requests, passes
+    them to the serializer and narrows the queryset to match.
+    Serializers must use ``SparseFieldsetMixin``.
+    """
+    fields_param = 'fields'
+    expand_param = 'expand'
+    # Actions whose queryset and output follow the requested fields
+    sparse_actions = ('list', 'retrieve')
+
+    def _parse_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        return {part.strip() for part in value.split(',') if part.strip()}
+
+    def get_sparse_fieldset(self):
+        """Return (fields, expand); fields is None when no selection applies."""
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET' or self.action not in self.sparse_actions:
+            return None, set()
+        return self._parse_param(self.fields_param), self._parse_param(self.expand_param) or set()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields, expand = self.get_sparse_fieldset()
+        if fields is not None:
+            context['fields'] = fields
+            context['expand'] = expand
+        return context
+
+    def apply_sparse_fieldset(self, queryset):
+        fields, _ = self.get_sparse_fieldset()
+        if fields is None:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return serializer.prepare_queryset(queryset)
+
+
+class EdgeCacheMixin:
+    """
+    View mixin that lets the CDN cache successful anonymous GET responses.
+    ``edge_cache_policies`` maps actions to Cache-Control directives (see
+    core.cdn); ``get_cache_tags`` names the tags that purge the response.
+    Authenticated responses are marked private.
+    """
+    edge_cache_policies = {}
+
+    def get_cache_tags(self, response):
+        return []
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        policy = self.edge_cache_policies.get(self.action)
+        if policy is None or request.method != 'GET' or response.status_code != 200:
+            return response
+        if request.user.is_authenticated or 'HTTP_AUTHORIZATION' in request.META:
+            patch_cache_control(response, private=True)
+            return response
+        return tag_response(response, self.get_cache_tags(response), policy)
@@ -1,41 +1,130 @@
-from rest_framework import viewsets, filters, status
+import csv
+from itertools import chain
+
+from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min, Max
-from django.core.cache import cache
-from pets.models import Pet, Breed, PetSize, PetGender, LifestyleChoices, CharacteristicChoices
+from django.db.models import Count, Min, Max
+from django.http import Http404, StreamingHttpResponse
+from core.cache import cached_swr, query_cache_key
+from core import cdn
+from core.compression import build_cache_entry, response_from_cache_entry
+from pets.models import Pet, PetCard, Breed, PetSize, PetGender, PetStatus, LifestyleChoices, CharacteristicChoices
+from pets.models.pets import LIVE_STATUSES, main_photo_prefetch
+from pets.filters import PetCardOrderingFilter, PetOrderingFilter, PetNearFilter, PetHealthFilter
+from pets import cards, counters, health
+from pets.breeds import breed_registry
+from pets.recommendations import similarity_index
+from pets.suggestions import suggestion_index
 from pets.serializers import PetListSerializer, PetDetailSerializer, BreedSerializer
+from pets.views.mixins import EdgeCacheMixin, SparseFieldsetViewMixin
+
 
+class Echo:
+    """File-like object that returns what is written, for streaming csv.writer output."""
+    def write(self, value):
+        return value
 
-class BreedViewSet(viewsets.ReadOnlyModelViewSet):
+
+class BreedViewSet(EdgeCacheMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Breed.objects.all().order_by('name')
     serializer_class = BreedSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'size_category', 'description']
     ordering_fields = ['name', 'size_category', 'created_at']
     ordering = ['name']
+    edge_cache_policies = {'list': cdn.REFERENCE_POLICY, 'retrieve': cdn.REFERENCE_POLICY}
+    
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(super().get_queryset())
+    
+    def get_object(self):
+        """Breed details come from the in-process registry."""
+        breed = breed_registry.get(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if breed is None:
+            raise Http404
+        return breed
+    
+    def get_cache_tags(self, response):
+        if self.action == 'retrieve':
+            return [cdn.breed_tag(self.kwargs['pk'])]
+        return [cdn.BREED_LIST_TAG]
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Serve breed lists from the stale-while-revalidate cache.
+        """
+        def render():
+            response = super(BreedViewSet, self).list(request, *args, **kwargs)
+            return build_cache_entry(JSONRenderer().render(response.data))
+        
+        entry = cached_swr(
+            query_cache_key('breeds_list', request), render,
+            soft_ttl=3600, hard_ttl=86400, background=False,
+        )
+        return response_from_cache_entry(request, entry)
 
 
-class PetViewSet(viewsets.ModelViewSet):
-    queryset = Pet.objects.all().select_related('breed', 'father', 'mother')
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+class PetViewSet(EdgeCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    # Breeds come from the in-process registry (pets.breeds), not a join
+    queryset = Pet.objects.all().select_related('father', 'mother', 'normalized_location', 'counter')
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, PetHealthFilter, PetNearFilter, PetOrderingFilter]
     
     # Filtering options
     filterset_fields = {
+        'status': ['exact'],
         'breed': ['exact'],
         'gender': ['exact'],
         'size': ['exact'], 
         'age_months': ['gte', 'lte', 'exact'],
         'location': ['icontains'],
+        'normalized_location': ['exact'],
     }
     
     # Search options
     search_fields = ['name', 'breed__name', 'color', 'location', 'size']
-    # Ordering options
-    ordering_fields = ['created_at', 'updated_at', 'name', 'age_months']
+    # Ordering options (expanded to index-aligned sort keys by PetOrderingFilter)
+    ordering_fields = [
+        'created_at', 'updated_at', 'name', 'age_months', 'price', 'featured', 'recommended', 'popular',
+        'distance',  # only with ?near=
+    ]
     ordering = ['-created_at']  # Newest first
     
+    # Anonymous GETs the CDN may serve; purged by the tags from get_cache_tags
+    edge_cache_policies = {
+        'list': cdn.CATALOG_POLICY,
+        'filters_info': cdn.CATALOG_POLICY,
+        'suggest': cdn.CATALOG_POLICY,
+        'similar': cdn.CATALOG_POLICY,
+        'retrieve': cdn.DETAIL_POLICY,
+    }
+    
+    def get_tenant(self):
+        """Breeder the request is scoped to; None for the public catalog."""
+        return None
+    
+    def cache_namespace(self, name):
+        """Partition cache keys per tenant so breeders never share entries."""
+        tenant = self.get_tenant()
+        return name if tenant is None else f'{name}_b{tenant.pk}'
+    
+    def scope_queryset(self, queryset):
+        tenant = self.get_tenant()
+        return queryset if tenant is None else queryset.filter(breeder=tenant)
+    
+    def get_cache_tags(self, response):
+        if self.action == 'retrieve':
+            # Detail embeds the breed, so breed edits purge it too
+            breed = response.data.get('breed')
+            breed_id = breed.get('id') if isinstance(breed, dict) else breed
+            return [cdn.pet_tag(self.kwargs['pk'])] + ([cdn.breed_tag(breed_id)] if breed_id else [])
+        if self.action == 'similar':
+            return [cdn.pet_tag(self.kwargs['pk']), cdn.PET_LIST_TAG]
+        return [cdn.PET_LIST_TAG]
+    
     def get_serializer_class(self):
         """
         Return appropriate serializer based on action.
@@ -51,16 +140,27 @@ class PetViewSet(viewsets.ModelViewSet):
         # Start with base queryset
         if self.action == 'list':
             # For list view, use optimized queryset with only needed fields
-            queryset = Pet.objects.all().select_related('breed').only(
-                'id', 'name', 'age_months', 'gender', 
+            queryset = Pet.objects.all().select_related('counter').only(
+                'id', 'name', 'breed_id', 'age_months', 'gender', 
                 'size', 'location', 'characteristics', 
-                'lifestyle', 'champions_bloodline',
-                'breed__name'
-            )
+                'lifestyle', 'champions_bloodline', 'featured',
+                'counter__interest_count', 'counter__view_count'
+            ).prefetch_related(main_photo_prefetch())
+            # Catalog defaults to available pets so the (status, ...) indexes apply
+            if 'status' not in self.request.query_params:
+                queryset = queryset.filter(status=PetStatus.AVAILABLE)
         else:
             # For detail view and other actions, use full queryset
             queryset = super().get_queryset()
         
+        queryset = self.scope_queryset(queryset)
+        
+        # Narrow columns/joins for ?fields= / ?expand=
+        queryset = self.apply_sparse_fieldset(queryset)
+        
+        return self.filter_traits(queryset)
+    
+    def filter_traits(self, queryset):
         # Filter by lifestyle choices
         lifestyle = self.request.query_params.get('lifestyle', None)
         if lifestyle:
@@ -80,75 +180,174 @@ class PetViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """
         Override list method to add caching for filter responses.
+        Pages are cached as rendered JSON plus compressed variants and served
+        stale-while-revalidate; pet/breed/photo writes bump the key generation.
         """
-        # Create cache key based on query parameters
-        cache_key = f"pets_filters_{hash(str(sorted(request.query_params.items())))}"
-        cached_result = cache.get(cache_key)
+        def render():
+            if cards.enabled() and cards.supports(request):
+                return build_cache_entry(self.render_card_page(request))
+            response = super(PetViewSet, self).list(request, *args, **kwargs)
+            return build_cache_entry(JSONRenderer().render(response.data))
         
-        if cached_result:
-            return Response(cached_result)
-            
-        # Get the response from parent
-        response = super().list(request, *args, **kwargs)
+        # Refreshed inline by the lock winner since it needs this request
+        entry = cached_swr(
+            query_cache_key(self.cache_namespace('pets_list'), request), render,
+            soft_ttl=1200, hard_ttl=3600, background=False,
+        )
+        return response_from_cache_entry(request, entry)
 
-        cache.set(cache_key, response.data, timeout=1200)
-        
-        return response
+    def render_card_page(self, request):
+        """
+        List page from the PetCard projection: filtered and ordered on the
+        card table's own columns, with the stored JSON spliced into the body.
+        """
+        queryset = self.scope_queryset(PetCard.objects.all())
+        if 'status' not in request.query_params:
+            queryset = queryset.filter(status=PetStatus.AVAILABLE)
+        queryset = self.filter_traits(queryset)
+        queryset = DjangoFilterBackend().filter_queryset(request, queryset, self)
+        queryset = PetCardOrderingFilter().filter_queryset(request, queryset, self)
+        rows = self.paginate_queryset(queryset.values_list('main_photo_url', 'body'))
+        envelope = {
+            'count': self.paginator.page.paginator.count,
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
+        }
+        return cards.render_page(envelope, rows, request)
+
+    @action(detail=True, methods=['post'], url_path='view', url_name='view')
+    def record_view(self, request, pk=None):
+        """
+        View beacon, sent by the client when it shows a pet's detail page.
+        Detail GETs are served from the CDN, so they can't count views.
+        Counted once per visitor per day; applied by flush_pet_counters.
+        """
+        pet_id = get_object_or_404(self.scope_queryset(Pet.objects.values_list('pk', flat=True)), pk=pk)
+        recorded = counters.record(pet_id, counters.VIEW, counters.visitor_key(request))
+        return Response({'recorded': recorded})
+
+    @action(detail=True, methods=['post'])
+    def interest(self, request, pk=None):
+        """
+        Register interest in a pet, once per visitor per day.
+        Counts are buffered and show up after the next counter flush.
+        """
+        pet = self.get_object()
+        recorded = counters.record(pet.pk, counters.INTEREST, counters.visitor_key(request))
+        return Response({'recorded': recorded})
 
     @action(detail=False, methods=['get'])
     def filters_info(self, request):
         """
         Get available filter options for the frontend.
-        Caches the response.
+        Caches the response (stale-while-revalidate, refreshed in the background).
         """
-        cache_key = "pets_filters_info"
-        cached_info = cache.get(cache_key)
-        if cached_info:
-            return Response(cached_info)
-        
-        filter_info = {
+        filter_info = cached_swr(
+            self.cache_namespace('pets_filters_info'), self.build_filters_info,
+            soft_ttl=9200, hard_ttl=86400,
+        )
+        return Response(filter_info)
+    
+    def build_filters_info(self):
+        age_range = self.scope_queryset(Pet.objects.filter(age_months__isnull=False)).aggregate(
+            min_age=Min('age_months'), max_age=Max('age_months')
+        )
+        return {
             'sizes': [{'value': choice[0], 'label': choice[1]} for choice in PetSize.choices],
             'genders': [{'value': choice[0], 'label': choice[1]} for choice in PetGender.choices],
             'lifestyles': [{'value': choice[0], 'label': choice[1]} for choice in LifestyleChoices.choices],
             'characteristics': [{'value': choice[0], 'label': choice[1]} for choice in CharacteristicChoices.choices],
             'age_range': {
-                'min': Pet.objects.filter(age_months__isnull=False).aggregate(min_age=Min('age_months'))['min_age'] or 0,
-                'max': Pet.objects.filter(age_months__isnull=False).aggregate(max_age=Max('age_months'))['max_age'] or 0,
+                'min': age_range['min_age'] or 0,
+                'max': age_range['max_age'] or 0,
             }
         }
-        cache.set(cache_key, filter_info, timeout=9200)
-        return Response(filter_info)
 
-    def perform_create(self, serializer):
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
         """
-        Custom create logic if needed.
-        Invalidate pet list cache on creation.
+        Search-box completions for ?q= (breeds, pet names, colors, locations).
+        Served from the in-memory suggestion index without querying the database.
         """
-        serializer.save()
-        # Invalidate all pet list caches
-        for key in cache.keys('pets_filters_*'):
-            cache.delete(key)
-    
-    def perform_update(self, serializer):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+        except ValueError:
+            limit = 8
+        return Response(suggestion_index.suggest(request.query_params.get('q', ''), limit=limit))
+
+    @action(detail=False, methods=['get'])
+    def health_report(self, request):
         """
-        Custom update logic if needed.
-        Invalidate pet list cache on update.
+        Vaccination and deworming compliance counts for live (available/reserved) pets.
+        ?days= sets the "due within" horizon (default 30).
         """
-        serializer.save()
-        # Invalidate all pet list caches
-        for key in cache.keys('pets_filters_*'):
-            cache.delete(key)
-    
-    def destroy(self, request, *args, **kwargs):
+        days = self.get_due_days(request)
+        counts = self.scope_queryset(Pet.objects.filter(status__in=LIVE_STATUSES)).aggregate(
+            total=Count('id'),
+            fully_vaccinated=Count('id', filter=health.fully_vaccinated_q()),
+            vaccination_due=Count('id', filter=health.vaccination_due_q(days)),
+            deworming_overdue=Count('id', filter=health.deworming_overdue_q()),
+        )
+        return Response({'due_within_days': days, **counts})
+
+    @action(detail=False, methods=['get'])
+    def health_due_csv(self, request):
         """
-        Custom delete logic - soft delete or hard delete based on requirements.
+        Stream a CSV of live pets with a vaccination due within ?days= or overdue deworming.
+        Rows are read in chunks and written as they go, so memory stays constant.
         """
-        instance = self.get_object()
-        
-        # Option 1: Soft delete (change status instead of actual deletion)
-        # instance.status = 'deleted'
-        # instance.save()
-        # return Response(status=status.HTTP_204_NO_CONTENT)
-        
-        # Option 2: Hard delete (current implementation)
-        return super().destroy(request, *args, **kwargs)
+        days = self.get_due_days(request)
+        rows = health.annotate_due_dates(
+            self.scope_queryset(Pet.objects.filter(status__in=LIVE_STATUSES))
+            .filter(health.vaccination_due_q(days) | health.deworming_overdue_q())
+        ).order_by('id').values_list(
+            'id', 'name', 'breed__name', 'status', 'location',
+            'rabies_due', 'dhpp_due', 'deworming_due',
+        )
+        header = ['id', 'name', 'breed', 'status', 'location', 'rabies_due', 'dhpp_due', 'deworming_due']
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in chain([header], rows.iterator(chunk_size=2000))),
+            content_type='text/csv',
+        )
+        response['Content-Disposition'] = f'attachment; filename="pets-health-due-{days}d.csv"'
+        return response
+
+    @staticmethod
+    def get_due_days(request):
+        try:
+            return min(max(int(request.query_params.get('days', 30)), 0), health.MAX_DUE_DAYS)
+        except ValueError:
+            return 30
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Get available pets similar to this one ("you may also like").
+        Ranked from the in-memory trait index; only the top-k rows are fetched.
+        """
+        pet = self.get_object()
+        try:
+            k = min(max(int(request.query_params.get('k', 6)), 1), 20)
+        except ValueError:
+            k = 6
+
+        ranked = similarity_index.similar(pet, k=k)
+        pets_by_id = (
+            Pet.objects.select_related('counter').prefetch_related(main_photo_prefetch())
+            .in_bulk([pet_id for _, pet_id in ranked])
+        )
+        results = []
+        for score, pet_id in ranked:
+            if pet_id in pets_by_id:
+                data = PetListSerializer(pets_by_id[pet_id], context=self.get_serializer_context()).data
+                data['similarity'] = score
+                results.append(data)
+        return Response(results)
+
+    def perform_destroy(self, instance):
+        """
+        Soft delete: hide the pet and keep its photos, videos and files.
+        archive_pets later moves deleted rows out of the hot table.
+        """
+        instance.soft_delete()
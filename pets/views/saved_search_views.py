@@ -0,0 +1,20 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from pets.models import SavedSearch
+from pets.serializers import SavedSearchSerializer
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """
+    The signed-in user's saved searches. Newly listed pets that match an
+    active search are queued as alerts (see pets.saved_searches).
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import Breeder
 
-# Register your models here.
+
+@admin.register(Breeder)
+class BreederAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'user', 'location', 'created_at']
+    search_fields = ['name', 'slug', 'user__username', 'user__email']
+    prepopulated_fields = {'slug': ('name',)}
+    ordering = ['name']
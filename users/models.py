@@ -1,3 +1,15 @@
+from django.conf import settings
 from django.db import models
+from core.models import TimeStampedModel
 
-# Create your models here.
+
+class Breeder(TimeStampedModel):
+    """A breeder account (tenant); pets listed by the breeder are scoped to it."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='breeder')
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    phone = models.CharField(max_length=30, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    
+    def __str__(self):
+        return self.name
@@ -0,0 +1,10 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsBreeder(BasePermission):
+    """Authenticated user with a breeder account."""
+    message = "A breeder account is required."
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and hasattr(user, 'breeder'))